@@ -0,0 +1 @@
+"""iok_core hot-path benchmarks; run with `python -m benchmarks --help`."""
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from .server import local_redis_server, redis_server_available
+from .suite import reset_settings, bench_import_time, bench_logging, run_backend
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _run(backends: list[str], scale: float) -> dict[str, Any]:
+    environ = dict(os.environ)
+    try:
+        return await _run_backends(backends, scale)
+    finally:
+        # use_backend() points IOK_REDIS_* at the throwaway server
+        os.environ.clear()
+        os.environ.update(environ)
+        reset_settings()
+
+
+async def _run_backends(backends: list[str], scale: float) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    meta: dict[str, Any] = {"redis_version": None}
+    if any(b != "fakeredis" for b in backends):
+        with local_redis_server(tls="tls" in backends) as server:
+            meta["redis_version"] = server.version
+            for backend in backends:
+                if backend == "tls" and server.tls_port is None:
+                    results[backend] = {"skipped": "redis-server built without TLS or no openssl/certs"}
+                    continue
+                results[backend] = await run_backend(backend, None if backend == "fakeredis" else server, scale)
+    else:
+        results["fakeredis"] = await run_backend("fakeredis", None, scale)
+    meta["backends"] = results
+    return meta
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "--backend",
+        action="append",
+        choices=["auto", "tcp", "unix", "tls", "fakeredis"],
+        help="repeatable; auto = tcp+unix+tls with redis-server on PATH, else fakeredis",
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply iteration counts (e.g. 0.1 for a smoke run)")
+    parser.add_argument("--output", "-o", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    backends = args.backend or ["auto"]
+    if "auto" in backends:
+        backends = ["tcp", "unix", "tls"] if redis_server_available() else ["fakeredis"]
+    if any(b != "fakeredis" for b in backends) and not redis_server_available():
+        parser.error("redis-server not found on PATH; use --backend fakeredis")
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "scale": args.scale,
+        },
+    }
+    run = asyncio.run(_run(backends, args.scale))
+    report["meta"]["redis_version"] = run.pop("redis_version")
+    report["backends"] = run["backends"]
+    report["logging"] = bench_logging(max(100, int(20000 * args.scale)))
+    report["import_ms"] = bench_import_time()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import redis
+
+CERTS_DIR = Path(__file__).resolve().parent.parent / "certs"
+
+
+@dataclass
+class RedisServer:
+    port: int
+    unix_socket: Path
+    tls_port: Optional[int]
+    ca_cert: Optional[Path]
+    version: str
+
+
+def redis_server_available() -> bool:
+    return shutil.which("redis-server") is not None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _tls_material(workdir: Path) -> Optional[tuple[Path, Path, Path]]:
+    """(ca, server cert, server key): certs/ if it has a server pair, else a throwaway CA via openssl."""
+    fixture = (CERTS_DIR / "ca.crt", CERTS_DIR / "server.crt", CERTS_DIR / "server.key")
+    if all(p.exists() for p in fixture):
+        return fixture
+    if shutil.which("openssl") is None:
+        return None
+
+    ca_key, ca_crt = workdir / "ca.key", workdir / "ca.crt"
+    key, csr, crt = workdir / "server.key", workdir / "server.csr", workdir / "server.crt"
+    run = lambda *args: subprocess.run(["openssl", *args], check=True, capture_output=True)  # noqa: E731
+    run("req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=iok-bench-ca",
+        "-keyout", str(ca_key), "-out", str(ca_crt))
+    run("req", "-newkey", "rsa:2048", "-nodes", "-subj", "/CN=localhost", "-keyout", str(key), "-out", str(csr))
+    run("x509", "-req", "-in", str(csr), "-CA", str(ca_crt), "-CAkey", str(ca_key), "-CAcreateserial",
+        "-days", "1", "-out", str(crt))
+    return ca_crt, crt, key
+
+
+def _wait_ready(proc: subprocess.Popen[bytes], port: int, timeout: float = 10.0) -> Optional[str]:
+    """Server version once it answers, or None if the process exited."""
+    client = redis.Redis(host="127.0.0.1", port=port)
+    deadline = time.monotonic() + timeout
+    try:
+        while proc.poll() is None and time.monotonic() < deadline:
+            try:
+                return str(client.info("server")["redis_version"])
+            except redis.ConnectionError:
+                time.sleep(0.05)
+        return None
+    finally:
+        client.close()
+
+
+@contextmanager
+def local_redis_server(tls: bool = True) -> Iterator[RedisServer]:
+    """A throwaway redis-server listening on TCP, a unix socket and (if possible) TLS."""
+    with tempfile.TemporaryDirectory(prefix="iok-bench-") as tmp:
+        workdir = Path(tmp)
+        port = _free_port()
+        unix_socket = workdir / "redis.sock"
+        args = [
+            "redis-server",
+            "--port", str(port),
+            "--bind", "127.0.0.1",
+            "--unixsocket", str(unix_socket),
+            "--unixsocketperm", "700",
+            "--save", "",
+            "--appendonly", "no",
+            "--dir", str(workdir),
+        ]
+
+        tls_port = ca_cert = None
+        tls_args: list[str] = []
+        material = _tls_material(workdir) if tls else None
+        if material is not None:
+            ca_cert, cert, key = material
+            tls_port = _free_port()
+            tls_args = [
+                "--tls-port", str(tls_port),
+                "--tls-cert-file", str(cert),
+                "--tls-key-file", str(key),
+                "--tls-ca-cert-file", str(ca_cert),
+                "--tls-auth-clients", "no",
+            ]
+
+        proc = subprocess.Popen(args + tls_args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        try:
+            version = _wait_ready(proc, port)
+            if version is None and tls_args:
+                # Builds without TLS support refuse --tls-port; benchmark TCP/unix only
+                proc = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                tls_port = ca_cert = None
+                version = _wait_ready(proc, port)
+            if version is None:
+                raise RuntimeError(f"redis-server did not start: {proc.stderr.read().decode() if proc.stderr else ''}")
+            yield RedisServer(port, unix_socket, tls_port, ca_cert, version)
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
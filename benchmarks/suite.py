@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from iok_core.redis.handler import RedisHandler
+from iok_core.redis.metrics import redis_metrics
+
+from .server import RedisServer
+
+
+# ─────────────────────── backends ───────────────────────
+
+
+def reset_settings() -> None:
+    import iok_core.redis.settings as redis_settings_module
+
+    redis_settings_module._redis_settings_instance = None
+
+
+async def use_backend(name: str, server: Optional[RedisServer]) -> None:
+    """Point RedisHandler at `name` (tcp, unix, tls or fakeredis) for the running loop."""
+    await RedisHandler.close()
+    for key in [k for k in os.environ if k.startswith("IOK_REDIS_")]:
+        del os.environ[key]
+
+    if name == "fakeredis":
+        os.environ["IOK_REDIS_TLS_ENABLED"] = "false"
+        reset_settings()
+        _install_fakeredis()
+        return
+
+    assert server is not None
+    env = {"IOK_REDIS_TLS_ENABLED": "false", "IOK_REDIS_HOST": "127.0.0.1", "IOK_REDIS_PORT": str(server.port)}
+    if name == "unix":
+        env["IOK_REDIS_HOST"] = str(server.unix_socket)
+    elif name == "tls":
+        env.update(
+            IOK_REDIS_TLS_ENABLED="true",
+            IOK_REDIS_HOST="localhost",
+            IOK_REDIS_PORT=str(server.tls_port),
+            IOK_REDIS_TLS_CA_CERT_PATH=str(server.ca_cert),
+        )
+    os.environ.update(env)
+    reset_settings()
+    await RedisHandler.client()
+
+
+def _install_fakeredis() -> None:
+    import fakeredis
+    from fakeredis.aioredis import FakeAsyncRedisConnection
+
+    from iok_core.redis.metrics import InstrumentedConnectionPool, InstrumentedRedis
+    from iok_core.redis.settings import RedisSettings
+
+    server = fakeredis.FakeServer()
+    state = RedisHandler._registry.current()
+    for binary in (False, True):
+        pool = InstrumentedConnectionPool(
+            connection_class=FakeAsyncRedisConnection,
+            server=server,
+            decode_responses=not binary,
+            max_connections=RedisSettings().max_connections,
+        )
+        state.clients[binary] = InstrumentedRedis.from_pool(pool)
+
+
+# ─────────────────────── helpers ───────────────────────
+
+
+def _summary(latencies: list[float], elapsed: float, ops: int, errors: Optional[dict[str, int]] = None) -> dict[str, Any]:
+    latencies.sort()
+    n = len(latencies)
+    return {
+        "ops": ops,
+        "errors": errors or {},
+        "ops_per_sec": round(ops / elapsed, 1) if elapsed else None,
+        "p50_us": round(latencies[n // 2] * 1e6, 2) if n else None,
+        "p99_us": round(latencies[min(n - 1, int(n * 0.99))] * 1e6, 2) if n else None,
+    }
+
+
+async def _concurrently(concurrency: int, per_task: int, op: Callable[[int], Awaitable[Any]]) -> dict[str, Any]:
+    """Run `op` per_task times in each of `concurrency` tasks; failures are counted by class, not timed."""
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async def worker(worker_id: int) -> None:
+        for i in range(per_task):
+            t0 = time.perf_counter()
+            try:
+                await op(worker_id * per_task + i)
+            except Exception as exc:
+                cause = exc.__cause__ or exc
+                key = f"{type(exc).__name__}({type(cause).__name__})" if cause is not exc else type(exc).__name__
+                errors[key] = errors.get(key, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - t0)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    return _summary(latencies, time.perf_counter() - start, len(latencies), errors)
+
+
+# ─────────────────────── benchmarks ───────────────────────
+
+
+async def bench_session_entry(n: int) -> dict[str, Any]:
+    """Cost of entering/leaving RedisHandler.session(), and session+GET vs a bare GET."""
+    client = await RedisHandler.client()
+    await client.set("bench:key", "value")
+
+    async def empty(_: int) -> None:
+        async with RedisHandler.session():
+            pass
+
+    async def session_get(_: int) -> None:
+        async with RedisHandler.session() as c:
+            await c.get("bench:key")
+
+    async def bare_get(_: int) -> None:
+        await client.get("bench:key")
+
+    await _concurrently(1, min(n, 200), session_get)  # warm up
+    entry = await _concurrently(1, n, empty)
+    with_session = await _concurrently(1, n, session_get)
+    bare = await _concurrently(1, n, bare_get)
+    return {
+        "empty_session": entry,
+        "session_get": with_session,
+        "bare_get": bare,
+        "session_overhead_p50_us": round(with_session["p50_us"] - bare["p50_us"], 2),
+    }
+
+
+async def bench_commands(n: int, concurrency_levels: tuple[int, ...]) -> dict[str, Any]:
+    async def get(i: int) -> None:
+        async with RedisHandler.session() as c:
+            await c.get(f"bench:{i % 1024}")
+
+    return {f"c{c}": await _concurrently(c, max(1, n // c), get) for c in concurrency_levels}
+
+
+async def bench_pipeline(n: int, concurrency_levels: tuple[int, ...], batch: int = 100) -> dict[str, Any]:
+    async def pipelined(i: int) -> None:
+        async with RedisHandler.session() as c:
+            pipe = c.pipeline(transaction=False)
+            for j in range(batch):
+                pipe.get(f"bench:{(i + j) % 1024}")
+            await pipe.execute()
+
+    results = {}
+    for c in concurrency_levels:
+        summary = await _concurrently(c, max(1, n // (c * batch)), pipelined)
+        summary["commands_per_sec"] = round(summary["ops_per_sec"] * batch, 1) if summary["ops_per_sec"] else None
+        summary["batch"] = batch
+        results[f"c{c}"] = summary
+    return results
+
+
+async def bench_pool_exhaustion(rounds: int, hold_seconds: float = 0.002) -> dict[str, Any]:
+    """
+    Concurrency at 2x max_connections: how often checkout fails and what it
+    costs. With IOK_REDIS_POOL_MODE=adaptive callers queue instead, so the
+    latencies include the wait and errors are only checkout timeouts.
+    """
+    pool = (await RedisHandler.client()).connection_pool
+    concurrency = pool.max_connections * 2
+    errors: dict[str, int] = {}
+    latencies: list[float] = []
+    before = redis_metrics.pool_exhausted
+
+    async def worker() -> None:
+        for _ in range(rounds):
+            t0 = time.perf_counter()
+            try:
+                connection = await pool.get_connection()
+            except Exception as exc:
+                errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - t0)
+            await asyncio.sleep(hold_seconds)
+            await pool.release(connection)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    summary = _summary(latencies, time.perf_counter() - start, len(latencies), errors)
+    summary.update(
+        max_connections=pool.max_connections,
+        pool_mode="adaptive" if hasattr(pool, "checkout_timeout") else "fixed",
+        concurrency=concurrency,
+        attempts=concurrency * rounds,
+        exhausted_metric=redis_metrics.pool_exhausted - before,
+    )
+    return summary
+
+
+async def bench_streams(n: int, consumer_counts: tuple[int, ...] = (1, 4)) -> dict[str, Any]:
+    """Messages/s appended with pipelined XADD, and drained by N consumers of one group."""
+    from iok_core.streams import StreamConsumer, StreamProducer
+
+    producer = StreamProducer("bench", maxlen=max(n, 1000))
+    client = await RedisHandler.client()
+    await client.delete(producer.key)
+
+    start = time.perf_counter()
+    await producer.add_many({"n": i, "payload": "x" * 64} for i in range(n))
+    elapsed = time.perf_counter() - start
+    results: dict[str, Any] = {"produce": {"messages": n, "messages_per_sec": round(n / elapsed, 1)}}
+
+    async def handle(_: Any) -> None:
+        pass
+
+    for count in consumer_counts:
+        group = f"bench-c{count}"
+        consumers = [
+            StreamConsumer("bench", group, handle, consumer=f"{group}-{i}", block_ms=50) for i in range(count)
+        ]
+        start = time.perf_counter()
+        for consumer in consumers:
+            consumer.start()
+        while sum(c.stats.acked for c in consumers) < n:
+            await asyncio.sleep(0.005)
+        elapsed = time.perf_counter() - start
+        for consumer in consumers:
+            await consumer.stop()
+        results[f"consume_c{count}"] = {
+            "messages": n,
+            "messages_per_sec": round(n / elapsed, 1),
+            "mean_ack_batch": round(sum(c.stats.mean_ack_batch for c in consumers) / count, 1),
+        }
+    await client.delete(producer.key)
+    return results
+
+
+def bench_logging(n: int) -> dict[str, Any]:
+    """Caller-side cost per structlog line: inline JSONRenderer vs the orjson queue pipeline."""
+    import structlog
+
+    from iok_core.logging import LoggingSettings, configure_logging, log_queue_stats
+
+    root = logging.getLogger()
+    saved = list(root.handlers)
+    results: dict[str, Any] = {}
+    try:
+        for mode in ("inline", "queue"):
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            configure_logging(LoggingSettings(queue_enabled=mode == "queue", file_path=os.devnull), force=True)
+            if mode == "inline":
+                root.addHandler(logging.StreamHandler(io.StringIO()))
+            log = structlog.get_logger("iok_core.bench")
+
+            latencies = []
+            start = time.perf_counter()
+            for i in range(n):
+                t0 = time.perf_counter()
+                log.info("bench line", i=i, user="someone", path="/api/v1/items")
+                latencies.append(time.perf_counter() - t0)
+            results[mode] = _summary(latencies, time.perf_counter() - start, n)
+            stats = log_queue_stats()
+            if stats is not None:
+                results[mode]["dropped"] = stats.dropped
+    finally:
+        configure_logging(LoggingSettings(), force=True)
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved:
+            root.addHandler(handler)
+    return results
+
+
+IMPORT_MODULES = (
+    "iok_core",
+    "iok_core.redis",
+    "iok_core.cache",
+    "iok_core.rate_limit",
+    "iok_core.tracing",
+    "iok_core.logging",
+    "iok_core.utils",
+    "iok_core.config",
+)
+
+
+def bench_import_time(modules: tuple[str, ...] = IMPORT_MODULES, runs: int = 3) -> dict[str, Any]:
+    """Cumulative `-X importtime` of each package in a fresh interpreter, best of `runs`, in ms."""
+    import re
+    import subprocess
+    import sys
+
+    results: dict[str, Any] = {}
+    for module in modules:
+        pattern = re.compile(rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$", re.M)
+        samples = []
+        for _ in range(runs):
+            stderr = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stderr
+            match = pattern.search(stderr)
+            assert match is not None, f"no importtime line for {module}"
+            samples.append(int(match.group(1)) / 1000)
+        results[module] = round(min(samples), 2)
+    return results
+
+
+async def run_backend(name: str, server: Optional[RedisServer], scale: float = 1.0) -> dict[str, Any]:
+    await use_backend(name, server)
+    n = max(50, int(5000 * scale))
+    stages: dict[str, Callable[[], Awaitable[dict[str, Any]]]] = {
+        "session": lambda: bench_session_entry(n),
+        "commands": lambda: bench_commands(n, (1, 8, 64)),
+        "pipeline": lambda: bench_pipeline(n * 10, (1, 8)),
+        "pool_exhaustion": lambda: bench_pool_exhaustion(max(5, int(50 * scale))),
+        "streams": lambda: bench_streams(max(100, int(20000 * scale))),
+    }
+    # Failures are part of the result (e.g. concurrency above max_connections);
+    # keep the per-failure error log out of the output
+    handler_logger = logging.getLogger("iok_core.redis")
+    level = handler_logger.level
+    handler_logger.setLevel(logging.CRITICAL)
+    results = {}
+    try:
+        for stage, bench in stages.items():
+            (await RedisHandler.circuit_breaker()).reset()  # one stage's failures must not trip the next
+            results[stage] = await bench()
+        return results
+    finally:
+        handler_logger.setLevel(level)
+        await RedisHandler.close()
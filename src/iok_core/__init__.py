@@ -1,3 +1,11 @@
 __version__ = "0.1.3"
 
-from .redis.handler import RedisHandler
\ No newline at end of file
+from typing import TYPE_CHECKING
+
+from .utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .redis.handler import RedisHandler
+
+# `import iok_core` stays cheap: RedisHandler (and redis-py) load on first use
+__getattr__, __dir__ = lazy_exports(__name__, {"RedisHandler": ".redis.handler"})
@@ -0,0 +1,33 @@
+# src/iok_core/cache/__init__.py
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .local import CacheStats, LocalCache
+    from .settings import CacheSettings, cache_settings
+    from .stampede import StampedeCache, StampedeStats
+    from .two_tier import TwoTierCache
+
+__all__ = [
+    "TwoTierCache",
+    "LocalCache",
+    "CacheStats",
+    "StampedeCache",
+    "StampedeStats",
+    "CacheSettings",
+    "cache_settings",
+]
+
+# Loaded on first access so importing the package does not pull in Redis
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "CacheStats": ".local",
+    "LocalCache": ".local",
+    "CacheSettings": ".settings",
+    "cache_settings": ".settings",
+    "StampedeCache": ".stampede",
+    "StampedeStats": ".stampede",
+    "TwoTierCache": ".two_tier",
+})
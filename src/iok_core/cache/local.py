@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class LocalCache:
+    """Bounded in-process LRU with a per-entry TTL. Not thread-safe; one per event loop."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._data
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return False, None
+        self._data.move_to_end(key)
+        self._stats.hits += 1
+        return True, value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self._stats.evictions += 1
+
+    def record_miss(self) -> None:
+        """Count a lookup that bypassed the local tier."""
+        self._stats.misses += 1
+
+    def pop(self, key: str) -> bool:
+        return self._data.pop(key, None) is not None
+
+    def invalidate(self, key: str) -> None:
+        if self._data.pop(key, None) is not None:
+            self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._stats.invalidations += len(self._data)
+        self._data.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            expirations=self._stats.expirations,
+            invalidations=self._stats.invalidations,
+            size=len(self._data),
+        )
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from ..config.base import IOKSettings
+
+
+class CacheSettings(IOKSettings):
+    model_config = SettingsConfigDict(env_prefix="IOK_CACHE_")
+
+    local_max_entries: int = Field(default=10_000, ge=1)
+    local_ttl_seconds: float = Field(default=30.0, gt=0)
+
+    # "tracking" needs Redis >= 6 (CLIENT TRACKING BCAST); "pubsub" only sees
+    # writes made through TwoTierCache; "none" relies on local_ttl_seconds alone.
+    invalidation: Literal["tracking", "pubsub", "none"] = "pubsub"
+    invalidation_channel: str = "iok:cache:invalidate"
+
+    # get_or_compute(): recompute lock lease, how long losers wait for the
+    # winner before computing themselves, how long an expired value may be
+    # served while someone recomputes, and the XFetch beta (0 disables
+    # early refresh; > 1 refreshes earlier).
+    stampede_lock_ttl_seconds: float = Field(default=10.0, gt=0)
+    stampede_wait_seconds: float = Field(default=5.0, ge=0)
+    stampede_stale_ttl_seconds: float = Field(default=60.0, ge=0)
+    stampede_beta: float = Field(default=1.0, ge=0)
+
+
+@lru_cache
+def cache_settings() -> CacheSettings:
+    return CacheSettings()
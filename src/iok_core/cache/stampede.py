@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, Optional, TypeVar
+
+from ..redis.codec import Codec, JsonCodec
+from ..redis.handler import RedisHandler, RedisSessionConfig
+from ..redis.primitives import COMPARE_AND_DELETE
+from ..redis.scripts import script_registry
+from .settings import cache_settings
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Fencing token = server TIME in microseconds, as a string (Lua numbers are
+# doubles; 16 digits stay exact). Later holders always get larger tokens.
+ACQUIRE_LOCK = script_registry.register("iok:stampede:acquire", """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return false
+end
+local t = redis.call('TIME')
+local token = t[1] .. string.format('%06d', tonumber(t[2]))
+redis.call('SET', KEYS[1], token, 'PX', ARGV[1])
+return token
+""")
+
+# ARGV: token, payload, delta_ms, ttl_ms. A holder whose lock expired and was
+# taken over cannot overwrite the newer holder's value.
+FENCED_WRITE = script_registry.register("iok:stampede:write", """
+local current = tonumber(redis.call('HGET', KEYS[1], 'f') or '0')
+if current > tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'v', ARGV[2], 'd', ARGV[3], 'f', ARGV[1])
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return 1
+""")
+
+
+@dataclass
+class StampedeStats:
+    hits: int = 0
+    misses: int = 0
+    stale_served: int = 0
+    early_refreshes: int = 0
+    recomputes: int = 0
+    joined: int = 0  # callers that shared another coroutine's in-flight recompute
+    lock_waits: int = 0
+    fenced_writes: int = 0  # recomputed values rejected because a newer lock holder wrote first
+
+
+@dataclass
+class _Entry:
+    payload: Optional[bytes]
+    delta_ms: float
+    remaining_ms: float  # until logical expiry; <= 0 means stale
+
+
+class StampedeCache(Generic[T]):
+    """
+    get_or_compute() with stampede protection on top of RedisHandler.session().
+
+    - Singleflight: concurrent callers in this process for the same key share
+      one recompute.
+    - Recompute lock: across processes only the holder of a short Redis lock
+      recomputes; the others serve the stale value if there is one, or wait
+      up to `wait_seconds` for the holder's write. The lock carries a fencing
+      token, so a holder that outlived its lease cannot overwrite a newer value.
+    - Early refresh (XFetch): a fresh value is recomputed in the background
+      with probability rising as its TTL runs out, scaled by how long the last
+      recompute took and `beta`, so hot keys rarely expire at all.
+
+    Values are stored as a hash (payload, recompute time, fencing token) that
+    lives `stale_ttl_seconds` past the logical TTL, which defaults to
+    `config.default_ttl`.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RedisSessionConfig] = None,
+        *,
+        codec: Optional[Codec[T]] = None,
+        lock_ttl_seconds: Optional[float] = None,
+        wait_seconds: Optional[float] = None,
+        stale_ttl_seconds: Optional[float] = None,
+        beta: Optional[float] = None,
+    ) -> None:
+        settings = cache_settings()
+        self.config = dataclasses.replace(config or RedisSessionConfig(), binary=True)
+        self.codec: Codec[T] = codec or JsonCodec()
+        self.lock_ttl_seconds = lock_ttl_seconds if lock_ttl_seconds is not None else settings.stampede_lock_ttl_seconds
+        self.wait_seconds = wait_seconds if wait_seconds is not None else settings.stampede_wait_seconds
+        self.stale_ttl_seconds = (
+            stale_ttl_seconds if stale_ttl_seconds is not None else settings.stampede_stale_ttl_seconds
+        )
+        self.beta = beta if beta is not None else settings.stampede_beta
+        self.stats = StampedeStats()
+        self._inflight: dict[str, asyncio.Task[T]] = {}
+        self._background: dict[str, asyncio.Task[Any]] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.config.prefix}{key}"
+
+    # ─────────────────────── public API ───────────────────────
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        ttl: Optional[float] = None,
+    ) -> T:
+        """Cached value of `key`, running `compute` (at most once per key at a time) when it is missing or stale."""
+        ttl = ttl if ttl is not None else self.config.default_ttl
+        if not ttl:
+            raise ValueError("get_or_compute needs a ttl (or config.default_ttl)")
+        full = self._key(key)
+
+        flight = self._inflight.get(full)
+        if flight is not None:
+            self.stats.joined += 1
+            return await asyncio.shield(flight)
+
+        entry = await self._read(full)
+        if entry.payload is not None and entry.remaining_ms > 0:
+            self.stats.hits += 1
+            if self._refresh_early(entry) and full not in self._background:
+                self.stats.early_refreshes += 1
+                task = asyncio.create_task(self._recompute(full, compute, ttl, stale=entry.payload))
+                self._background[full] = task
+                task.add_done_callback(lambda t: self._background_done(full, t))
+            return self.codec.decode(entry.payload)
+
+        self.stats.misses += 1
+        # Re-check: another caller may have started a flight while we read
+        flight = self._inflight.get(full)
+        if flight is None:
+            flight = asyncio.create_task(self._recompute(full, compute, ttl, stale=entry.payload))
+            self._inflight[full] = flight
+            flight.add_done_callback(lambda _: self._inflight.pop(full, None))
+        else:
+            self.stats.joined += 1
+        return await asyncio.shield(flight)
+
+    async def invalidate(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        async with RedisHandler.session(self.config) as client:
+            return int(await client.delete(*(self._key(k) for k in keys)))
+
+    async def close(self) -> None:
+        """Cancel background refreshes still running."""
+        tasks = list(self._background.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ─────────────────────── internals ───────────────────────
+
+    async def _read(self, full: str) -> _Entry:
+        async with RedisHandler.session(self.config) as client:
+            pipe = client.pipeline(transaction=False)
+            pipe.hmget(full, "v", "d")
+            pipe.pttl(full)
+            (payload, delta), pttl = await pipe.execute()
+        if payload is None or pttl == -2:
+            return _Entry(None, 0.0, 0.0)
+        remaining = math.inf if pttl == -1 else pttl - self.stale_ttl_seconds * 1000
+        return _Entry(payload, float(delta or 0), remaining)
+
+    def _refresh_early(self, entry: _Entry) -> bool:
+        # XFetch: recompute when delta * beta * -ln(U) reaches the time left
+        if not self.beta or not entry.delta_ms or math.isinf(entry.remaining_ms):
+            return False
+        return entry.delta_ms * self.beta * -math.log(1.0 - random.random()) >= entry.remaining_ms
+
+    def _background_done(self, full: str, task: asyncio.Task[Any]) -> None:
+        self._background.pop(full, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Early refresh of %s failed", full, exc_info=task.exception())
+
+    async def _recompute(
+        self,
+        full: str,
+        compute: Callable[[], Awaitable[T]],
+        ttl: float,
+        stale: Optional[bytes],
+    ) -> T:
+        lock = f"{full}:lock"
+        async with RedisHandler.session(self.config) as client:
+            token = await script_registry.call(client, ACQUIRE_LOCK, [lock], [max(1, round(self.lock_ttl_seconds * 1000))])
+
+        if token is None:
+            if stale is not None:
+                self.stats.stale_served += 1
+                return self.codec.decode(stale)
+            value = await self._wait_for_holder(full)
+            if value is not None:
+                return value
+            logger.debug("Recompute lock holder for %s did not write in time — computing anyway", full)
+            token = b"0"  # only writes if no lock holder ever wrote
+
+        try:
+            started = time.perf_counter()
+            value = await compute()
+            delta_ms = (time.perf_counter() - started) * 1000
+            self.stats.recomputes += 1
+            ttl_ms = round((ttl + self.stale_ttl_seconds) * 1000)
+            async with RedisHandler.session(self.config) as client:
+                written = await script_registry.call(
+                    client, FENCED_WRITE, [full], [token, self.codec.encode(value), round(delta_ms, 3), ttl_ms]
+                )
+            if not written:
+                self.stats.fenced_writes += 1
+            return value
+        finally:
+            if token != b"0":
+                async with RedisHandler.session(self.config) as client:
+                    await script_registry.call(client, COMPARE_AND_DELETE, [lock], [token])
+
+    async def _wait_for_holder(self, full: str) -> Optional[T]:
+        self.stats.lock_waits += 1
+        deadline = time.monotonic() + self.wait_seconds
+        delay = 0.01
+        while time.monotonic() < deadline:
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, 0.2)
+            entry = await self._read(full)
+            if entry.payload is not None and entry.remaining_ms > 0:
+                return self.codec.decode(entry.payload)
+        return None
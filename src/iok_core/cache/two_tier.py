@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Literal, Optional
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.asyncio.connection import Connection
+
+from ..redis.handler import RedisHandler, RedisSessionConfig
+from .local import CacheStats, LocalCache
+from .settings import cache_settings
+
+
+logger = logging.getLogger(__name__)
+
+TRACKING_CHANNEL = "__redis__:invalidate"
+_TRACKING_PING_INTERVAL = 5.0
+
+
+class TwoTierCache:
+    """
+    Read-through cache with a bounded in-process LRU/TTL tier in front of Redis.
+
+    Keys are scoped by `config.prefix` and written with `config.default_ttl`.
+    The local tier is kept coherent by a background listener:
+
+    - "tracking": Redis CLIENT TRACKING in BCAST mode on the prefix, so writes
+      from any client invalidate local copies (Redis >= 6).
+    - "pubsub": set()/delete() publish the key on `invalidation_channel`, so
+      writes through any TwoTierCache invalidate local copies.
+    - "none": local entries live for `local_ttl_seconds` only.
+
+    A local entry never outlives the Redis key's remaining TTL.
+
+    While the listener is (re)connecting the local tier is bypassed and
+    flushed, since invalidations may have been missed.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RedisSessionConfig] = None,
+        *,
+        max_entries: Optional[int] = None,
+        local_ttl_seconds: Optional[float] = None,
+        invalidation: Optional[Literal["tracking", "pubsub", "none"]] = None,
+        channel: Optional[str] = None,
+    ) -> None:
+        settings = cache_settings()
+        self.config = config or RedisSessionConfig()
+        self.invalidation = invalidation or settings.invalidation
+        self.channel = channel or settings.invalidation_channel
+        self._local = LocalCache(
+            max_entries if max_entries is not None else settings.local_max_entries,
+            local_ttl_seconds if local_ttl_seconds is not None else settings.local_ttl_seconds,
+        )
+
+        # Bumped on every invalidation; a Redis read only populates the local
+        # tier if no invalidation raced with it.
+        self._generation = 0
+        self._coherent = self.invalidation == "none"
+        self._listener: Optional[asyncio.Task[None]] = None
+        self._pubsub: Optional[PubSub] = None
+        self._tracking_conn: Optional[Connection] = None
+        self._resync = False
+        self._closed = False
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._local.stats
+
+    def _key(self, key: str) -> str:
+        return f"{self.config.prefix}{key}"
+
+    # ─────────────────────── public API ───────────────────────
+
+    def start(self) -> None:
+        """Start the invalidation listener. Called lazily on first use."""
+        if self.invalidation != "none" and self._listener is None and not self._closed:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def get(self, key: str) -> Any:
+        full = self._key(key)
+        self.start()
+        if self._coherent:
+            hit, value = self._local.get(full)
+            if hit:
+                return value
+        else:
+            self._local.record_miss()
+
+        generation = self._generation
+        async with RedisHandler.session(self.config) as client:
+            # PTTL in the same round trip: key expiry is never published, so a
+            # local copy must not outlive the Redis key
+            pipe = client.pipeline(transaction=False)
+            pipe.get(full)
+            pipe.pttl(full)
+            value, pttl = await pipe.execute()
+
+        if value is not None and self._coherent and generation == self._generation:
+            self._local.set(full, value, pttl / 1000 if pttl >= 0 else None)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        full = self._key(key)
+        ttl = ttl if ttl is not None else self.config.default_ttl
+        self._local.pop(full)
+        self._generation += 1
+        async with RedisHandler.session(self.config) as client:
+            if self.invalidation == "pubsub":
+                pipe = client.pipeline(transaction=False)
+                pipe.set(full, value, ex=ttl)
+                pipe.publish(self.channel, full)
+                await pipe.execute()
+            else:
+                await client.set(full, value, ex=ttl)
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        full = [self._key(k) for k in keys]
+        for k in full:
+            self._local.pop(k)
+        self._generation += 1
+        async with RedisHandler.session(self.config) as client:
+            if self.invalidation == "pubsub":
+                pipe = client.pipeline(transaction=False)
+                pipe.delete(*full)
+                for k in full:
+                    pipe.publish(self.channel, k)
+                deleted, *_ = await pipe.execute()
+            else:
+                deleted = await client.delete(*full)
+        return int(deleted)
+
+    def invalidate_local(self, key: Optional[str] = None) -> None:
+        """Drop one key (or everything) from the local tier only."""
+        self._generation += 1
+        if key is None:
+            self._local.clear()
+        else:
+            self._local.invalidate(self._key(key))
+
+    async def close(self) -> None:
+        # The flag stops the listener even if a cancel is swallowed mid-read
+        self._closed = True
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self._teardown()
+        self._local.clear()
+
+    # ─────────────────────── invalidation listener ───────────────────────
+
+    def _on_invalidate(self, data: Any) -> None:
+        self._generation += 1
+        if data is None:
+            # Tracking sends a null key list on FLUSHALL/FLUSHDB
+            self._local.clear()
+        elif isinstance(data, (list, tuple)):
+            for key in data:
+                self._local.invalidate(key.decode() if isinstance(key, bytes) else key)
+        else:
+            self._local.invalidate(data.decode() if isinstance(data, bytes) else data)
+
+    async def _on_listener_reconnect(self, connection: Connection) -> None:
+        # The redirect target's client id changed; tracking must be re-armed
+        self._resync = True
+
+    async def _subscribe(self, client: Redis) -> None:
+        self._pubsub = client.pubsub()
+        if self.invalidation == "pubsub":
+            await self._pubsub.subscribe(self.channel)
+            return
+
+        await self._pubsub.connect()  # type: ignore[no-untyped-call]
+        conn = self._pubsub.connection
+        assert conn is not None
+        await conn.send_command("CLIENT", "ID")
+        redirect = await conn.read_response()
+        await self._pubsub.subscribe(TRACKING_CHANNEL)
+        conn.register_connect_callback(self._on_listener_reconnect)
+
+        self._tracking_conn = await client.connection_pool.get_connection()
+        args: list[Any] = ["CLIENT", "TRACKING", "ON", "REDIRECT", redirect, "BCAST"]
+        if self.config.prefix:
+            args += ["PREFIX", self.config.prefix]
+        await self._tracking_conn.send_command(*args)
+        await self._tracking_conn.read_response()
+
+    async def _teardown(self) -> None:
+        self._coherent = self.invalidation == "none"
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.aclose()  # type: ignore[no-untyped-call]
+            except Exception:
+                logger.debug("Error closing cache invalidation pubsub", exc_info=True)
+            self._pubsub = None
+        if self._tracking_conn is not None:
+            conn, self._tracking_conn = self._tracking_conn, None
+            # Never hand a tracking-enabled connection back to other callers
+            await conn.disconnect()
+            try:
+                client = await RedisHandler.client()
+                await client.connection_pool.release(conn)
+            except Exception:
+                logger.debug("Could not release cache tracking connection", exc_info=True)
+
+    async def _ping_tracking(self) -> None:
+        assert self._tracking_conn is not None
+        await self._tracking_conn.send_command("PING")
+        await self._tracking_conn.read_response()
+
+    async def _listen(self) -> None:
+        backoff = 0.1
+        while not self._closed:
+            failed = False
+            try:
+                client = await RedisHandler.client()
+                await self._subscribe(client)
+                self._local.clear()
+                self._resync = False
+                self._coherent = True
+                backoff = 0.1
+                logger.debug("Cache invalidation listener subscribed (%s)", self.invalidation)
+
+                last_ping = time.monotonic()
+                while not (self._resync or self._closed):
+                    assert self._pubsub is not None
+                    message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] == "message":
+                        self._on_invalidate(message["data"])
+                    if self._tracking_conn is not None and time.monotonic() - last_ping > _TRACKING_PING_INTERVAL:
+                        await self._ping_tracking()
+                        last_ping = time.monotonic()
+                if self._resync:
+                    logger.info("Cache invalidation connection was re-established — resyncing")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                failed = True
+                logger.warning("Cache invalidation listener failed — bypassing local tier", exc_info=True)
+            finally:
+                self._coherent = self.invalidation == "none"
+                self._local.clear()
+
+            await self._teardown()
+            if failed:
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
@@ -1,4 +1,4 @@
 # src/iok_core/config/__init__.py
-from .base import core_settings, IOKSettings
+from .base import core_settings, core_settings_sync, IOKSettings
 
-__all__ = ["core_settings", "IOKSettings"]
\ No newline at end of file
+__all__ = ["core_settings", "core_settings_sync", "IOKSettings"]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import asyncio
+import threading
 from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -35,13 +35,18 @@ class IOKSettings(BaseSettings):
 
 
 _core_instance: IOKSettings | None = None
-_core_lock = asyncio.Lock()
+_core_lock = threading.Lock()
 
-async def core_settings() -> IOKSettings:
+def core_settings_sync() -> IOKSettings:
+    """Same singleton as core_settings(), for code that runs outside an event loop."""
     global _core_instance
     if _core_instance is not None:
         return _core_instance
-    async with _core_lock:
+    with _core_lock:
         if _core_instance is None:
             _core_instance = IOKSettings()
-    return _core_instance
\ No newline at end of file
+    return _core_instance
+
+
+async def core_settings() -> IOKSettings:
+    return core_settings_sync()
\ No newline at end of file
@@ -0,0 +1,25 @@
+# src/iok_core/logging/__init__.py
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .config import configure_logging, log_queue_stats
+    from .settings import LoggingSettings, logging_settings
+
+__all__ = [
+    "configure_logging",
+    "log_queue_stats",
+    "LoggingSettings",
+    "logging_settings",
+]
+
+# structlog is only imported when logging is actually configured
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "configure_logging": ".config",
+    "log_queue_stats": ".config",
+    "LoggingSettings": ".settings",
+    "logging_settings": ".settings",
+})
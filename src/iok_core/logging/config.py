@@ -1,20 +1,35 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import sys
-from typing import Any
+from typing import Any, Optional
 
 import structlog
 from structlog.contextvars import bind_contextvars, merge_contextvars
 from structlog.processors import JSONRenderer, TimeStamper, add_log_level, StackInfoRenderer
 
-from .settings import LoggingSettings
-from ..config.base import core_settings
+from .queue import LogQueueStats, OrjsonRenderer, QueueLogHandler
+from .settings import LoggingSettings, logging_settings
+from ..config.base import core_settings_sync
 
 
-def configure_logging() -> None:
-    settings = LoggingSettings()
-    core = core_settings()
+_queue_handler: Optional[QueueLogHandler] = None
+_configured: Optional[LoggingSettings] = None
+
+
+def configure_logging(settings: Optional[LoggingSettings] = None, *, force: bool = False) -> None:
+    """
+    Configure structlog and the stdlib root logger.
+
+    Nothing happens at import time; call this once at startup. Repeated calls
+    with the same settings are no-ops unless `force` is set.
+    """
+    global _configured
+    settings = settings or logging_settings()
+    if _configured == settings and not force:
+        return
+    core = core_settings_sync()
 
     level = settings.level if core.debug else getattr(logging, settings.level)
 
@@ -26,7 +41,7 @@ def configure_logging() -> None:
     ]
 
     if settings.format == "json":
-        renderer = JSONRenderer(sort_keys=True)
+        renderer = OrjsonRenderer(sort_keys=True) if settings.queue_enabled else JSONRenderer(sort_keys=True)
         if settings.include_trace_id or settings.include_span_id:
             from opentelemetry.trace import get_current_span
 
@@ -53,6 +68,8 @@ def configure_logging() -> None:
         cache_logger_on_first_use=True,
     )
 
+    _install_queue_handler(settings)
+
     # Set root logger level
     logging.getLogger().setLevel(level)
     logging.getLogger("iok_core").setLevel(level)
@@ -61,6 +78,38 @@ def configure_logging() -> None:
     for noisy in ["httpx", "httpcore", "passlib"]:
         logging.getLogger(noisy).setLevel(logging.WARNING)
 
+    _configured = settings
+
+
+def _install_queue_handler(settings: LoggingSettings) -> None:
+    global _queue_handler
+    root = logging.getLogger()
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+        _queue_handler.close()
+        _queue_handler = None
+    if not settings.queue_enabled:
+        return
+
+    stream = open(settings.file_path, "ab") if settings.file_path else sys.stdout.buffer
+    _queue_handler = QueueLogHandler(
+        stream,
+        maxsize=settings.queue_size,
+        policy=settings.queue_full_policy,
+        block_timeout=settings.queue_block_timeout_seconds,
+        batch_size=settings.queue_batch_size,
+        close_stream=bool(settings.file_path),
+    )
+    root.addHandler(_queue_handler)
+    atexit.unregister(_close_queue_handler)
+    atexit.register(_close_queue_handler)
+
+
+def _close_queue_handler() -> None:
+    if _queue_handler is not None:
+        _queue_handler.close()
+
 
-# Auto-configure on import
-configure_logging()
\ No newline at end of file
+def log_queue_stats() -> Optional[LogQueueStats]:
+    """Enqueued/dropped/written counters and current depth, or None when the queue is off."""
+    return _queue_handler.stats if _queue_handler is not None else None
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+import queue
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+from typing import IO, Any, Literal, Optional
+
+import orjson
+
+
+_STOP = object()
+
+
+@dataclass
+class LogQueueStats:
+    enqueued: int = 0
+    dropped: int = 0  # queue full (drop policy, or block timed out)
+    written: int = 0
+    batches: int = 0
+    write_errors: int = 0
+    render_errors: int = 0  # records written as a fallback line (e.g. bad %-format args)
+    queue_depth: int = 0
+
+
+class OrjsonRenderer:
+    """
+    structlog renderer producing orjson bytes.
+
+    Bytes pass through the stdlib record untouched and are written verbatim
+    by the BatchingLogWriter, so no str round trip happens on the hot path.
+    """
+
+    def __init__(self, sort_keys: bool = True) -> None:
+        self._option = orjson.OPT_SORT_KEYS if sort_keys else 0
+
+    def __call__(self, logger: Any, method_name: str, event_dict: dict[str, Any]) -> bytes:
+        return orjson.dumps(event_dict, default=str, option=self._option)
+
+
+class BatchingLogWriter(threading.Thread):
+    """
+    Daemon thread that drains the queue and writes records in batches.
+
+    Blocks for the first record, then takes whatever else is already queued
+    (up to `batch_size`) and emits them with one write + flush. Records not
+    rendered by OrjsonRenderer (stdlib loggers of other libraries) are
+    rendered to JSON here, off the event loop thread.
+    """
+
+    def __init__(self, records: queue.Queue[Any], stream: IO[bytes], stats: LogQueueStats, batch_size: int = 256) -> None:
+        super().__init__(name="iok-log-writer", daemon=True)
+        self.records = records
+        self.stream = stream
+        self.stats = stats
+        self.batch_size = batch_size
+
+    def run(self) -> None:
+        while True:
+            item = self.records.get()
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(r is _STOP for r in batch)
+            lines = [self._render_safe(r) for r in batch if r is not _STOP]
+            if lines:
+                try:
+                    self.stream.write(b"\n".join(lines) + b"\n")
+                    self.stream.flush()
+                    self.stats.written += len(lines)
+                    self.stats.batches += 1
+                except Exception:
+                    self.stats.write_errors += 1
+            if stop:
+                return
+
+    def _render_safe(self, record: Any) -> bytes:
+        # One bad record must never take the writer thread (and every later line) down
+        try:
+            return self._render(record)
+        except Exception as exc:
+            self.stats.render_errors += 1
+            return self._fallback(record, exc)
+
+    @staticmethod
+    def _fallback(record: Any, exc: Exception) -> bytes:
+        event = {
+            "event": repr(getattr(record, "msg", record)),
+            "args": repr(getattr(record, "args", None)),
+            "level": str(getattr(record, "levelname", "error")).lower(),
+            "logger": str(getattr(record, "name", "")),
+            "render_error": repr(exc),
+        }
+        try:
+            return orjson.dumps(event, option=orjson.OPT_SORT_KEYS)
+        except Exception:
+            return b'{"event":"unrenderable log record"}'
+
+    @staticmethod
+    def _render(record: logging.LogRecord) -> bytes:
+        if isinstance(record.msg, bytes):
+            return record.msg
+        event: dict[str, Any] = {
+            "event": record.getMessage(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+        }
+        if record.exc_info:
+            event["exception"] = logging.Formatter().formatException(record.exc_info)
+        return orjson.dumps(event, default=str, option=orjson.OPT_SORT_KEYS)
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    Root handler that only enqueues; the BatchingLogWriter does the I/O.
+
+    The queue is bounded. With policy "drop" a full queue drops the record
+    immediately; with "block" the caller waits up to `block_timeout` seconds
+    for space before dropping. Either way the drop is counted in stats.
+    """
+
+    # Always the queue.Queue built below, not just QueueHandler's put_nowait/get protocol
+    queue: queue.Queue[Any]
+
+    def __init__(
+        self,
+        stream: Optional[IO[bytes]] = None,
+        *,
+        maxsize: int = 10_000,
+        policy: Literal["drop", "block"] = "drop",
+        block_timeout: float = 0.05,
+        batch_size: int = 256,
+        close_stream: bool = False,
+    ) -> None:
+        super().__init__(queue.Queue(maxsize=maxsize))
+        self.policy = policy
+        self.close_stream = close_stream
+        self.block_timeout = block_timeout
+        self._stats = LogQueueStats()
+        self._writer = BatchingLogWriter(self.queue, stream or sys.stdout.buffer, self._stats, batch_size)
+        self._writer.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Rendering happens in the writer thread; skip QueueHandler's inline format()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if self.policy == "block":
+                self.queue.put(record, timeout=self.block_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self._stats.dropped += 1
+            return
+        self._stats.enqueued += 1
+
+    @property
+    def stats(self) -> LogQueueStats:
+        self._stats.queue_depth = self.queue.qsize()
+        return self._stats
+
+    def close(self) -> None:
+        """Flush everything queued so far and stop the writer thread."""
+        if self._writer.is_alive():
+            self.queue.put(_STOP)
+            self._writer.join(timeout=5)
+        if self.close_stream:
+            self._writer.stream.close()
+        super().close()
@@ -3,6 +3,8 @@ from __future__ import annotations
 from functools import lru_cache
 from typing import Literal
 
+from pydantic import Field
+
 from ..config.base import IOKSettings
 from pydantic_settings import SettingsConfigDict
 
@@ -16,6 +18,14 @@ class LoggingSettings(IOKSettings):
     include_trace_id: bool = True
     include_span_id: bool = True
 
+    # Opt-in: orjson rendering + bounded queue drained by a background writer thread
+    queue_enabled: bool = False
+    queue_size: int = Field(default=10_000, ge=1)
+    queue_full_policy: Literal["drop", "block"] = "drop"
+    queue_block_timeout_seconds: float = Field(default=0.05, ge=0)
+    queue_batch_size: int = Field(default=256, ge=1)
+    file_path: str | None = None  # append JSON lines here instead of stdout
+
 
 @lru_cache
 def logging_settings() -> LoggingSettings:
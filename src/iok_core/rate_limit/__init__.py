@@ -0,0 +1,28 @@
+# src/iok_core/rate_limit/__init__.py
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .lease import LeasedRateLimiter
+    from .limiter import RateLimiter, RateLimitDecision
+    from .settings import RateLimitSettings, rate_limit_settings
+
+__all__ = [
+    "LeasedRateLimiter",
+    "RateLimiter",
+    "RateLimitDecision",
+    "RateLimitSettings",
+    "rate_limit_settings",
+]
+
+# Loaded on first access so importing the package does not pull in Redis
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "LeasedRateLimiter": ".lease",
+    "RateLimiter": ".limiter",
+    "RateLimitDecision": ".limiter",
+    "RateLimitSettings": ".settings",
+    "rate_limit_settings": ".settings",
+})
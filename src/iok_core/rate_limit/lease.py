@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+from ..redis.handler import RedisHandler, RedisSessionConfig
+from ..redis.scripts import script_registry
+from .limiter import RateLimitDecision, RateLimiter
+from .settings import rate_limit_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+# Same bucket layout as TOKEN_BUCKET_LUA, so leased and direct limiters can
+# share a key, but grants up to ARGV[3] tokens instead of all-or-nothing.
+TOKEN_LEASE_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local want = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local granted = math.min(want, math.floor(tokens))
+tokens = tokens - granted
+local retry_after = 0
+if granted < 1 then
+    retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {granted, tostring(tokens), tostring(retry_after)}
+"""
+_TOKEN_LEASE = script_registry.register("iok:rate_limit:token_lease", TOKEN_LEASE_LUA)
+
+
+@dataclass
+class _Lease:
+    tokens: int = 0
+    expires_at: float = 0.0
+    retry_after: float = 0.0
+    refill: Optional[asyncio.Task[None]] = field(default=None, repr=False)
+    refill_awaited: bool = False  # a caller awaits the refill and gets its error
+
+
+class LeasedRateLimiter(RateLimiter):
+    """
+    Token-bucket limiter that reserves tokens from Redis in batches.
+
+    Each process leases up to `lease_size` tokens from the shared bucket and
+    spends them in memory, so a hot key costs one round trip per lease rather
+    than per request. A background refill starts once the local balance drops
+    below `refill_threshold * lease_size`.
+
+    Over-admission is bounded: a process never holds more than
+    `max_over_admission` unspent tokens, and unspent tokens are discarded
+    `lease_ttl_seconds` after the last grant.
+
+    Leases are kept for at most `max_keys` keys (least recently used are
+    dropped first, with their unspent tokens), so per-user or per-IP keys
+    do not grow memory without bound.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        window_seconds: Optional[float] = None,
+        *,
+        lease_size: Optional[int] = None,
+        max_over_admission: Optional[int] = None,
+        lease_ttl_seconds: Optional[float] = None,
+        refill_threshold: Optional[float] = None,
+        max_keys: Optional[int] = None,
+        config: Optional[RedisSessionConfig] = None,
+    ) -> None:
+        super().__init__(limit, window_seconds, "token_bucket", config=config)
+        settings = rate_limit_settings()
+        self.lease_size = lease_size if lease_size is not None else settings.lease_size
+        self.max_over_admission = (
+            max_over_admission if max_over_admission is not None else settings.lease_max_over_admission
+        )
+        self.lease_ttl_seconds = lease_ttl_seconds if lease_ttl_seconds is not None else settings.lease_ttl_seconds
+        self.max_keys = max_keys if max_keys is not None else settings.lease_max_keys
+        threshold = refill_threshold if refill_threshold is not None else settings.lease_refill_threshold
+        if self.lease_size < 1:
+            raise ValueError("lease_size must be >= 1")
+        if self.max_over_admission < 1:
+            raise ValueError("max_over_admission must be >= 1")
+        if self.max_keys < 1:
+            raise ValueError("max_keys must be >= 1")
+
+        self._low_watermark = threshold * self.lease_size
+        self._lease_script = _TOKEN_LEASE
+        self._leases: OrderedDict[str, _Lease] = OrderedDict()
+
+    @property
+    def leased_keys(self) -> int:
+        """Keys with a local lease (at most max_keys)."""
+        return len(self._leases)
+
+    def _lease(self, key: str) -> _Lease:
+        lease = self._leases.get(key)
+        if lease is not None:
+            self._leases.move_to_end(key)
+            if lease.tokens and lease.expires_at <= time.monotonic():
+                lease.tokens = 0
+            return lease
+        lease = self._leases[key] = _Lease()
+        if len(self._leases) > self.max_keys:
+            self._evict(keep=key)
+        return lease
+
+    def _evict(self, keep: str) -> None:
+        # Oldest first; a lease with a reservation in flight stays until it lands
+        while len(self._leases) > self.max_keys:
+            victim = next((k for k, lease in self._leases.items() if k != keep and lease.refill is None), None)
+            if victim is None:
+                return
+            del self._leases[victim]
+
+    async def _reserve(self, key: str, lease: _Lease) -> None:
+        want = min(self.lease_size, self.max_over_admission - lease.tokens)
+        if want < 1:
+            return
+        async with RedisHandler.session(self.config) as client:
+            raw = await script_registry.call(client, self._lease_script, [self._key(key)], (*self._params, want))
+        granted = int(raw[0])
+        lease.retry_after = max(0.0, float(raw[2])) / 1000
+        if granted:
+            lease.tokens += granted
+            lease.expires_at = time.monotonic() + self.lease_ttl_seconds
+
+    def _start_refill(self, key: str, lease: _Lease) -> asyncio.Task[None]:
+        # One reservation in flight per key; concurrent callers share it
+        if lease.refill is None:
+            lease.refill_awaited = False
+            lease.refill = asyncio.create_task(self._reserve(key, lease))
+            lease.refill.add_done_callback(lambda task: self._refill_done(key, lease, task))
+        return lease.refill
+
+    @staticmethod
+    def _refill_done(key: str, lease: _Lease, task: asyncio.Task[None]) -> None:
+        lease.refill = None
+        if task.cancelled() or task.exception() is None:
+            return
+        # An awaiting caller already got the error; only report unobserved background refills
+        if not lease.refill_awaited:
+            logger.warning("Rate limit lease refill failed for %s", key, exc_info=task.exception())
+
+    async def check(self, key: str, cost: int = 1) -> RateLimitDecision:
+        """Consume `cost` units for `key`, from the local lease when possible."""
+        lease = self._lease(key)
+
+        # A refill already in flight may be consumed by other waiters, so
+        # allow one fresh reservation of our own before denying.
+        for _ in range(2):
+            if lease.tokens >= cost:
+                break
+            refill = self._start_refill(key, lease)
+            lease.refill_awaited = True
+            await asyncio.shield(refill)
+            if lease.retry_after:
+                break
+
+        if lease.tokens < cost:
+            return RateLimitDecision(
+                key=key,
+                allowed=False,
+                limit=self.limit,
+                remaining=lease.tokens,
+                retry_after=lease.retry_after,
+            )
+
+        lease.tokens -= cost
+        if lease.tokens < self._low_watermark:
+            self._start_refill(key, lease)
+
+        return RateLimitDecision(
+            key=key,
+            allowed=True,
+            limit=self.limit,
+            remaining=lease.tokens,
+            retry_after=0.0,
+        )
+
+    async def check_many(self, keys: Sequence[str], cost: int = 1) -> list[RateLimitDecision]:
+        """Decide each key against its local lease; only drained leases touch Redis."""
+        return [await self.check(key, cost) for key in keys]
+
+    async def close(self) -> None:
+        """Cancel in-flight refills and drop all local leases."""
+        tasks = [lease.refill for lease in self._leases.values() if lease.refill is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._leases.clear()
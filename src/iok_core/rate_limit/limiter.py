@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Literal, Optional, Sequence
+
+from ..redis.handler import RedisHandler, RedisSessionConfig
+from ..redis.scripts import Script, script_registry
+from .settings import rate_limit_settings
+
+
+logger = logging.getLogger(__name__)
+
+Algorithm = Literal["token_bucket", "sliding_window"]
+
+
+# Both scripts read the clock from Redis TIME so every node agrees on "now",
+# and keep all state for a key in a single hash (cluster-safe, one PEXPIRE).
+TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local start = now - (now % window)
+local state = redis.call('HMGET', KEYS[1], 'start', 'cur', 'prev')
+local cur_start = tonumber(state[1]) or start
+local cur = tonumber(state[2]) or 0
+local prev = tonumber(state[3]) or 0
+if start - cur_start >= 2 * window then
+    prev = 0
+    cur = 0
+elseif start > cur_start then
+    prev = cur
+    cur = 0
+end
+local elapsed = now - start
+local used = prev * (window - elapsed) / window + cur
+local allowed = 0
+local retry_after = 0
+if used + cost <= limit then
+    cur = cur + cost
+    used = used + cost
+    allowed = 1
+elseif cur + cost <= limit then
+    retry_after = (1 - (limit - cur - cost) / prev) * window - elapsed
+else
+    retry_after = window - elapsed
+end
+redis.call('HSET', KEYS[1], 'start', start, 'cur', cur, 'prev', prev)
+redis.call('PEXPIRE', KEYS[1], 2 * window)
+return {allowed, tostring(math.max(0, limit - used)), tostring(retry_after)}
+"""
+
+_SCRIPTS: dict[str, Script] = {
+    "token_bucket": script_registry.register("iok:rate_limit:token_bucket", TOKEN_BUCKET_LUA),
+    "sliding_window": script_registry.register("iok:rate_limit:sliding_window", SLIDING_WINDOW_LUA),
+}
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    key: str
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until the request would be allowed, 0 if allowed
+
+
+class RateLimiter:
+    """
+    Distributed rate limiter on top of RedisHandler.session().
+
+    Every decision is a single EVALSHA executed atomically on the server;
+    check_many() decides a whole batch of keys in one pipelined round trip.
+
+    Throughput and p99 overhead against a local redis-server are measured by
+    tests/integration/test_rate_limit_integration.py (run it with `pytest -s` to print them).
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        window_seconds: Optional[float] = None,
+        algorithm: Optional[Algorithm] = None,
+        *,
+        config: Optional[RedisSessionConfig] = None,
+    ) -> None:
+        settings = rate_limit_settings()
+        self.limit = limit if limit is not None else settings.limit
+        self.window_seconds = window_seconds if window_seconds is not None else settings.window_seconds
+        self.algorithm: Algorithm = algorithm or settings.algorithm
+        if self.limit < 1:
+            raise ValueError("limit must be >= 1")
+        if self.window_seconds <= 0:
+            raise ValueError("window_seconds must be > 0")
+        if self.algorithm not in _SCRIPTS:
+            raise ValueError(f"Unknown rate limit algorithm: {self.algorithm}")
+
+        self.config = config or RedisSessionConfig(prefix=settings.key_prefix)
+
+        self._script = _SCRIPTS[self.algorithm]
+
+        window_ms = max(1, round(self.window_seconds * 1000))
+        if self.algorithm == "token_bucket":
+            self._params: tuple[float, ...] = (self.limit, self.limit / window_ms)
+        else:
+            self._params = (self.limit, window_ms)
+
+    def _key(self, key: str) -> str:
+        return f"{self.config.prefix}{key}"
+
+    def _decision(self, key: str, raw: Sequence[Any]) -> RateLimitDecision:
+        allowed, remaining, retry_after_ms = raw
+        return RateLimitDecision(
+            key=key,
+            allowed=bool(int(allowed)),
+            limit=self.limit,
+            remaining=int(float(remaining)),
+            retry_after=max(0.0, float(retry_after_ms)) / 1000,
+        )
+
+    async def check(self, key: str, cost: int = 1) -> RateLimitDecision:
+        """Consume `cost` units for `key` and return the decision."""
+        async with RedisHandler.session(self.config) as client:
+            raw = await script_registry.call(client, self._script, [self._key(key)], (*self._params, cost))
+        return self._decision(key, raw)
+
+    async def check_many(self, keys: Sequence[str], cost: int = 1) -> list[RateLimitDecision]:
+        """Decide many keys in a single pipelined round trip, in input order."""
+        if not keys:
+            return []
+
+        async with RedisHandler.session(self.config) as client:
+            args = (*self._params, cost)
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                script_registry.queue(pipe, self._script, [self._key(key)], args)
+            # NOSCRIPT entries never ran, so only those keys are re-decided
+            results = await script_registry.execute(client, pipe)
+
+        return [self._decision(key, raw) for key, raw in zip(keys, results)]
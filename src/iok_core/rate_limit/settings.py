@@ -1,33 +1,32 @@
-# src/iok_core/redis/settings.py
 from __future__ import annotations
 
 from functools import lru_cache
-from pydantic import Field, SecretStr
-from pydantic_settings import BaseSettings, SettingsConfigDict
-
-# Optional: inherit from shared base if you want global overrides
-# from ..config.base import ConfigBase
-# class RedisSettings(ConfigBase):
-class RedisSettings(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_prefix="IOK_REDIS_",   # ← all Redis env vars start with IOK_REDIS_
-        case_sensitive=False,
-        extra="ignore",
-    )
-
-    endpoint: str = Field(..., description="redis(s):// or rediss:// URL")
-    password: SecretStr | None = Field(default=None)
-    tls_enabled: bool = Field(default=True)
-    client_cert_path: str = Field(default="certs/redis/client.crt")
-    client_key_path: str = Field(default="certs/redis/client.key")
-    max_connections: int = Field(default=20, ge=1, le=100)
-    disabled: bool = Field(default=False, description="Globally disable Redis")
-
-    # Per-consumer defaults can override these
-    default_ttl_seconds: int = Field(default=60*60*24*7)
+from typing import Literal
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from ..config.base import IOKSettings
+
+
+class RateLimitSettings(IOKSettings):
+    model_config = SettingsConfigDict(env_prefix="IOK_RATE_LIMIT_")
+
+    algorithm: Literal["token_bucket", "sliding_window"] = "token_bucket"
+    limit: int = Field(default=100, ge=1)
+    window_seconds: float = Field(default=1.0, gt=0)
+    key_prefix: str = "ratelimit:"
+
+    # Leased mode (LeasedRateLimiter): tokens reserved per Redis round trip,
+    # the most tokens one process may hold unspent, and how long they stay valid.
+    lease_size: int = Field(default=50, ge=1)
+    lease_max_over_admission: int = Field(default=100, ge=1)
+    lease_ttl_seconds: float = Field(default=1.0, gt=0)
+    lease_refill_threshold: float = Field(default=0.25, ge=0, lt=1)
+    # Keys with a local lease per limiter; least recently used are dropped beyond this
+    lease_max_keys: int = Field(default=10_000, ge=1)
 
 
 @lru_cache
-def redis_settings() -> RedisSettings:
-    """Thread-safe singleton — used everywhere"""
-    return RedisSettings()
\ No newline at end of file
+def rate_limit_settings() -> RateLimitSettings:
+    return RateLimitSettings()
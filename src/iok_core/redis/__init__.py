@@ -1,12 +1,95 @@
 # src/iok_core/redis/__init__.py
-from .handler import RedisHandler, RedisSessionConfig
-from .settings import redis_settings
-from .exceptions import RedisConnectionError, RedisDisabledError
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .handler import RedisHandler, RedisSessionConfig
+    from .sync_handler import SyncRedisHandler
+    from .batching import AutoBatchingClient, BatchStats
+    from .metrics import RedisMetrics, redis_metrics
+    from .scripts import Script, ScriptRegistry, script_registry
+    from .primitives import RedisPrimitives
+    from .scan import BulkResult, KeyspaceScanner
+    from .pool import AdaptiveConnectionPool, PoolStats
+    from .pubsub import PubSubHub, PubSubMessage, SlowConsumerError, Subscription
+    from .codec import Codec, CompressedCodec, JsonCodec, RawCodec, TypedStore
+    from .settings import redis_settings, redis_settings_sync
+    from .exceptions import (
+        RedisConnectionError,
+        RedisDeadlineExceeded,
+        RedisDisabledError,
+        RedisPoolExhausted,
+        RedisSerializationError,
+    )
 
 __all__ = [
     "RedisHandler",
     "RedisSessionConfig",
+    "SyncRedisHandler",
+    "AutoBatchingClient",
+    "BatchStats",
+    "Codec",
+    "RawCodec",
+    "JsonCodec",
+    "CompressedCodec",
+    "TypedStore",
+    "RedisMetrics",
+    "redis_metrics",
+    "Script",
+    "ScriptRegistry",
+    "script_registry",
+    "RedisPrimitives",
+    "KeyspaceScanner",
+    "BulkResult",
+    "AdaptiveConnectionPool",
+    "PoolStats",
+    "PubSubHub",
+    "PubSubMessage",
+    "Subscription",
+    "SlowConsumerError",
     "redis_settings",
+    "redis_settings_sync",
     "RedisConnectionError",
+    "RedisDeadlineExceeded",
     "RedisDisabledError",
-]
\ No newline at end of file
+    "RedisPoolExhausted",
+    "RedisSerializationError",
+]
+
+# Submodules (and redis-py/OpenTelemetry behind them) load on first attribute access
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "RedisHandler": ".handler",
+    "RedisSessionConfig": ".handler",
+    "SyncRedisHandler": ".sync_handler",
+    "AutoBatchingClient": ".batching",
+    "BatchStats": ".batching",
+    "RedisMetrics": ".metrics",
+    "redis_metrics": ".metrics",
+    "Script": ".scripts",
+    "ScriptRegistry": ".scripts",
+    "script_registry": ".scripts",
+    "RedisPrimitives": ".primitives",
+    "KeyspaceScanner": ".scan",
+    "BulkResult": ".scan",
+    "AdaptiveConnectionPool": ".pool",
+    "PoolStats": ".pool",
+    "PubSubHub": ".pubsub",
+    "PubSubMessage": ".pubsub",
+    "Subscription": ".pubsub",
+    "SlowConsumerError": ".pubsub",
+    "Codec": ".codec",
+    "CompressedCodec": ".codec",
+    "JsonCodec": ".codec",
+    "RawCodec": ".codec",
+    "TypedStore": ".codec",
+    "redis_settings": ".settings",
+    "redis_settings_sync": ".settings",
+    "RedisConnectionError": ".exceptions",
+    "RedisDeadlineExceeded": ".exceptions",
+    "RedisDisabledError": ".exceptions",
+    "RedisPoolExhausted": ".exceptions",
+    "RedisSerializationError": ".exceptions",
+})
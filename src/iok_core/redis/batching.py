@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from redis.asyncio.cluster import RedisCluster
+from redis.crc import key_slot
+
+from .handler import RedisHandler, RedisSessionConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchStats:
+    batches: int = 0
+    commands: int = 0
+    coalesced_gets: int = 0  # GETs folded into an MGET
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.commands / self.batches if self.batches else 0.0
+
+
+@dataclass
+class _Pending:
+    method: str
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    future: asyncio.Future[Any]
+
+
+def _slot(key: Any) -> int:
+    return key_slot(key.encode() if isinstance(key, str) else bytes(key))
+
+
+def _same_slot(a: _Pending, b: _Pending) -> bool:
+    return _slot(a.args[0]) == _slot(b.args[0])
+
+
+def _any_slot(a: _Pending, b: _Pending) -> bool:
+    return True
+
+
+class AutoBatchingClient:
+    """
+    Opt-in client that coalesces commands from concurrent coroutines.
+
+    Commands issued within one event-loop tick (or within `max_delay` seconds
+    when set) are flushed together as a single non-transactional pipeline on
+    one pooled connection; a batch is flushed early once it holds `max_batch`
+    commands. Consecutive GETs in a batch are folded into one MGET (on a
+    cluster, only GETs of keys in the same hash slot). Each
+    caller awaits its own result, and per-command errors are raised only to
+    the caller that issued the command.
+
+    Commands keep their issue order within a batch, so read-your-writes holds
+    for a single coroutine. Different batches may run concurrently.
+
+    Keys passed to the named commands are scoped by `config.prefix`;
+    execute_command() sends its arguments as given.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RedisSessionConfig] = None,
+        *,
+        max_batch: int = 256,
+        max_delay: float = 0.0,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.config = config or RedisSessionConfig()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.stats = BatchStats()
+        self._pending: list[_Pending] = []
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._in_flight: set[asyncio.Task[None]] = set()
+
+    def _key(self, key: str) -> str:
+        return f"{self.config.prefix}{key}"
+
+    # ─────────────────────── commands ───────────────────────
+
+    def execute_command(self, *args: Any, **options: Any) -> asyncio.Future[Any]:
+        return self._enqueue("execute_command", args, options)
+
+    def get(self, name: str) -> asyncio.Future[Any]:
+        return self._enqueue("get", (self._key(name),), {})
+
+    def mget(self, *names: str) -> asyncio.Future[Any]:
+        return self._enqueue("mget", tuple(map(self._key, names)), {})
+
+    def set(self, name: str, value: Any, **kwargs: Any) -> asyncio.Future[Any]:
+        return self._enqueue("set", (self._key(name), value), kwargs)
+
+    def mset(self, mapping: dict[str, Any]) -> asyncio.Future[Any]:
+        return self._enqueue("mset", ({self._key(k): v for k, v in mapping.items()},), {})
+
+    def delete(self, *names: str) -> asyncio.Future[Any]:
+        return self._enqueue("delete", tuple(map(self._key, names)), {})
+
+    def exists(self, *names: str) -> asyncio.Future[Any]:
+        return self._enqueue("exists", tuple(map(self._key, names)), {})
+
+    def expire(self, name: str, seconds: int, **kwargs: Any) -> asyncio.Future[Any]:
+        return self._enqueue("expire", (self._key(name), seconds), kwargs)
+
+    def ttl(self, name: str) -> asyncio.Future[Any]:
+        return self._enqueue("ttl", (self._key(name),), {})
+
+    def incr(self, name: str, amount: int = 1) -> asyncio.Future[Any]:
+        return self._enqueue("incrby", (self._key(name), amount), {})
+
+    def hget(self, name: str, key: str) -> asyncio.Future[Any]:
+        return self._enqueue("hget", (self._key(name), key), {})
+
+    def hset(self, name: str, key: Optional[str] = None, value: Any = None, **kwargs: Any) -> asyncio.Future[Any]:
+        return self._enqueue("hset", (self._key(name), key, value), kwargs)
+
+    # ─────────────────────── batching ───────────────────────
+
+    def _enqueue(self, method: str, args: tuple[Any, ...], kwargs: dict[str, Any]) -> asyncio.Future[Any]:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._pending.append(_Pending(method, args, kwargs, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            if self.max_delay > 0:
+                self._flush_handle = loop.call_later(self.max_delay, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+        task.add_done_callback(lambda t: self._settle(batch, t))
+
+    async def _send(self, batch: list[_Pending]) -> None:
+        live = [p for p in batch if not p.future.done()]
+        if not live:
+            return
+
+        # Each pipeline slot resolves one or more callers
+        slots: list[list[_Pending]] = []
+        try:
+            async with RedisHandler.session(self.config) as client:
+                pipe = client.pipeline(transaction=False)
+                # A cross-slot MGET fails with CROSSSLOT on a cluster
+                same_slot = _same_slot if isinstance(client, RedisCluster) else _any_slot
+                for p in live:
+                    if p.method == "get" and slots and slots[-1][0].method == "get" and same_slot(slots[-1][0], p):
+                        slots[-1].append(p)
+                        continue
+                    slots.append([p])
+                for slot in slots:
+                    if len(slot) > 1:
+                        pipe.mget([p.args[0] for p in slot])
+                        self.stats.coalesced_gets += len(slot)
+                    else:
+                        p = slot[0]
+                        getattr(pipe, p.method)(*p.args, **p.kwargs)
+                results = await pipe.execute(raise_on_error=False)
+        except Exception as exc:
+            for p in live:
+                if not p.future.done():
+                    p.future.set_exception(exc)
+            return
+
+        self.stats.batches += 1
+        self.stats.commands += len(live)
+        for slot, result in zip(slots, results):
+            if len(slot) > 1 and not isinstance(result, Exception):
+                for p, value in zip(slot, result):
+                    if not p.future.done():
+                        p.future.set_result(value)
+                continue
+            for p in slot:
+                if p.future.done():
+                    continue
+                if isinstance(result, Exception):
+                    p.future.set_exception(result)
+                else:
+                    p.future.set_result(result)
+
+    @staticmethod
+    def _settle(batch: list[_Pending], task: asyncio.Task[None]) -> None:
+        # _send resolves every caller unless it was cancelled (possibly before it
+        # started) or died of a BaseException; never leave a caller waiting forever
+        exc = None if task.cancelled() else task.exception()
+        for p in batch:
+            if p.future.done():
+                continue
+            if exc is None:
+                p.future.cancel()
+            else:
+                p.future.set_exception(exc)
+
+    async def flush(self) -> None:
+        """Send everything queued so far and wait for all in-flight batches."""
+        self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def close(self) -> None:
+        await self.flush()
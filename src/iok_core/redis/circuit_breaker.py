@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Literal
+
+from .exceptions import RedisCircuitBreakerOpen
+from .settings import RedisSettings
+
+
+logger = logging.getLogger(__name__)
+
+BreakerState = Literal["closed", "open", "half_open"]
+
+
+@dataclass
+class BreakerStats:
+    state: BreakerState
+    successes: int = 0
+    failures: int = 0
+    slow_calls: int = 0
+    rejections: int = 0
+    transitions: dict[str, int] = field(default_factory=dict)  # "closed->open": n
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker shared by every session on one event loop.
+
+    Calls are recorded in a rolling window of `window_seconds` split into
+    buckets. Once the window holds `min_calls` calls and the failure rate or
+    the slow-call rate reaches its threshold, the breaker opens and rejects
+    without touching the network for `open_seconds`. It then lets at most
+    `half_open_max_calls` probes through; all of them succeeding closes it,
+    any failure re-opens it.
+
+    Single-event-loop use only: no locks, no per-call allocations.
+    """
+
+    _BUCKETS = 10
+
+    def __init__(
+        self,
+        *,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 1.0,
+        slow_call_rate_threshold: float = 1.0,
+        min_calls: int = 20,
+        window_seconds: float = 10.0,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._bucket_width = window_seconds / self._BUCKETS
+        self._calls = [0] * self._BUCKETS
+        self._failures = [0] * self._BUCKETS
+        self._slow = [0] * self._BUCKETS
+        self._epoch = int(clock() / self._bucket_width)
+
+        self._state: BreakerState = "closed"
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._listeners: list[Callable[[BreakerState, BreakerState], None]] = []
+        self._stats = BreakerStats(state="closed")
+
+    @classmethod
+    def from_settings(cls, settings: RedisSettings) -> CircuitBreaker:
+        return cls(
+            failure_rate_threshold=settings.circuit_failure_rate,
+            slow_call_seconds=settings.circuit_slow_call_seconds,
+            slow_call_rate_threshold=settings.circuit_slow_call_rate,
+            min_calls=settings.circuit_min_calls,
+            window_seconds=settings.circuit_window_seconds,
+            open_seconds=settings.circuit_open_seconds,
+            half_open_max_calls=settings.circuit_half_open_max_calls,
+        )
+
+    # ─────────────────────── state ───────────────────────
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == "open" and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition("half_open")
+        return self._state
+
+    @property
+    def retry_after_seconds(self) -> int:
+        remaining = self.open_seconds - (self._clock() - self._opened_at)
+        return max(1, math.ceil(remaining))
+
+    def add_listener(self, listener: Callable[[BreakerState, BreakerState], None]) -> None:
+        """Call `listener(old_state, new_state)` on every transition."""
+        self._listeners.append(listener)
+
+    def stats(self) -> BreakerStats:
+        return BreakerStats(
+            state=self.state,
+            successes=self._stats.successes,
+            failures=self._stats.failures,
+            slow_calls=self._stats.slow_calls,
+            rejections=self._stats.rejections,
+            transitions=dict(self._stats.transitions),
+        )
+
+    def reset(self) -> None:
+        self._clear_window()
+        if self._state != "closed":
+            self._transition("closed")
+
+    def _transition(self, new: BreakerState) -> None:
+        old, self._state = self._state, new
+        key = f"{old}->{new}"
+        self._stats.transitions[key] = self._stats.transitions.get(key, 0) + 1
+        self._stats.state = new
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if new == "open":
+            self._opened_at = self._clock()
+            logger.warning("Redis circuit breaker opened — failing fast for %.0fs", self.open_seconds)
+        elif new == "closed":
+            self._clear_window()
+            logger.info("Redis circuit breaker closed")
+        else:
+            logger.info("Redis circuit breaker half-open — probing")
+        for listener in self._listeners:
+            try:
+                listener(old, new)
+            except Exception:
+                logger.debug("Circuit breaker listener failed", exc_info=True)
+
+    # ─────────────────────── rolling window ───────────────────────
+
+    def _clear_window(self) -> None:
+        for i in range(self._BUCKETS):
+            self._calls[i] = self._failures[i] = self._slow[i] = 0
+
+    def _slot(self) -> int:
+        epoch = int(self._clock() / self._bucket_width)
+        if epoch != self._epoch:
+            for step in range(1, min(epoch - self._epoch, self._BUCKETS) + 1):
+                i = (self._epoch + step) % self._BUCKETS
+                self._calls[i] = self._failures[i] = self._slow[i] = 0
+            self._epoch = epoch
+        return epoch % self._BUCKETS
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        i = self._slot()
+        self._calls[i] += 1
+        self._failures[i] += failed
+        self._slow[i] += slow
+
+        calls = sum(self._calls)
+        if calls < self.min_calls:
+            return
+        if (
+            sum(self._failures) / calls >= self.failure_rate_threshold
+            or sum(self._slow) / calls >= self.slow_call_rate_threshold
+        ):
+            self._transition("open")
+
+    # ─────────────────────── call protocol ───────────────────────
+
+    def before_call(self) -> None:
+        """Admit a call or raise RedisCircuitBreakerOpen without any I/O."""
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half_open" and self._probes_in_flight < self.half_open_max_calls:
+            self._probes_in_flight += 1
+            return
+        self._stats.rejections += 1
+        raise RedisCircuitBreakerOpen(retry_after_seconds=self.retry_after_seconds)
+
+    def on_success(self, elapsed: float) -> None:
+        slow = elapsed >= self.slow_call_seconds
+        self._stats.successes += 1
+        self._stats.slow_calls += slow
+        if self._state == "half_open":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if slow:
+                self._transition("open")
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_max_calls:
+                self._transition("closed")
+        elif self._state == "closed":
+            self._record(failed=False, slow=slow)
+
+    def on_failure(self) -> None:
+        self._stats.failures += 1
+        if self._state == "half_open":
+            self._transition("open")
+        elif self._state == "closed":
+            self._record(failed=True, slow=False)
+
+    def on_ignored(self) -> None:
+        """The call ended without telling us anything about Redis health."""
+        if self._state == "half_open" and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import dataclasses
+import zlib
+from typing import Any, Generic, Optional, Protocol, Sequence, TypeVar, Union
+
+import orjson
+
+from .exceptions import RedisSerializationError
+from .handler import RedisHandler, RedisSessionConfig
+
+
+T = TypeVar("T")
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class Codec(Protocol[T]):
+    def encode(self, value: T) -> bytes: ...
+
+    def decode(self, data: Buffer) -> T: ...
+
+
+class RawCodec:
+    """Bytes in, bytes out."""
+
+    def encode(self, value: Buffer) -> bytes:
+        if not isinstance(value, (bytes, bytearray, memoryview)):
+            raise RedisSerializationError(f"RawCodec expects bytes, got {type(value).__name__}")
+        return bytes(value)
+
+    def decode(self, data: Buffer) -> bytes:
+        return data if isinstance(data, bytes) else bytes(data)
+
+
+class JsonCodec(Generic[T]):
+    """
+    orjson codec, optionally typed.
+
+    With `type_=None` values round-trip as plain JSON. Dataclasses are
+    rebuilt from the decoded dict; pydantic models are validated straight
+    from the raw bytes with `model_validate_json`.
+    """
+
+    def __init__(self, type_: Optional[type[T]] = None, *, option: int = 0) -> None:
+        self.type_ = type_
+        self.option = option
+        self._pydantic = type_ is not None and hasattr(type_, "model_validate_json")
+        self._dataclass = type_ is not None and dataclasses.is_dataclass(type_)
+
+    @staticmethod
+    def _default(value: Any) -> Any:
+        if hasattr(value, "model_dump"):
+            return value.model_dump(mode="json")
+        raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+    def encode(self, value: T) -> bytes:
+        try:
+            return orjson.dumps(value, default=self._default, option=self.option)
+        except TypeError as exc:
+            raise RedisSerializationError(f"Cannot encode {type(value).__name__} as JSON") from exc
+
+    def decode(self, data: Buffer) -> T:
+        try:
+            if self._pydantic:
+                # pydantic wants bytes; orjson below reads memoryviews in place
+                raw = data if isinstance(data, (bytes, bytearray)) else bytes(data)
+                return self.type_.model_validate_json(raw)  # type: ignore[union-attr,no-any-return]
+            obj = orjson.loads(data)
+            if self._dataclass:
+                return self.type_(**obj)  # type: ignore[misc]
+            return obj  # type: ignore[no-any-return]
+        except Exception as exc:
+            raise RedisSerializationError(f"Cannot decode JSON payload ({len(data)} bytes)") from exc
+
+
+class CompressedCodec(Generic[T]):
+    """
+    Wraps another codec and zlib-compresses payloads of `threshold` bytes or more.
+
+    A one-byte header marks the encoding, so small and large values can share
+    a keyspace and the threshold can change without rewriting old values.
+    """
+
+    _PLAIN = b"\x00"
+    _ZLIB = b"\x01"
+
+    def __init__(self, inner: Codec[T], *, threshold: int = 1024, level: int = 6) -> None:
+        self.inner = inner
+        self.threshold = threshold
+        self.level = level
+
+    def encode(self, value: T) -> bytes:
+        payload = self.inner.encode(value)
+        if len(payload) >= self.threshold:
+            return self._ZLIB + zlib.compress(payload, self.level)
+        return self._PLAIN + payload
+
+    def decode(self, data: Buffer) -> T:
+        view = memoryview(data)
+        if not view:
+            raise RedisSerializationError("Empty payload has no codec header")
+        header, body = view[:1].tobytes(), view[1:]
+        if header == self._PLAIN:
+            return self.inner.decode(body)
+        if header == self._ZLIB:
+            try:
+                return self.inner.decode(zlib.decompress(body))
+            except zlib.error as exc:
+                raise RedisSerializationError("Corrupt compressed payload") from exc
+        raise RedisSerializationError(f"Unknown codec header {header!r}")
+
+
+class TypedStore(Generic[T]):
+    """
+    Typed get/set over a binary session: values go through `codec` and are
+    never UTF-8 decoded on the way in, so large payloads skip the str copy.
+
+    Keys are scoped by `config.prefix` and written with `config.default_ttl`.
+    """
+
+    def __init__(self, codec: Codec[T], config: Optional[RedisSessionConfig] = None) -> None:
+        self.codec = codec
+        base = config or RedisSessionConfig()
+        self.config = dataclasses.replace(base, binary=True)
+
+    def _key(self, key: str) -> str:
+        return f"{self.config.prefix}{key}"
+
+    def _decode(self, data: Union[bytes, str]) -> T:
+        if isinstance(data, str):
+            # Only a client built with decode_responses=True returns str, and the
+            # UTF-8 decode has already mangled (or rejected) binary payloads
+            raise RedisSerializationError("TypedStore needs a binary client; the session returned str")
+        return self.codec.decode(data)
+
+    async def get(self, key: str) -> Optional[T]:
+        async with RedisHandler.session(self.config) as client:
+            data = await client.get(self._key(key))
+        return None if data is None else self._decode(data)
+
+    async def mget(self, keys: Sequence[str]) -> list[Optional[T]]:
+        if not keys:
+            return []
+        async with RedisHandler.session(self.config) as client:
+            values = await client.mget([self._key(k) for k in keys])
+        return [None if data is None else self._decode(data) for data in values]
+
+    async def set(self, key: str, value: T, ttl: Optional[int] = None) -> None:
+        payload = self.codec.encode(value)
+        ttl = ttl if ttl is not None else self.config.default_ttl
+        async with RedisHandler.session(self.config) as client:
+            await client.set(self._key(key), payload, ex=ttl)
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        async with RedisHandler.session(self.config) as client:
+            return int(await client.delete(*(self._key(k) for k in keys)))
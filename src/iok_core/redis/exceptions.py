@@ -39,6 +39,29 @@ class RedisCircuitBreakerOpen(RedisError):
         super().__init__(f"Redis circuit breaker open — retry after {retry_after_seconds}s")
 
 
+class RedisPoolExhausted(RedisError):
+    """Raised when no pooled connection freed up in time (backpressure, not an outage)"""
+
+    def __init__(self, waited_seconds: float = 0.0, waiters: int = 0, max_connections: Optional[int] = None):
+        self.waited_seconds = waited_seconds
+        self.waiters = waiters
+        self.max_connections = max_connections
+        super().__init__(
+            f"Redis connection pool saturated — waited {waited_seconds:.3f}s "
+            f"({max_connections} connections busy, {waiters} callers still queued)"
+        )
+
+
+class RedisDeadlineExceeded(RedisError, TimeoutError):
+    """Raised when a session runs out of its time budget (caller deadline)"""
+
+    def __init__(self, elapsed_seconds: float = 0.0, budget_seconds: Optional[float] = None):
+        self.elapsed_seconds = elapsed_seconds
+        self.budget_seconds = budget_seconds
+        budget = f" of a {budget_seconds:.3f}s budget" if budget_seconds is not None else ""
+        super().__init__(f"Redis deadline exceeded after {elapsed_seconds:.3f}s{budget}")
+
+
 class RedisKeyError(RedisError, KeyError):
     """Raised when a Redis key operation fails (e.g. key not found with GET)"""
     pass
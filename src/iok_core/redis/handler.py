@@ -3,29 +3,41 @@ from __future__ import annotations
 import asyncio
 import ssl
 import logging
-from contextlib import asynccontextmanager
+import sys
+import time
+from contextlib import asynccontextmanager, nullcontext
 from dataclasses import dataclass
 from pathlib import Path
-from typing import AsyncIterator, Optional
+from typing import Any, AsyncIterator, Awaitable, Optional
 from urllib.parse import urlparse, urlunparse
 
 from redis.asyncio import Redis, ConnectionPool
-from redis.asyncio.connection import (
-    SSLConnection,
-    UnixDomainSocketConnection,
-)
+from redis.asyncio.connection import UnixDomainSocketConnection
 from redis.exceptions import (
     ConnectionError as RedisPyConnectionError,
     TimeoutError as RedisPyTimeoutError,
     AuthenticationError,
+    MaxConnectionsError,
 )
 
 from ..config.base import core_settings
+from ..utils.time import Deadline, current_deadline
 from .settings import RedisSettings
+from .circuit_breaker import CircuitBreaker
+from .health import HealthMonitor
+from .metrics import InstrumentedConnectionPool, InstrumentedRedis, redis_metrics
+from .pool import AdaptiveConnectionPool, InstrumentedAdaptivePool
+from .registry import ClientRegistry, LoopState
+from .tls import PrewarmResult, SharedContextSSLConnection, SharedTLSContext, TLSStats
+from ..tracing.redis import end_span, start_session_span
+from ..tracing.settings import tracing_settings
+from .topology import build_cluster, build_sentinel, choose_replica, parse_address, replica_lag_bound
 from .exceptions import (
     RedisConnectionError,
     RedisDisabledError,
     RedisCircuitBreakerOpen,
+    RedisDeadlineExceeded,
+    RedisPoolExhausted,
 )
 from .settings import redis_settings
 
@@ -33,6 +45,34 @@ from .settings import redis_settings
 
 logger = logging.getLogger(__name__)
 
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as _timeout
+else:
+    from async_timeout import timeout as _timeout
+
+_UNBOUNDED = nullcontext()
+
+
+def _expired(scope: Any) -> bool:
+    # asyncio.Timeout.expired() is a method, async_timeout's a property
+    if scope is _UNBOUNDED:
+        return False
+    expired = scope.expired
+    return bool(expired() if callable(expired) else expired)
+
+
+def _in_redis_call(exc: BaseException) -> bool:
+    """Whether `exc` was raised while awaiting redis-py (not the caller's own I/O)."""
+    in_redis = False
+    tb = exc.__traceback__
+    while tb is not None:
+        frame = tb.tb_frame
+        if frame.f_code is AdaptiveConnectionPool._wait.__code__:
+            return False  # queued for a pooled connection: backpressure, not Redis
+        in_redis = in_redis or frame.f_globals.get("__name__", "").startswith("redis.")
+        tb = tb.tb_next
+    return in_redis
+
 
 @dataclass(frozen=True)
 class RedisSessionConfig:
@@ -40,20 +80,50 @@ class RedisSessionConfig:
     default_ttl: Optional[int] = None
     circuit_breaker: bool = True
     health_check: bool = True
+    binary: bool = False  # replies as bytes (no UTF-8 decode), for codecs/packed payloads
+    read_only: bool = False  # route to a replica when the topology has one; reads only
+    # Time budget for the whole session (checkout, commands, retries), on top
+    # of any utils.time.time_budget() of the caller; the earliest one wins
+    timeout: Optional[float] = None
+    deadline: Optional[Deadline] = None
 
 
 class RedisHandler:
-    _client: Optional[Redis] = None
-    _lock = asyncio.Lock()
+    # One pool per (process, event loop); see registry.py
+    _registry = ClientRegistry()
+    # One SSLContext for every TLS pool of the process, rebuilt if settings change
+    _tls: Optional[tuple[RedisSettings, SharedTLSContext]] = None
+
+    @classmethod
+    async def client(cls, *, binary: bool = False, read_only: bool = False) -> Redis:
+        """
+        Shared client for the running event loop.
+
+        With `read_only=True` a healthy replica is returned when the topology
+        has any (lowest-latency of two random picks, within
+        replica_max_lag_seconds), falling back to the primary.
+        """
+        client, _ = await cls._select(binary, read_only)
+        return client
 
     @classmethod
-    async def client(cls) -> Redis:
-        if cls._client is not None:
-            return cls._client
+    async def _select(cls, binary: bool, read_only: bool) -> tuple[Redis, Optional[HealthMonitor]]:
+        state = cls._registry.current()
+        if binary not in state.clients:
+            await cls._init(state, binary)
 
-        async with cls._lock:
-            if cls._client is not None:
-                return cls._client
+        if read_only and state.replicas.get(binary):
+            settings = await redis_settings()
+            chosen = choose_replica(state.replicas[binary], replica_lag_bound(settings))
+            if chosen is not None:
+                return chosen
+        return state.clients[binary], state.monitors.get(binary)
+
+    @classmethod
+    async def _init(cls, state: LoopState, binary: bool) -> None:
+        async with state.lock:
+            if binary in state.clients:
+                return
 
             settings = await redis_settings()
             global_settings = await core_settings()
@@ -61,13 +131,49 @@ class RedisHandler:
             if settings.disabled or global_settings.redis_disabled:
                 raise RedisDisabledError("Redis is disabled via config")
 
-            try:
-                pool = await cls._build_pool(settings)
-                client = Redis.from_pool(pool)
+            if global_settings.metrics_enabled:
+                redis_metrics.bind_meter()
+            tracing = global_settings.tracing_enabled and tracing_settings().redis_enabled
 
-                await asyncio.wait_for(client.ping(), timeout=10)
-                logger.info("iok_core RedisHandler initialized")
-                cls._client = client
+            try:
+                client, replicas = await cls._build_topology(
+                    settings,
+                    decode_responses=not binary,
+                    metrics=global_settings.metrics_enabled,
+                    tracing=tracing,
+                )
+
+                await asyncio.wait_for(client.ping(), timeout=settings.init_timeout_seconds)
+                logger.info(
+                    "iok_core RedisHandler initialized (%s%s)",
+                    settings.topology,
+                    ", binary" if binary else "",
+                )
+                state.clients[binary] = client
+
+                if settings.prewarm_connections:
+                    result = await cls._prewarm(client, settings.prewarm_connections)
+                    if not binary:
+                        state.prewarm = result
+
+                monitor = HealthMonitor.from_settings(client, settings)
+                monitor.start()
+                state.monitors[binary] = monitor
+
+                # Replicas are probed in the background; an unreachable one is
+                # simply never chosen until it recovers.
+                check_lag = replica_lag_bound(settings) is not None
+                if replicas and not check_lag and settings.replica_max_lag_seconds is not None:
+                    logger.warning("replica_max_lag_seconds is not enforced for topology=%s", settings.topology)
+                state.replicas[binary] = []
+                for replica in replicas:
+                    replica_monitor = HealthMonitor.from_settings(
+                        replica, settings, check_replication=check_lag, primary=client
+                    )
+                    replica_monitor.healthy = False
+                    replica_monitor.start()
+                    replica_monitor.trigger()
+                    state.replicas[binary].append((replica, replica_monitor))
 
             except RedisPyConnectionError as exc:
                 raise RedisConnectionError("Cannot reach Redis server") from exc
@@ -78,39 +184,22 @@ class RedisHandler:
             except Exception as exc:
                 raise RedisConnectionError("Unexpected Redis initialization error") from exc
 
-        return cls._client
-
-    @classmethod
-    async def _build_pool(cls, settings: RedisSettings) -> ConnectionPool:
-        url = cls._build_url(settings)  # only used for unix or non-TLS
-
-        base_kwargs = {
+    @staticmethod
+    def _base_kwargs(settings: RedisSettings, decode_responses: bool = True) -> dict[str, Any]:
+        return {
             "max_connections": settings.max_connections,
-            "socket_connect_timeout": 5,
-            "socket_timeout": 10,
+            "socket_connect_timeout": settings.socket_connect_timeout_seconds,
+            "socket_timeout": settings.socket_timeout_seconds,
             "socket_keepalive": True,
             "retry_on_timeout": True,
             "health_check_interval": 30,
-            "decode_responses": True,
+            "decode_responses": decode_responses,
         }
 
-        if url.startswith("unix://"):
-            return ConnectionPool(
-                connection_class=UnixDomainSocketConnection,
-                path=url[7:],
-                **base_kwargs,
-            )
-
-        if not settings.tls_enabled:
-            return ConnectionPool.from_url(url, **base_kwargs)
-
-        # ─────────────────────── FINAL WORKING TLS SETUP (2025) ───────────────────────
-        logger.debug("Building Redis TLS connection pool with custom CA")
-
+    @staticmethod
+    def _tls_kwargs(settings: RedisSettings) -> dict[str, Any]:
         # Build the connection kwargs with individual SSL parameters (this is the only way)
-        connection_kwargs = {
-            "host": settings.host,
-            "port": settings.port,
+        connection_kwargs: dict[str, Any] = {
             "password": settings.password.get_secret_value() if settings.password else None,
             "ssl_check_hostname": settings.tls_check_hostname,
             "ssl_cert_reqs": ssl.CERT_REQUIRED if settings.tls_ca_cert_path else ssl.CERT_NONE,
@@ -131,18 +220,143 @@ class RedisHandler:
             else:
                 logger.warning("mTLS cert/key missing on disk — proceeding without client cert")
 
-        connection_kwargs.update(base_kwargs)
+        return connection_kwargs
+
+    @classmethod
+    async def _build_pool(
+        cls,
+        settings: RedisSettings,
+        decode_responses: bool = True,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        pool_class: type[ConnectionPool] = ConnectionPool,
+    ) -> ConnectionPool:
+        url = cls._build_url(settings, host, port)  # only used for unix or non-TLS
+
+        base_kwargs = cls._base_kwargs(settings, decode_responses)
+        if issubclass(pool_class, AdaptiveConnectionPool):
+            base_kwargs.update(
+                min_connections=settings.min_connections,
+                checkout_timeout=settings.pool_checkout_timeout_seconds,
+                idle_seconds=settings.pool_idle_seconds,
+            )
+
+        if url.startswith("unix://"):
+            return pool_class(
+                connection_class=UnixDomainSocketConnection,
+                path=url[7:],
+                password=settings.password.get_secret_value() if settings.password else None,
+                **base_kwargs,
+            )
+
+        if not settings.tls_enabled:
+            return pool_class.from_url(url, **base_kwargs)
+
+        # ─────────────────────── FINAL WORKING TLS SETUP (2025) ───────────────────────
+        logger.debug("Building Redis TLS connection pool with custom CA")
+
+        connection_kwargs = {
+            "host": host or settings.host,
+            "port": port or settings.port,
+            "password": settings.password.get_secret_value() if settings.password else None,
+            "tls_context": cls._shared_tls(settings),
+            **base_kwargs,
+        }
 
-        return ConnectionPool(
-            connection_class=SSLConnection,
+        return pool_class(
+            connection_class=SharedContextSSLConnection,
             **connection_kwargs,
         )
-    
+
+    @classmethod
+    def _shared_tls(cls, settings: RedisSettings) -> SharedTLSContext:
+        if cls._tls is None or cls._tls[0] is not settings:
+            # Certificates are read here, once, not per connection
+            tls = SharedTLSContext(cls._tls_kwargs(settings), resumption=settings.tls_session_resumption)
+            cls._tls = (settings, tls)
+        return cls._tls[1]
+
+    @classmethod
+    def tls_stats(cls) -> Optional[TLSStats]:
+        """Handshake counts, resumptions and handshake latency of the shared TLS context."""
+        return cls._tls[1].stats if cls._tls is not None else None
+
+    @staticmethod
+    async def _prewarm(client: Any, connections: int) -> PrewarmResult:
+        """Open up to `connections` pool connections concurrently, then return them to the pool idle."""
+        pool = getattr(client, "connection_pool", None)
+        if pool is None:  # cluster clients manage per-node pools
+            return PrewarmResult(requested=connections, opened=0, failed=0, seconds=0.0)
+        connections = min(connections, pool.max_connections)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(pool.get_connection() for _ in range(connections)), return_exceptions=True)
+        opened = [c for c in results if not isinstance(c, BaseException)]
+        for connection in opened:
+            await pool.release(connection)
+        result = PrewarmResult(
+            requested=connections,
+            opened=len(opened),
+            failed=len(results) - len(opened),
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            "Pre-warmed %d/%d Redis connections in %.1fms",
+            result.opened, result.requested, result.seconds * 1000,
+        )
+        return result
+
+    @classmethod
+    async def _build_topology(
+        cls,
+        settings: RedisSettings,
+        decode_responses: bool = True,
+        metrics: bool = False,
+        tracing: bool = False,
+    ) -> tuple[Any, list[Any]]:
+        """Primary client plus read clients for the configured topology."""
+        redis_class = InstrumentedRedis if metrics or tracing else Redis
+        pool_class = cls._pool_class(settings, metrics)
+
+        if settings.topology == "sentinel":
+            primary, replicas = build_sentinel(
+                settings,
+                cls._base_kwargs(settings, decode_responses),
+                cls._tls_kwargs(settings),
+                redis_class=redis_class,
+            )
+        elif settings.topology == "cluster":
+            return build_cluster(settings, cls._base_kwargs(settings, decode_responses), cls._tls_kwargs(settings))
+        else:
+            primary = redis_class.from_pool(await cls._build_pool(settings, decode_responses, pool_class=pool_class))
+            replicas = []
+            if settings.topology == "replicas":
+                for address in settings.replica_hosts:
+                    host, port = parse_address(address, settings.port)
+                    pool = await cls._build_pool(settings, decode_responses, host, port, pool_class=pool_class)
+                    replicas.append(redis_class.from_pool(pool))
+
+        for client in [primary, *replicas]:
+            if isinstance(client, InstrumentedRedis):
+                client.iok_metrics = metrics
+                client.iok_tracing = tracing
+        return primary, replicas
+
+    @staticmethod
+    def _pool_class(settings: RedisSettings, metrics: bool) -> type[ConnectionPool]:
+        if settings.pool_mode == "adaptive":
+            return InstrumentedAdaptivePool if metrics else AdaptiveConnectionPool
+        return InstrumentedConnectionPool if metrics else ConnectionPool
 
     @staticmethod
-    def _build_url(settings: RedisSettings) -> str:
+    def _build_url(settings: RedisSettings, host: Optional[str] = None, port: Optional[int] = None) -> str:
+        host = host or settings.host
+        if host.startswith(("unix://", "/")):
+            # IOK_REDIS_HOST=/path/to/redis.sock (TLS does not apply)
+            return "unix://" + host.removeprefix("unix://")
+
         scheme = "rediss" if settings.tls_enabled else "redis"
-        url = f"{scheme}://{settings.host}:{settings.port}"
+        url = f"{scheme}://{host}:{port or settings.port}"
 
         if settings.password and settings.password.get_secret_value():
             pw = settings.password.get_secret_value()
@@ -152,30 +366,165 @@ class RedisHandler:
         return url
     
 
+    @classmethod
+    async def circuit_breaker(cls) -> CircuitBreaker:
+        state = cls._registry.current()
+        if state.breaker is None:
+            state.breaker = CircuitBreaker.from_settings(await redis_settings())
+        return state.breaker
+
     @classmethod
     @asynccontextmanager
     async def session(cls, config: RedisSessionConfig = RedisSessionConfig()) -> AsyncIterator[Redis]:
-        client = await cls.client()
+        """
+        Shared client of the running loop, with circuit breaker, health check
+        and error mapping around the block.
+
+        With a deadline (config.timeout, config.deadline or the caller's
+        time_budget()) everything in the block is cancelled when it runs
+        out and RedisDeadlineExceeded is raised instead.
+        """
+        deadline = cls._session_deadline(config)
+        budget = None
+        scope: Any = _UNBOUNDED
+        if deadline is not None:
+            budget = deadline.remaining()
+            if not budget:
+                # Spent before reaching Redis: nothing to tell the breaker
+                raise RedisDeadlineExceeded(0.0, budget)
+            scope = _timeout(budget)
+
+        breaker = await cls.circuit_breaker() if config.circuit_breaker else None
+        if breaker is not None:
+            # Raises RedisCircuitBreakerOpen while open — no network, no timeouts
+            breaker.before_call()
+        started = time.perf_counter()
+
         try:
-            if config.health_check:
-                await asyncio.wait_for(client.ping(), timeout=5)
-            yield client
-        except RedisPyConnectionError as exc:
-            logger.exception(f"Detailed Redis connection failure – this is the real error\n{exc}")
-            if config.circuit_breaker:
-                raise RedisCircuitBreakerOpen(retry_after_seconds=30) from exc
-            raise RedisConnectionError("Redis connection lost") from exc
-        except RedisPyTimeoutError as exc:
-            if config.circuit_breaker:
-                raise RedisCircuitBreakerOpen(retry_after_seconds=15) from exc
-            raise RedisConnectionError("Redis operation timed out") from exc
-        except Exception as exc:
-            logger.error("Unexpected Redis error in session", exc_info=True)
-            raise RedisConnectionError("Redis operation failed") from exc
+            async with scope:
+                try:
+                    selecting: Awaitable[tuple[Redis, Optional[HealthMonitor]]] = cls._select(config.binary, config.read_only)
+                    if deadline is not None and config.binary not in cls._registry.current().clients:
+                        # The first connect is shared by every session; only this one gives up
+                        selecting = asyncio.shield(selecting)
+                    client, monitor = await selecting
+                except RedisConnectionError:
+                    if breaker is not None:
+                        breaker.on_failure()
+                    raise
+                except BaseException:
+                    if breaker is not None:
+                        breaker.on_ignored()
+                    raise
+
+                span = token = None
+                if getattr(client, "iok_tracing", False) and tracing_settings().redis_session_spans:
+                    span, token = start_session_span(client, config.prefix, config.read_only)
+
+                try:
+                    try:
+                        if config.health_check and monitor is not None and not monitor.healthy:
+                            # Cached verdict from the background monitor — no per-session PING
+                            raise RedisPyConnectionError(f"Redis marked unhealthy by health monitor: {monitor.last_error!r}")
+                        yield client
+                    except (RedisPoolExhausted, MaxConnectionsError) as exc:
+                        # Saturation is local backpressure, not a Redis failure: the
+                        # breaker and health monitor are left alone
+                        if breaker is not None:
+                            breaker.on_ignored()
+                        if isinstance(exc, RedisPoolExhausted):
+                            raise
+                        pool = getattr(client, "connection_pool", None)
+                        raise RedisPoolExhausted(max_connections=getattr(pool, "max_connections", None)) from exc
+                    except RedisDeadlineExceeded:
+                        # From a nested session; it already did the accounting
+                        if breaker is not None:
+                            breaker.on_ignored()
+                        raise
+                    except RedisPyConnectionError as exc:
+                        logger.exception(f"Detailed Redis connection failure – this is the real error\n{exc}")
+                        if monitor is not None:
+                            monitor.trigger()
+                        cls._fail(breaker, exc)
+                        raise RedisConnectionError("Redis connection lost") from exc
+                    except RedisPyTimeoutError as exc:
+                        if monitor is not None:
+                            monitor.trigger()
+                        cls._fail(breaker, exc)
+                        raise RedisConnectionError("Redis operation timed out") from exc
+                    except asyncio.TimeoutError:
+                        # The caller's own wait_for()/timeout() around its work
+                        if breaker is not None:
+                            breaker.on_ignored()
+                        raise
+                    except Exception as exc:
+                        if breaker is not None:
+                            breaker.on_ignored()
+                        logger.error("Unexpected Redis error in session", exc_info=True)
+                        raise RedisConnectionError("Redis operation failed") from exc
+                    except asyncio.CancelledError as exc:
+                        if _expired(scope) and _in_redis_call(exc):
+                            # Redis did not answer within the budget: a timeout like any other.
+                            # Budget spent on the caller's own work says nothing about Redis.
+                            if monitor is not None:
+                                monitor.trigger()
+                            if breaker is not None:
+                                breaker.on_failure()
+                        elif breaker is not None:
+                            breaker.on_ignored()
+                        raise
+                    except BaseException:
+                        if breaker is not None:
+                            breaker.on_ignored()
+                        raise
+                    else:
+                        if breaker is not None:
+                            breaker.on_success(time.perf_counter() - started)
+                except BaseException as exc:
+                    if span is not None:
+                        end_span(span, exc, token)
+                    raise
+                else:
+                    if span is not None:
+                        end_span(span, None, token)
+        except asyncio.TimeoutError as exc:
+            if not _expired(scope):
+                raise
+            raise RedisDeadlineExceeded(time.perf_counter() - started, budget) from exc
+
+    @staticmethod
+    def _session_deadline(config: RedisSessionConfig) -> Optional[Deadline]:
+        deadline = current_deadline()
+        if config.deadline is not None:
+            deadline = config.deadline.earliest(deadline)
+        if config.timeout is not None:
+            deadline = Deadline.after(config.timeout).earliest(deadline)
+        return deadline
+
+    @staticmethod
+    def _fail(breaker: Optional[CircuitBreaker], exc: BaseException) -> None:
+        if breaker is None:
+            return
+        breaker.on_failure()
+        if breaker.state == "open":
+            raise RedisCircuitBreakerOpen(retry_after_seconds=breaker.retry_after_seconds) from exc
 
     @classmethod
     async def close(cls) -> None:
-        if cls._client:
-            await cls._client.aclose()
-            cls._client = None
-            logger.info("iok_core RedisHandler closed")
\ No newline at end of file
+        """Close the clients of the running event loop."""
+        state = cls._registry.peek()
+        if state is None:
+            return
+        cls._registry.discard(state)
+        for hub in state.hubs.values():
+            await hub.close()
+        for monitor in state.monitors.values():
+            await monitor.stop()
+        for client in state.clients.values():
+            await client.aclose()
+        for replicas in state.replicas.values():
+            for replica, replica_monitor in replicas:
+                await replica_monitor.stop()
+                await replica.aclose()
+        if state.clients:
+            logger.info("iok_core RedisHandler closed")
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Optional
+
+from redis.asyncio import Redis
+
+from .settings import RedisSettings
+
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    Background liveness/latency tracker for one client.
+
+    A task PINGs every `interval` seconds (every `unhealthy_interval` while
+    unhealthy) and keeps an EWMA of the round trip. Sessions read `healthy`
+    instead of pinging themselves; trigger() asks for an immediate probe,
+    e.g. after a session hit a connection error.
+
+    With `check_replication` (a replica monitor given its `primary`) each
+    probe also estimates replication lag from the two servers' replication
+    offsets; see _lag().
+    """
+
+    def __init__(
+        self,
+        client: Redis,
+        *,
+        interval: float = 5.0,
+        timeout: float = 2.0,
+        unhealthy_interval: float = 0.5,
+        failure_threshold: int = 1,
+        alpha: float = 0.2,
+        check_replication: bool = False,
+        primary: Optional[Redis] = None,
+    ) -> None:
+        if check_replication and primary is None:
+            raise ValueError("check_replication needs the primary client")
+        self.client = client
+        self.primary = primary
+        self.interval = interval
+        self.timeout = timeout
+        self.unhealthy_interval = unhealthy_interval
+        self.failure_threshold = failure_threshold
+        self.alpha = alpha
+        self.check_replication = check_replication
+
+        self.healthy = True
+        self.latency_ewma: Optional[float] = None
+        self.consecutive_failures = 0
+        self.last_error: Optional[BaseException] = None
+        self.last_check: Optional[float] = None
+        # Upper bound on how far the replica's data is behind; None if unknown or link down
+        self.replication_lag: Optional[float] = None
+        # (monotonic time, primary master_repl_offset) of recent probes
+        self._primary_offsets: deque[tuple[float, int]] = deque(maxlen=32)
+
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        client: Redis,
+        settings: RedisSettings,
+        *,
+        check_replication: bool = False,
+        primary: Optional[Redis] = None,
+    ) -> HealthMonitor:
+        return cls(
+            client,
+            interval=settings.health_check_interval_seconds,
+            timeout=settings.health_check_timeout_seconds,
+            failure_threshold=settings.health_failure_threshold,
+            check_replication=check_replication,
+            primary=primary,
+        )
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def trigger(self) -> None:
+        """Request a probe now rather than at the next interval."""
+        self._wake.set()
+
+    async def probe(self) -> bool:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.client.ping(), timeout=self.timeout)
+            elapsed = time.perf_counter() - started
+            if self.check_replication:
+                self.replication_lag = await self._replication_lag()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self.last_error = exc
+            self.consecutive_failures += 1
+            if self.healthy and self.consecutive_failures >= self.failure_threshold:
+                self.healthy = False
+                logger.warning("Redis health check failing: %r", exc)
+        else:
+            if self.latency_ewma is None:
+                self.latency_ewma = elapsed
+            else:
+                self.latency_ewma += self.alpha * (elapsed - self.latency_ewma)
+            self.consecutive_failures = 0
+            if not self.healthy:
+                self.healthy = True
+                logger.info("Redis health check recovered (%.1fms)", elapsed * 1000)
+        self.last_check = time.monotonic()
+        return self.healthy
+
+    async def _replication_lag(self) -> Optional[float]:
+        assert self.primary is not None
+        try:
+            primary_info = await asyncio.wait_for(self.primary.info("replication"), timeout=self.timeout)
+        except Exception:
+            # The primary being down says nothing about this replica's health
+            logger.debug("Replication offset probe of the primary failed", exc_info=True)
+            return None
+        sampled_at = time.monotonic()
+        info = await asyncio.wait_for(self.client.info("replication"), timeout=self.timeout)
+        if "master_repl_offset" in primary_info:
+            self._primary_offsets.append((sampled_at, int(primary_info["master_repl_offset"])))
+        return self._lag(info, self._primary_offsets, time.monotonic())
+
+    @staticmethod
+    def _lag(info: dict[str, Any], primary_offsets: deque[tuple[float, int]], now: float) -> Optional[float]:
+        """
+        Seconds the replica may be behind, from its `slave_repl_offset`.
+
+        A replica that has reached the primary's offset of a sample taken at
+        time t holds everything written before t, so its lag is at most
+        `now - t`; the newest such sample gives the tightest bound. The
+        primary is sampled just before the replica, so an in-sync replica
+        reports about one round trip. (master_last_io_seconds_ago is not
+        lag: an idle, fully synced replica reports up to the ping period.)
+        """
+        if info.get("role") != "slave":
+            return 0.0  # promoted to primary: nothing to lag behind
+        if info.get("master_link_status") != "up" or info.get("slave_repl_offset") is None:
+            return None
+        offset = int(info["slave_repl_offset"])
+        for sampled_at, primary_offset in reversed(primary_offsets):
+            if offset >= primary_offset:
+                return now - sampled_at
+        return None  # behind every sample we still have
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(),
+                    timeout=self.interval if self.healthy else self.unhealthy_interval,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.probe()
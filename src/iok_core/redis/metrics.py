@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import logging
+import time
+import weakref
+from bisect import bisect_left
+from typing import Any, Iterable, Optional
+
+from opentelemetry import metrics as otel_metrics
+from opentelemetry.metrics import CallbackOptions, Observation
+from redis.asyncio import ConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import MaxConnectionsError
+
+from .exceptions import RedisPoolExhausted
+from ..tracing.redis import client_attributes, end_span, start_command_span, start_pipeline_span
+
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds; roughly log-spaced from 100µs to 5s
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram; observe() only bumps preallocated counters."""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "attributes")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS, attributes: Optional[dict[str, Any]] = None) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.attributes = attributes or {}
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation (inf past the last bound)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class RedisMetrics:
+    """
+    Process-wide pool and command metrics for RedisHandler.
+
+    The hot path only does plain integer/float updates on preallocated state:
+    no locks, no per-call objects (a histogram is allocated the first time a
+    command name is seen). Updates happen on event loop threads; with several
+    loops in several threads a concurrent increment can very rarely be lost,
+    which is an accepted trade for leaving this on in production.
+
+    Pool gauges are read from the live pools at collection time. bind_meter()
+    exports everything through OpenTelemetry; without an SDK installed the
+    API is a no-op.
+    """
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.reconnects = 0
+        self.connect_errors = 0
+        self.checkouts = 0
+        self.pool_exhausted = 0  # checkout with every connection in use (MaxConnectionsError / RedisPoolExhausted)
+        self.connect_time = LatencyHistogram()
+        self.checkout_wait = LatencyHistogram()
+        self.commands: dict[str, LatencyHistogram] = {}
+        self.errors: dict[str, int] = {}  # exception class name -> count
+
+        self._pools: weakref.WeakSet[InstrumentedConnectionPool] = weakref.WeakSet()
+        self._duration: Any = None  # OTel histogram once bound
+
+    # ─────────────────────── recording ───────────────────────
+
+    def observe_command(self, name: str, seconds: float) -> None:
+        hist = self.commands.get(name)
+        if hist is None:
+            hist = self.commands[name] = LatencyHistogram(attributes={"db.operation.name": name})
+        hist.observe(seconds)
+        if self._duration is not None:
+            self._duration.record(seconds, hist.attributes)
+
+    def record_error(self, exc: BaseException) -> None:
+        name = type(exc).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def track_pool(self, pool: InstrumentedConnectionPool) -> None:
+        self._pools.add(pool)
+
+    def reset(self) -> None:
+        pools = self._pools
+        duration = self._duration
+        self.__init__()  # type: ignore[misc]
+        self._pools = pools
+        self._duration = duration
+
+    # ─────────────────────── reading ───────────────────────
+
+    def pool_usage(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "pool": pool.name,
+                "in_use": len(pool._in_use_connections),
+                "idle": len(pool._available_connections),
+                "max": pool.max_connections,
+            }
+            for pool in list(self._pools)
+        ]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "connects": self.connects,
+            "reconnects": self.reconnects,
+            "connect_errors": self.connect_errors,
+            "checkouts": self.checkouts,
+            "pool_exhausted": self.pool_exhausted,
+            "checkout_wait_p99": self.checkout_wait.quantile(0.99),
+            "connect_time_p99": self.connect_time.quantile(0.99),
+            "pools": self.pool_usage(),
+            "commands": {
+                name: {"count": h.count, "sum": h.sum, "p50": h.quantile(0.5), "p99": h.quantile(0.99)}
+                for name, h in list(self.commands.items())
+            },
+            "errors": dict(self.errors),
+        }
+
+    # ─────────────────────── OpenTelemetry ───────────────────────
+
+    def bind_meter(self, meter: Optional[otel_metrics.Meter] = None) -> None:
+        """Register OTel instruments backed by these counters. Idempotent."""
+        if self._duration is not None:
+            return
+        meter = meter or otel_metrics.get_meter("iok_core.redis")
+
+        def _counter(value: str) -> Any:
+            return lambda options: [Observation(getattr(self, value))]
+
+        meter.create_observable_counter("redis.client.connects", [_counter("connects")], description="New connections opened")
+        meter.create_observable_counter("redis.client.reconnects", [_counter("reconnects")], description="Connections re-opened after a drop")
+        meter.create_observable_counter("redis.client.connect_errors", [_counter("connect_errors")])
+        meter.create_observable_counter("redis.client.pool.checkouts", [_counter("checkouts")])
+        meter.create_observable_counter("redis.client.pool.exhausted", [_counter("pool_exhausted")])
+        meter.create_observable_counter(
+            "redis.client.pool.checkout_wait",
+            [lambda options: [Observation(self.checkout_wait.sum)]],
+            unit="s",
+            description="Total time spent in ConnectionPool.get_connection",
+        )
+        meter.create_observable_counter("redis.client.errors", [self._observe_errors])
+        meter.create_observable_gauge("redis.client.pool.in_use", [self._observe_pool("in_use")])
+        meter.create_observable_gauge("redis.client.pool.idle", [self._observe_pool("idle")])
+        meter.create_observable_gauge("redis.client.pool.max", [self._observe_pool("max")])
+        self._duration = meter.create_histogram(
+            "redis.client.command.duration",
+            unit="s",
+            description="Round trip per command (pipelines as PIPELINE)",
+        )
+
+    def _observe_errors(self, options: CallbackOptions) -> Iterable[Observation]:
+        return [Observation(n, {"error.type": name}) for name, n in list(self.errors.items())]
+
+    def _observe_pool(self, field: str) -> Any:
+        def callback(options: CallbackOptions) -> Iterable[Observation]:
+            return [Observation(usage[field], {"pool.name": usage["pool"]}) for usage in self.pool_usage()]
+        return callback
+
+
+redis_metrics = RedisMetrics()
+
+
+# ─────────────────────── instrumented redis-py classes ───────────────────────
+
+
+class _ConnectionMetricsMixin:
+    _iok_connected_before = False
+
+    async def _connect(self) -> None:
+        started = time.perf_counter()
+        try:
+            await super()._connect()  # type: ignore[misc]
+        except BaseException:
+            redis_metrics.connect_errors += 1
+            raise
+        redis_metrics.connect_time.observe(time.perf_counter() - started)
+        if self._iok_connected_before:
+            redis_metrics.reconnects += 1
+        else:
+            redis_metrics.connects += 1
+            self._iok_connected_before = True
+
+
+_instrumented_classes: dict[type, type] = {}
+
+
+def instrumented_connection_class(connection_class: type) -> type:
+    if not isinstance(connection_class, type) or issubclass(connection_class, _ConnectionMetricsMixin):
+        return connection_class
+    cls = _instrumented_classes.get(connection_class)
+    if cls is None:
+        cls = _instrumented_classes[connection_class] = type(
+            f"Instrumented{connection_class.__name__}", (_ConnectionMetricsMixin, connection_class), {}
+        )
+    return cls
+
+
+class InstrumentedConnectionPool(ConnectionPool):
+    """ConnectionPool that reports checkouts, connects and usage to redis_metrics."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.connection_class = instrumented_connection_class(self.connection_class)
+        kw = self.connection_kwargs
+        self.name = kw.get("path") or f"{kw.get('host', 'localhost')}:{kw.get('port', 6379)}"
+        if not kw.get("decode_responses"):
+            self.name += "/binary"
+        redis_metrics.track_pool(self)
+
+    async def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)  # type: ignore[no-untyped-call]
+        except (MaxConnectionsError, RedisPoolExhausted):
+            redis_metrics.pool_exhausted += 1
+            raise
+        redis_metrics.checkout_wait.observe(time.perf_counter() - started)
+        redis_metrics.checkouts += 1
+        return connection
+
+
+class InstrumentedPipeline(Pipeline):
+    iok_metrics = True
+    iok_tracing = False
+    # The parent client's span attributes, so each pipeline span skips recomputing them
+    _iok_span_attributes: Optional[dict[str, Any]] = None
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        span = start_pipeline_span(self, self.command_stack, self.is_transaction) if self.iok_tracing else None
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error=raise_on_error)
+        except Exception as exc:
+            if self.iok_metrics:
+                redis_metrics.record_error(exc)
+            if span is not None:
+                end_span(span, exc)
+                span = None
+            raise
+        finally:
+            if self.iok_metrics:
+                redis_metrics.observe_command("PIPELINE", time.perf_counter() - started)
+            if span is not None:
+                end_span(span)
+
+
+class InstrumentedRedis(Redis):
+    """
+    Redis client that times every command and counts errors by class
+    (`iok_metrics`), and/or wraps each command and pipeline in a CLIENT span
+    (`iok_tracing`). RedisHandler sets both flags per client from settings.
+    """
+
+    iok_metrics = True
+    iok_tracing = False
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        span = start_command_span(self, args) if self.iok_tracing else None
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)  # type: ignore[no-untyped-call]
+        except Exception as exc:
+            if self.iok_metrics:
+                redis_metrics.record_error(exc)
+            if span is not None:
+                end_span(span, exc)
+                span = None
+            raise
+        finally:
+            if self.iok_metrics:
+                name = args[0]
+                redis_metrics.observe_command(name if isinstance(name, str) else str(name), time.perf_counter() - started)
+            if span is not None:
+                end_span(span)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Any = None) -> InstrumentedPipeline:
+        pipe = InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+        pipe.iok_metrics = self.iok_metrics
+        pipe.iok_tracing = self.iok_tracing
+        pipe._iok_span_attributes = client_attributes(self) if self.iok_tracing else None
+        return pipe
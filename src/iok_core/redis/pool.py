@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from redis.asyncio import ConnectionPool
+from redis.asyncio.connection import AbstractConnection
+from redis.event import AsyncAfterConnectionReleasedEvent
+
+from .exceptions import RedisPoolExhausted
+from .metrics import InstrumentedConnectionPool
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    waited: int = 0  # checkouts that queued behind a busy pool
+    wait_seconds: float = 0.0  # total time spent queued
+    timeouts: int = 0  # RedisPoolExhausted raised
+    opened: int = 0  # connections created on demand
+    reaped: int = 0  # idle connections closed
+    peak_waiters: int = 0
+
+    @property
+    def mean_wait(self) -> float:
+        return self.wait_seconds / self.waited if self.waited else 0.0
+
+
+class AdaptiveConnectionPool(ConnectionPool):
+    """
+    ConnectionPool that queues callers instead of failing when saturated.
+
+    - Fair waits: when all `max_connections` are checked out, get_connection()
+      joins a FIFO queue and a released connection is handed straight to the
+      longest waiter, so a steady stream of new callers cannot starve it.
+      After `checkout_timeout` seconds the waiter gives up with
+      RedisPoolExhausted (the time waited and the queue length attached),
+      which callers can treat as backpressure rather than a Redis outage.
+    - Grows on demand: a connection is only opened when no idle one is left.
+    - Shrinks when idle: every `reap_interval` seconds connections idle for
+      longer than `idle_seconds` are closed, oldest first, down to
+      `min_connections`.
+
+    Idle connections are reused most-recently-released first, so a quiet
+    period leaves the surplus at the cold end of the list for the reaper.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        min_connections: int = 0,
+        checkout_timeout: float = 1.0,
+        idle_seconds: float = 60.0,
+        reap_interval: Optional[float] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        if checkout_timeout <= 0:
+            raise ValueError("checkout_timeout must be > 0")
+        self.min_connections = min(min_connections, self.max_connections)
+        self.checkout_timeout = checkout_timeout
+        self.idle_seconds = idle_seconds
+        self.reap_interval = reap_interval if reap_interval is not None else max(idle_seconds / 2, 0.01)
+        self.stats = PoolStats()
+        self._waiters: deque[asyncio.Future[AbstractConnection]] = deque()
+        self._idle_since: dict[AbstractConnection, float] = {}
+        self._reaper: Optional[asyncio.Task[None]] = None
+
+    def reset(self) -> None:
+        super().reset()  # type: ignore[no-untyped-call]
+        self._idle_since = {}
+
+    @property
+    def size(self) -> int:
+        return len(self._available_connections) + len(self._in_use_connections)
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiters if not w.done())
+
+    def can_get_connection(self) -> bool:
+        return not self.waiting and super().can_get_connection()
+
+    # ─────────────────────── checkout ───────────────────────
+
+    async def get_connection(self, *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> AbstractConnection:
+        """Connected connection, waiting up to `timeout` (default checkout_timeout) for one to free up."""
+        self._ensure_reaper()
+        connection = self._take()
+        if connection is None:
+            connection = await self._wait(self.checkout_timeout if timeout is None else timeout)
+        self.stats.checkouts += 1
+        try:
+            await self.ensure_connection(connection)
+        except BaseException:
+            await self.release(connection)
+            raise
+        return connection
+
+    def _take(self) -> Optional[AbstractConnection]:
+        if self.waiting:
+            return None  # no barging past earlier waiters
+        if self._available_connections:
+            connection = self._available_connections.pop()
+            self._idle_since.pop(connection, None)
+        elif self.size < self.max_connections:
+            connection = self.make_connection()  # type: ignore[no-untyped-call]
+            self.stats.opened += 1
+        else:
+            return None
+        self._in_use_connections.add(connection)
+        return connection
+
+    async def _wait(self, timeout: float) -> AbstractConnection:
+        waiter: asyncio.Future[AbstractConnection] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats.waited += 1
+        self.stats.peak_waiters = max(self.stats.peak_waiters, len(self._waiters))
+        started = time.monotonic()
+        try:
+            await asyncio.wait((waiter,), timeout=max(timeout, 0.0))
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._return(waiter.result())  # handed over just as we were cancelled
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self.stats.wait_seconds += waited
+            if not waiter.done():
+                waiter.cancel()
+                self._waiters.remove(waiter)
+
+        if waiter.cancelled():
+            self.stats.timeouts += 1
+            raise RedisPoolExhausted(
+                waited_seconds=waited,
+                waiters=self.waiting,
+                max_connections=self.max_connections,
+            )
+        return waiter.result()
+
+    # ─────────────────────── release ───────────────────────
+
+    async def release(self, connection: AbstractConnection) -> None:
+        if connection.should_reconnect():  # type: ignore[no-untyped-call]
+            await connection.disconnect()
+        self._return(connection)
+        if self._event_dispatcher is not None:
+            await self._event_dispatcher.dispatch_async(
+                AsyncAfterConnectionReleasedEvent(connection)  # type: ignore[no-untyped-call]
+            )
+
+    def _return(self, connection: AbstractConnection) -> None:
+        # Raises KeyError for a connection that is not checked out, like ConnectionPool.release
+        self._in_use_connections.remove(connection)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_use_connections.add(connection)
+                waiter.set_result(connection)
+                return
+        self._available_connections.append(connection)
+        self._idle_since[connection] = time.monotonic()
+
+    # ─────────────────────── idle reaping ───────────────────────
+
+    def _ensure_reaper(self) -> None:
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(_reap_loop(weakref.ref(self), self.reap_interval))
+
+    async def reap(self) -> int:
+        """Close connections idle for longer than idle_seconds, keeping min_connections; returns how many."""
+        cutoff = time.monotonic() - self.idle_seconds
+        victims = []
+        while (
+            self._available_connections
+            and self.size > self.min_connections
+            and self._idle_since.get(self._available_connections[0], cutoff) <= cutoff
+        ):
+            connection = self._available_connections.pop(0)
+            self._idle_since.pop(connection, None)
+            victims.append(connection)
+        if victims:
+            await asyncio.gather(*(c.disconnect() for c in victims), return_exceptions=True)
+            self.stats.reaped += len(victims)
+            logger.debug("Reaped %d idle Redis connections (%d left)", len(victims), self.size)
+        return len(victims)
+
+    async def disconnect(self, inuse_connections: bool = True) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        await super().disconnect(inuse_connections)
+
+
+async def _reap_loop(ref: weakref.ref[AdaptiveConnectionPool], interval: float) -> None:
+    # Holds the pool only weakly between rounds, so a dropped pool is not kept alive
+    while True:
+        await asyncio.sleep(interval)
+        pool = ref()
+        if pool is None:
+            return
+        try:
+            await pool.reap()
+        except Exception:
+            logger.warning("Idle connection reaping failed", exc_info=True)
+        del pool
+
+
+class InstrumentedAdaptivePool(InstrumentedConnectionPool, AdaptiveConnectionPool):
+    """AdaptiveConnectionPool reporting to redis_metrics (queue time counts as checkout wait)."""
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+from .handler import RedisHandler, RedisSessionConfig
+from .scripts import Script, ScriptRegistry, script_registry
+
+
+# TTL arguments are milliseconds; 0 means no expiry.
+COMPARE_AND_SET = script_registry.register("iok:compare_and_set", """
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return 0
+end
+if tonumber(ARGV[3]) > 0 then
+    redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+else
+    redis.call('SET', KEYS[1], ARGV[2])
+end
+return 1
+""")
+
+COMPARE_AND_DELETE = script_registry.register("iok:compare_and_delete", """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+""")
+
+# ARGV: max_length, ttl_ms, values...; newest first, oldest trimmed
+PUSH_CAPPED = script_registry.register("iok:push_capped", """
+local max_length = tonumber(ARGV[1])
+local length = redis.call('LPUSH', KEYS[1], unpack(ARGV, 3))
+if length > max_length then
+    redis.call('LTRIM', KEYS[1], 0, max_length - 1)
+    length = max_length
+end
+if tonumber(ARGV[2]) > 0 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return length
+""")
+
+GET_AND_TOUCH = script_registry.register("iok:get_and_touch", """
+local value = redis.call('GET', KEYS[1])
+if value then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+return value
+""")
+
+# TTL is set only while the counter has none, so a fixed window does not slide
+INCREMENT_WITH_TTL = script_registry.register("iok:increment_with_ttl", """
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if tonumber(ARGV[2]) > 0 and redis.call('PTTL', KEYS[1]) == -1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return value
+""")
+
+
+def _ms(seconds: Optional[float]) -> int:
+    return max(1, round(seconds * 1000)) if seconds else 0
+
+
+class RedisPrimitives:
+    """
+    Atomic read-modify-write helpers, one EVALSHA round trip each.
+
+    Keys are scoped by `config.prefix`; a TTL of None falls back to
+    `config.default_ttl`. To batch calls, queue the module-level scripts on
+    a pipeline with `script_registry.queue(pipe, COMPARE_AND_SET, [primitives.key(k)], ...)`
+    and run it with `script_registry.execute(client, pipe)`.
+    """
+
+    def __init__(self, config: Optional[RedisSessionConfig] = None, registry: ScriptRegistry = script_registry) -> None:
+        self.config = config or RedisSessionConfig()
+        self.registry = registry
+
+    def key(self, key: str) -> str:
+        return f"{self.config.prefix}{key}"
+
+    def _ttl(self, ttl: Optional[float]) -> int:
+        return _ms(ttl if ttl is not None else self.config.default_ttl)
+
+    async def _call(self, script: Script, key: str, args: Sequence[Any]) -> Any:
+        async with RedisHandler.session(self.config) as client:
+            return await self.registry.call(client, script, [self.key(key)], args)
+
+    async def compare_and_set(self, key: str, expected: Any, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set `key` to `value` only if it currently holds `expected` (None: only if it does not exist)."""
+        if expected is None:
+            async with RedisHandler.session(self.config) as client:
+                return bool(await client.set(self.key(key), value, nx=True, px=self._ttl(ttl) or None))
+        return bool(await self._call(COMPARE_AND_SET, key, (expected, value, self._ttl(ttl))))
+
+    async def compare_and_delete(self, key: str, expected: Any) -> bool:
+        """Delete `key` only if it currently holds `expected` (safe lock release)."""
+        return bool(await self._call(COMPARE_AND_DELETE, key, (expected,)))
+
+    async def push_capped(self, key: str, *values: Any, max_length: int, ttl: Optional[float] = None) -> int:
+        """LPUSH `values` and trim the list to the newest `max_length`; returns the new length."""
+        if max_length < 1:
+            raise ValueError("max_length must be >= 1")
+        if not values:
+            raise ValueError("push_capped needs at least one value")
+        return int(await self._call(PUSH_CAPPED, key, (max_length, self._ttl(ttl), *values)))
+
+    async def get_and_touch(self, key: str, ttl: Optional[float] = None) -> Any:
+        """GET `key` and, if it exists, reset its TTL (sliding expiry)."""
+        ttl_ms = self._ttl(ttl)
+        if not ttl_ms:
+            raise ValueError("get_and_touch needs a ttl (or config.default_ttl)")
+        return await self._call(GET_AND_TOUCH, key, (ttl_ms,))
+
+    async def increment(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """INCRBY `amount`; the TTL is applied only if the counter has none yet."""
+        return int(await self._call(INCREMENT_WITH_TTL, key, (amount, self._ttl(ttl))))
@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import zlib
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Literal, Optional
+
+from redis.asyncio.client import PubSub
+
+from .exceptions import RedisError
+from .handler import RedisHandler
+from .settings import redis_settings
+
+
+logger = logging.getLogger(__name__)
+
+SlowConsumerPolicy = Literal["drop_oldest", "drop_newest", "close"]
+
+
+class SlowConsumerError(RedisError):
+    """Raised to a subscriber whose queue overflowed under the "close" policy"""
+
+
+@dataclass(frozen=True)
+class PubSubMessage:
+    channel: str
+    data: Any
+    pattern: Optional[str] = None  # set for PSUBSCRIBE deliveries
+
+
+@dataclass
+class HubStats:
+    messages: int = 0  # received from Redis
+    delivered: int = 0  # put on subscriber queues (a message counts once per subscriber)
+    dropped: int = 0
+    slow_closed: int = 0
+    reconnects: int = 0
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class Subscription:
+    """
+    One local subscriber: a bounded queue fed by the hub.
+
+    Iterate it (`async for message in sub`) or call get(); close() (or leaving
+    `async with`) drops the hub's reference to the channel.
+    """
+
+    def __init__(self, hub: PubSubHub, name: str, pattern: bool, maxsize: int, policy: SlowConsumerPolicy) -> None:
+        self.hub = hub
+        self.name = name
+        self.pattern = pattern
+        self.policy = policy
+        self.dropped = 0
+        self.closed = False
+        self._queue: asyncio.Queue[Optional[PubSubMessage]] = asyncio.Queue(maxsize=maxsize)
+        self._error: Optional[BaseException] = None
+
+    def _offer(self, message: PubSubMessage) -> None:
+        if self.closed:
+            return
+        if self._queue.full():
+            self.dropped += 1
+            self.hub.stats.dropped += 1
+            if self.policy == "drop_newest":
+                return
+            if self.policy == "close":
+                self.hub.stats.slow_closed += 1
+                self._fail(SlowConsumerError(f"Subscriber of {self.name!r} fell {self._queue.maxsize} messages behind"))
+                self.hub._detach(self)
+                return
+            self._queue.get_nowait()  # drop_oldest
+        self._queue.put_nowait(message)
+        self.hub.stats.delivered += 1
+
+    def _fail(self, error: BaseException) -> None:
+        self.closed = True
+        self._error = error
+        # Buffered messages are discarded: a closed subscriber has to resync anyway
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self) -> PubSubMessage:
+        if self.closed and self._queue.empty():
+            raise self._error or StopAsyncIteration
+        message = await self._queue.get()
+        if message is None:
+            raise self._error or StopAsyncIteration
+        return message
+
+    def __aiter__(self) -> AsyncIterator[PubSubMessage]:
+        return self
+
+    async def __anext__(self) -> PubSubMessage:
+        return await self.get()
+
+    async def close(self) -> None:
+        if not self.closed:
+            self._fail(StopAsyncIteration())
+            await self.hub._release(self)
+
+    async def __aenter__(self) -> Subscription:
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+
+class _Shard:
+    """One PubSub connection and the local subscribers of the channels hashed to it."""
+
+    def __init__(self, hub: PubSubHub, index: int) -> None:
+        self.hub = hub
+        self.index = index
+        self.channels: dict[str, set[Subscription]] = {}
+        self.patterns: dict[str, set[Subscription]] = {}
+        self.pubsub: Optional[PubSub] = None
+        self.reader: Optional[asyncio.Task[None]] = None
+        self.unsubscribes: set[asyncio.Task[None]] = set()
+        self.lock = asyncio.Lock()
+        self.connected = asyncio.Event()
+
+    def _table(self, pattern: bool) -> dict[str, set[Subscription]]:
+        return self.patterns if pattern else self.channels
+
+    async def add(self, sub: Subscription) -> None:
+        table = self._table(sub.pattern)
+        async with self.lock:
+            first = sub.name not in table
+            table.setdefault(sub.name, set()).add(sub)
+            if self.reader is None:
+                self.reader = asyncio.create_task(self._run())
+            elif first and self.pubsub is not None and self.connected.is_set():
+                # Not connected yet: _connect() subscribes everything in the tables
+                try:
+                    await self._send(sub.pattern, subscribe=True, names=[sub.name])
+                except BaseException:
+                    del table[sub.name]  # the caller never gets this subscription
+                    raise
+
+    async def remove(self, sub: Subscription) -> None:
+        table = self._table(sub.pattern)
+        async with self.lock:
+            subs = table.get(sub.name)
+            if subs is None:
+                return
+            subs.discard(sub)
+            if subs:
+                return
+            del table[sub.name]
+            await self._unsubscribe(sub.pattern, sub.name)
+
+    def detach(self, sub: Subscription) -> None:
+        """Synchronous removal for the reader (slow-consumer close); a task sends the UNSUBSCRIBE."""
+        table = self._table(sub.pattern)
+        subs = table.get(sub.name)
+        if subs is None:
+            return
+        subs.discard(sub)
+        if not subs:
+            del table[sub.name]
+            task = asyncio.create_task(self._unsubscribe_detached(sub.pattern, sub.name))
+            self.unsubscribes.add(task)
+            task.add_done_callback(self.unsubscribes.discard)
+
+    async def _unsubscribe_detached(self, pattern: bool, name: str) -> None:
+        async with self.lock:
+            if name not in self._table(pattern):  # not resubscribed in the meantime
+                await self._unsubscribe(pattern, name)
+
+    async def _unsubscribe(self, pattern: bool, name: str) -> None:
+        if self.pubsub is not None and self.connected.is_set():
+            try:
+                await self._send(pattern, subscribe=False, names=[name])
+            except Exception:
+                logger.debug("UNSUBSCRIBE %s failed; the reconnect will drop it", name, exc_info=True)
+
+    async def _send(self, pattern: bool, *, subscribe: bool, names: list[str]) -> None:
+        assert self.pubsub is not None
+        if pattern:
+            await (self.pubsub.psubscribe(*names) if subscribe else self.pubsub.punsubscribe(*names))
+        else:
+            await (self.pubsub.subscribe(*names) if subscribe else self.pubsub.unsubscribe(*names))
+
+    async def _connect(self) -> None:
+        client = await RedisHandler.client(binary=self.hub.binary)
+        self.pubsub = client.pubsub()
+        async with self.lock:
+            if self.channels:
+                await self.pubsub.subscribe(*self.channels)
+            if self.patterns:
+                await self.pubsub.psubscribe(*self.patterns)
+            self.connected.set()
+
+    async def _teardown(self) -> None:
+        self.connected.clear()
+        if self.pubsub is not None:
+            pubsub, self.pubsub = self.pubsub, None
+            try:
+                await pubsub.aclose()  # type: ignore[no-untyped-call]
+            except Exception:
+                logger.debug("Error closing pubsub shard %d", self.index, exc_info=True)
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        self.hub.stats.messages += 1
+        channel = _text(message["channel"])
+        if message["type"] == "pmessage":
+            pattern = _text(message["pattern"])
+            targets = self.patterns.get(pattern, ())
+            delivery = PubSubMessage(channel, message["data"], pattern)
+        else:
+            targets = self.channels.get(channel, ())
+            delivery = PubSubMessage(channel, message["data"])
+        for sub in list(targets):
+            sub._offer(delivery)
+
+    async def _run(self) -> None:
+        backoff = 0.1
+        while not self.hub.closed:
+            failed = False
+            try:
+                await self._connect()
+                backoff = 0.1
+                while not self.hub.closed:
+                    if not (self.channels or self.patterns):
+                        # Keep the connection; the next subscribe reuses it
+                        await asyncio.sleep(0.05)
+                        continue
+                    assert self.pubsub is not None
+                    message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is not None and message["type"] in ("message", "pmessage"):
+                        self._dispatch(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                failed = True
+                logger.warning("Pub/sub shard %d lost its connection — resubscribing", self.index, exc_info=True)
+            finally:
+                await self._teardown()
+            if failed:
+                self.hub.stats.reconnects += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
+
+
+class PubSubHub:
+    """
+    In-process pub/sub multiplexer: one subscribe connection per shard, shared
+    by any number of local subscribers.
+
+    Channels are hashed onto `shards` PubSub connections (default
+    IOK_REDIS_PUBSUB_SHARDS). A channel is SUBSCRIBEd when its first local
+    subscriber arrives and UNSUBSCRIBEd when the last one leaves. Each
+    subscriber gets a bounded queue; when it is full the slow-consumer policy
+    either drops the oldest message, drops the new one, or closes that
+    subscription with SlowConsumerError — other subscribers are never held up.
+
+    A shard whose connection fails reconnects with backoff and resubscribes
+    every channel still referenced. Messages published while it was down are
+    lost (Redis pub/sub is fire-and-forget); `stats.reconnects` counts gaps.
+
+    shared() returns the hub of the running event loop, which
+    RedisHandler.close() closes.
+    """
+
+    def __init__(
+        self,
+        *,
+        binary: bool = False,
+        shards: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        policy: Optional[SlowConsumerPolicy] = None,
+    ) -> None:
+        self.binary = binary
+        self._shards_setting = shards
+        self._queue_size_setting = queue_size
+        self._policy_setting = policy
+        self.stats = HubStats()
+        self.closed = False
+        self._shards: list[_Shard] = []
+
+    @classmethod
+    def shared(cls, *, binary: bool = False) -> PubSubHub:
+        state = RedisHandler._registry.current()
+        hub = state.hubs.get(binary)
+        if hub is None or hub.closed:
+            hub = state.hubs[binary] = cls(binary=binary)
+        return hub
+
+    async def _settings(self) -> None:
+        if self._shards:
+            return
+        settings = await redis_settings()
+        count = self._shards_setting or settings.pubsub_shards
+        self.queue_size = self._queue_size_setting or settings.pubsub_queue_size
+        self.policy: SlowConsumerPolicy = self._policy_setting or settings.pubsub_slow_consumer_policy
+        self._shards = [_Shard(self, i) for i in range(count)]
+
+    def _shard(self, name: str) -> _Shard:
+        return self._shards[zlib.crc32(name.encode()) % len(self._shards)]
+
+    async def subscribe(
+        self, channel: str, *, maxsize: Optional[int] = None, policy: Optional[SlowConsumerPolicy] = None
+    ) -> Subscription:
+        return await self._add(channel, False, maxsize, policy)
+
+    async def psubscribe(
+        self, pattern: str, *, maxsize: Optional[int] = None, policy: Optional[SlowConsumerPolicy] = None
+    ) -> Subscription:
+        return await self._add(pattern, True, maxsize, policy)
+
+    async def wait_subscribed(self, timeout: float = 5.0) -> None:
+        """Wait until every active shard has its connection and subscriptions in place."""
+        active = [s.connected.wait() for s in self._shards if s.reader is not None]
+        await asyncio.wait_for(asyncio.gather(*active), timeout)
+
+    async def _add(self, name: str, pattern: bool, maxsize: Optional[int], policy: Optional[SlowConsumerPolicy]) -> Subscription:
+        if self.closed:
+            raise RedisError("PubSubHub is closed")
+        await self._settings()
+        sub = Subscription(self, name, pattern, maxsize or self.queue_size, policy or self.policy)
+        await self._shard(name).add(sub)
+        return sub
+
+    async def _release(self, sub: Subscription) -> None:
+        if self._shards:
+            await self._shard(sub.name).remove(sub)
+
+    def _detach(self, sub: Subscription) -> None:
+        self._shard(sub.name).detach(sub)
+
+    def subscriber_count(self, channel: Optional[str] = None) -> int:
+        tables = [t for s in self._shards for t in (s.channels, s.patterns)]
+        if channel is not None:
+            return sum(len(t.get(channel, ())) for t in tables)
+        return sum(len(subs) for t in tables for subs in t.values())
+
+    async def close(self) -> None:
+        self.closed = True
+        readers = [s.reader for s in self._shards if s.reader is not None]
+        readers += [t for s in self._shards for t in s.unsubscribes]
+        for reader in readers:
+            reader.cancel()
+        await asyncio.gather(*readers, return_exceptions=True)
+        for shard in self._shards:
+            await shard._teardown()
+            for table in (shard.channels, shard.patterns):
+                for subs in table.values():
+                    for sub in subs:
+                        sub._fail(StopAsyncIteration())
+                table.clear()
+            shard.reader = None
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from redis.asyncio import Redis
+
+from .circuit_breaker import CircuitBreaker
+from .health import HealthMonitor
+from .tls import PrewarmResult
+
+if TYPE_CHECKING:
+    from .pubsub import PubSubHub
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoopState:
+    """Everything RedisHandler owns for one event loop in one process."""
+
+    loop: asyncio.AbstractEventLoop
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    clients: dict[bool, Redis] = field(default_factory=dict)  # keyed by binary flag
+    monitors: dict[bool, HealthMonitor] = field(default_factory=dict)
+    replicas: dict[bool, list[tuple[Redis, HealthMonitor]]] = field(default_factory=dict)
+    breaker: Optional[CircuitBreaker] = None
+    prewarm: Optional[PrewarmResult] = None  # of the text client
+    hubs: dict[bool, PubSubHub] = field(default_factory=dict)  # PubSubHub.shared(), keyed by binary flag
+
+
+class ClientRegistry:
+    """
+    Per-(process, event loop) client state.
+
+    Pools and their sockets are only valid on the loop that created them and
+    in the process that opened them, so each running loop lazily gets its own
+    LoopState. States of loops that have since closed are dropped on the next
+    lookup, and a forked child starts with an empty registry instead of
+    inheriting the parent's sockets.
+    """
+
+    def __init__(self) -> None:
+        self._pid = os.getpid()
+        self._guard = threading.Lock()
+        self._states: dict[int, LoopState] = {}
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self) -> None:
+        # Never close inherited connections: the sockets still belong to the parent
+        self._pid = os.getpid()
+        self._guard = threading.Lock()
+        self._states = {}
+
+    def current(self) -> LoopState:
+        """State for the running loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._pid != os.getpid():
+            self._after_fork()
+
+        state = self._states.get(id(loop))
+        if state is not None and state.loop is loop:
+            return state
+
+        with self._guard:
+            self._prune()
+            state = self._states.get(id(loop))
+            if state is None or state.loop is not loop:
+                state = self._states[id(loop)] = LoopState(loop=loop)
+        return state
+
+    def peek(self) -> Optional[LoopState]:
+        """State for the running loop if it exists, without creating it."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        state = self._states.get(id(loop))
+        return state if state is not None and state.loop is loop and self._pid == os.getpid() else None
+
+    def discard(self, state: LoopState) -> None:
+        with self._guard:
+            if self._states.get(id(state.loop)) is state:
+                del self._states[id(state.loop)]
+
+    def _prune(self) -> None:
+        for key, state in list(self._states.items()):
+            if state.loop.is_closed():
+                # The loop's transports are gone; just drop the references
+                del self._states[key]
+                logger.debug("Dropped Redis clients of closed event loop %#x", key)
+
+    def __len__(self) -> int:
+        return len(self._states)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Union
+
+from .handler import RedisHandler, RedisSessionConfig
+
+
+logger = logging.getLogger(__name__)
+
+Key = Union[str, bytes]
+
+_GLOB_SPECIAL = re.compile(r"([*?\[\]\\])")
+
+
+def escape_glob(text: str) -> str:
+    """Escape MATCH pattern metacharacters so `text` matches literally."""
+    return _GLOB_SPECIAL.sub(r"\\\1", text)
+
+
+@dataclass
+class AdaptiveCount:
+    """
+    SCAN COUNT hint sized from the measured duration of each call.
+
+    Grows (x2) while calls finish well under `target_seconds` and shrinks
+    (/2) when one takes longer, so a single SCAN never holds the server long
+    enough to show up as a latency spike for other clients.
+    """
+
+    count: int = 100
+    minimum: int = 10
+    maximum: int = 5_000
+    target_seconds: float = 0.002
+
+    def update(self, elapsed: float) -> int:
+        if elapsed > self.target_seconds:
+            self.count = max(self.minimum, self.count // 2)
+        elif elapsed < self.target_seconds / 2:
+            self.count = min(self.maximum, self.count * 2)
+        return self.count
+
+
+@dataclass
+class BulkResult:
+    matched: int = 0
+    affected: int = 0  # keys unlinked / given a TTL
+    batches: int = 0
+    seconds: float = 0.0
+
+
+class KeyspaceScanner:
+    """
+    SCAN-family iterators and bulk operations scoped to `config.prefix`.
+
+    Iterators are async generators that yield keys (prefix stripped) or
+    members as the server returns them; each SCAN call runs in its own
+    RedisHandler.session(), so no connection is held between batches and
+    memory stays bounded by one reply. COUNT adapts to keep every call
+    around `target_seconds` of server time.
+
+    unlink()/expire() stream matched keys into pipelined batches of
+    `batch_size`, with at most `concurrency` pipelines in flight. dump()
+    yields (key, payload) pairs for migration, one pipelined DUMP per batch.
+
+    SCAN guarantees: keys present for the whole iteration are returned at
+    least once (callers must tolerate duplicates); keys written meanwhile may
+    or may not be. Cluster topologies are not supported.
+    """
+
+    def __init__(
+        self,
+        config: Optional[RedisSessionConfig] = None,
+        *,
+        count: int = 100,
+        max_count: int = 5_000,
+        target_seconds: float = 0.002,
+    ) -> None:
+        self.config = config or RedisSessionConfig()
+        self.count = count
+        self.max_count = max_count
+        self.target_seconds = target_seconds
+
+    def _sizer(self) -> AdaptiveCount:
+        return AdaptiveCount(count=self.count, maximum=self.max_count, target_seconds=self.target_seconds)
+
+    def _strip(self, key: Key) -> Key:
+        prefix = self.config.prefix
+        if isinstance(key, bytes):
+            return key[len(prefix.encode()):]
+        return key[len(prefix):]
+
+    async def _cursor(self, call: Callable[[Any, int, int], Awaitable[tuple[int, Any]]]) -> AsyncIterator[Any]:
+        sizer = self._sizer()
+        cursor = 0
+        while True:
+            async with RedisHandler.session(self.config) as client:
+                started = time.perf_counter()
+                cursor, batch = await call(client, cursor, sizer.count)
+                sizer.update(time.perf_counter() - started)
+            yield batch
+            if not cursor:
+                return
+
+    # ─────────────────────── iterators ───────────────────────
+
+    async def scan_batches(self, match: str = "*", *, key_type: Optional[str] = None) -> AsyncIterator[list[Key]]:
+        """Full keys under the prefix matching `match`, one list per SCAN reply (may be empty)."""
+        pattern = escape_glob(self.config.prefix) + match
+        async for batch in self._cursor(
+            lambda client, cursor, count: client.scan(cursor, match=pattern, count=count, _type=key_type)
+        ):
+            yield batch
+
+    async def keys(self, match: str = "*", *, key_type: Optional[str] = None) -> AsyncIterator[Key]:
+        """Keys under the prefix matching `match`, with the prefix stripped."""
+        async for batch in self.scan_batches(match, key_type=key_type):
+            for key in batch:
+                yield self._strip(key)
+
+    async def hscan(self, key: str, match: Optional[str] = None) -> AsyncIterator[tuple[Key, Any]]:
+        full = f"{self.config.prefix}{key}"
+        async for batch in self._cursor(lambda client, cursor, count: client.hscan(full, cursor, match, count)):
+            for item in batch.items():
+                yield item
+
+    async def sscan(self, key: str, match: Optional[str] = None) -> AsyncIterator[Any]:
+        full = f"{self.config.prefix}{key}"
+        async for batch in self._cursor(lambda client, cursor, count: client.sscan(full, cursor, match, count)):
+            for member in batch:
+                yield member
+
+    async def zscan(self, key: str, match: Optional[str] = None) -> AsyncIterator[tuple[Any, float]]:
+        full = f"{self.config.prefix}{key}"
+        async for batch in self._cursor(lambda client, cursor, count: client.zscan(full, cursor, match, count)):
+            for item in batch:
+                yield item
+
+    # ─────────────────────── bulk operations ───────────────────────
+
+    async def _rebatch(self, match: str, batch_size: int) -> AsyncIterator[list[Key]]:
+        pending: list[Key] = []
+        async for batch in self.scan_batches(match):
+            pending.extend(batch)
+            while len(pending) >= batch_size:
+                yield pending[:batch_size]
+                del pending[:batch_size]
+        if pending:
+            yield pending
+
+    async def _bulk(
+        self,
+        match: str,
+        batch_size: int,
+        concurrency: int,
+        queue: Callable[[Any, Key], Any],
+    ) -> BulkResult:
+        if batch_size < 1 or concurrency < 1:
+            raise ValueError("batch_size and concurrency must be >= 1")
+        result = BulkResult()
+        started = time.perf_counter()
+        in_flight: set[asyncio.Task[int]] = set()
+
+        async def run(keys: list[Key]) -> int:
+            async with RedisHandler.session(self.config) as client:
+                pipe = client.pipeline(transaction=False)
+                for key in keys:
+                    queue(pipe, key)
+                return sum(int(bool(r)) for r in await pipe.execute())
+
+        def collect(done: set[asyncio.Task[int]]) -> None:
+            for task in done:
+                result.affected += task.result()
+
+        try:
+            async for keys in self._rebatch(match, batch_size):
+                result.matched += len(keys)
+                result.batches += 1
+                if len(in_flight) >= concurrency:
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    collect(done)
+                in_flight.add(asyncio.create_task(run(keys)))
+            if in_flight:
+                done, in_flight = await asyncio.wait(in_flight)
+                collect(done)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            # Let cancelled batches release their connections before we return
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+        result.seconds = time.perf_counter() - started
+        logger.info(
+            "Bulk operation on %s%s: %d matched, %d affected in %d batches (%.1fs)",
+            self.config.prefix, match, result.matched, result.affected, result.batches, result.seconds,
+        )
+        return result
+
+    async def unlink(self, match: str = "*", *, batch_size: int = 500, concurrency: int = 4) -> BulkResult:
+        """UNLINK every key under the prefix matching `match` (memory is reclaimed off the main thread)."""
+        return await self._bulk(match, batch_size, concurrency, lambda pipe, key: pipe.unlink(key))
+
+    async def expire(
+        self, ttl: int, match: str = "*", *, batch_size: int = 500, concurrency: int = 4
+    ) -> BulkResult:
+        """EXPIRE every key under the prefix matching `match` in `ttl` seconds."""
+        if ttl < 1:
+            raise ValueError("ttl must be >= 1")
+        return await self._bulk(match, batch_size, concurrency, lambda pipe, key: pipe.expire(key, ttl))
+
+    async def dump(self, match: str = "*", *, batch_size: int = 200) -> AsyncIterator[tuple[Key, bytes]]:
+        """
+        Yield (key, DUMP payload) for matching keys, prefix stripped, for RESTORE elsewhere.
+
+        Needs a binary session (`config.binary=True`) since payloads are not UTF-8.
+        """
+        if not self.config.binary:
+            raise ValueError("dump() needs RedisSessionConfig(binary=True)")
+        async for keys in self._rebatch(match, batch_size):
+            async with RedisHandler.session(self.config) as client:
+                pipe = client.pipeline(transaction=False)
+                for key in keys:
+                    pipe.dump(key)
+                payloads = await pipe.execute()
+            for key, payload in zip(keys, payloads):
+                if payload is not None:  # expired or deleted since SCAN
+                    yield self._strip(key), payload
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Sequence, Union
+
+from redis.exceptions import NoScriptError
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Script:
+    name: str
+    source: str
+    sha: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "sha", hashlib.sha1(self.source.encode()).hexdigest())
+
+
+@dataclass(frozen=True)
+class _QueuedCall:
+    script: Script
+    keys: tuple[Any, ...]
+    args: tuple[Any, ...]
+
+
+class ScriptRegistry:
+    """
+    Named Lua scripts, called by SHA.
+
+    A script is sent to the server at most once per connection pool (SCRIPT
+    LOAD); every call after that is an EVALSHA carrying only the digest. A
+    NOSCRIPT reply (SCRIPT FLUSH, restart, failover to a replica that never
+    saw the script) forgets everything loaded on that pool, reloads the
+    script and retries the call once.
+
+    Works with RedisHandler sessions, plain redis-py clients and pipelines:
+    queue() adds an EVALSHA to a pipeline and execute(client, pipe) runs it,
+    reloading and re-running only the entries that came back NOSCRIPT.
+    """
+
+    def __init__(self) -> None:
+        self._scripts: dict[str, Script] = {}
+        # pool -> SHAs known to be cached on the server behind it
+        self._loaded: weakref.WeakKeyDictionary[Any, set[str]] = weakref.WeakKeyDictionary()
+        # pipeline -> command index -> queued script call
+        self._queued: weakref.WeakKeyDictionary[Any, dict[int, _QueuedCall]] = weakref.WeakKeyDictionary()
+
+    def register(self, name: str, source: str) -> Script:
+        """Add a script; registering the same name again with the same source is a no-op."""
+        script = Script(name, source)
+        existing = self._scripts.get(name)
+        if existing is not None and existing.sha != script.sha:
+            raise ValueError(f"Script {name!r} is already registered with a different source")
+        self._scripts.setdefault(name, script)
+        return self._scripts[name]
+
+    def __getitem__(self, name: str) -> Script:
+        return self._scripts[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._scripts
+
+    def _script(self, script: Union[str, Script]) -> Script:
+        return self._scripts[script] if isinstance(script, str) else script
+
+    @staticmethod
+    def _owner(client: Any) -> Any:
+        # Cluster clients have no single pool and broadcast SCRIPT LOAD to
+        # every primary themselves
+        return getattr(client, "connection_pool", None) or client
+
+    def _forget(self, client: Any) -> None:
+        self._loaded.pop(self._owner(client), None)
+
+    async def load(self, client: Any, *scripts: Union[str, Script]) -> None:
+        """SCRIPT LOAD whatever is not yet known to be cached behind `client`'s pool."""
+        loaded = self._loaded.setdefault(self._owner(client), set())
+        for script in map(self._script, scripts):
+            if script.sha not in loaded:
+                await client.script_load(script.source)
+                loaded.add(script.sha)
+
+    async def call(
+        self,
+        client: Any,
+        script: Union[str, Script],
+        keys: Sequence[Any] = (),
+        args: Sequence[Any] = (),
+    ) -> Any:
+        """EVALSHA `script`, loading it first if needed and once more after NOSCRIPT."""
+        script = self._script(script)
+        await self.load(client, script)
+        try:
+            return await client.evalsha(script.sha, len(keys), *keys, *args)
+        except NoScriptError:
+            logger.debug("Script %s missing on server — reloading", script.name)
+            self._forget(client)
+            await self.load(client, script)
+            return await client.evalsha(script.sha, len(keys), *keys, *args)
+
+    def queue(
+        self,
+        pipe: Any,
+        script: Union[str, Script],
+        keys: Sequence[Any] = (),
+        args: Sequence[Any] = (),
+    ) -> Any:
+        """Queue an EVALSHA on `pipe`; run the pipeline with execute() to get NOSCRIPT recovery."""
+        script = self._script(script)
+        self._queued.setdefault(pipe, {})[len(pipe)] = _QueuedCall(script, tuple(keys), tuple(args))
+        return pipe.evalsha(script.sha, len(keys), *keys, *args)
+
+    async def execute(self, client: Any, pipe: Any, raise_on_error: bool = True) -> list[Any]:
+        """
+        Execute `pipe` (created from `client`), making sure its queued scripts are loaded first.
+
+        In a non-transactional pipeline, entries that still fail with NOSCRIPT
+        never ran on the server; they are reloaded and re-run in a second
+        pipeline and their results put back in place. A transaction is not
+        split that way: the NOSCRIPT error is returned (or raised) as is.
+        """
+        calls = self._queued.pop(pipe, {})
+        if calls:
+            await self.load(client, *{call.script for call in calls.values()})
+        results: list[Any] = await pipe.execute(raise_on_error=False)
+
+        retry = [i for i, r in enumerate(results) if isinstance(r, NoScriptError) and i in calls]
+        if retry and not getattr(pipe, "is_transaction", False):
+            logger.debug("%d pipelined script calls hit NOSCRIPT — reloading and retrying", len(retry))
+            self._forget(client)
+            await self.load(client, *{calls[i].script for i in retry})
+            for i in retry:
+                call = calls[i]
+                pipe.evalsha(call.script.sha, len(call.keys), *call.keys, *call.args)
+            for i, raw in zip(retry, await pipe.execute(raise_on_error=False)):
+                results[i] = raw
+
+        if raise_on_error:
+            for r in results:
+                if isinstance(r, Exception):
+                    raise r
+        return results
+
+
+# Process-wide registry used by iok_core (rate limiter, primitives)
+script_registry = ScriptRegistry()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import asyncio
+import threading
+from typing import Literal
 
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,25 +22,73 @@ class RedisSettings(IOKSettings):
     tls_check_hostname: bool = False
     
     max_connections: int = Field(default=20, ge=5, le=200)
+    # Upper bounds per socket operation and for the first PING of a new
+    # client; sessions with a deadline are cut shorter (see RedisSessionConfig)
+    socket_timeout_seconds: float = Field(default=10.0, gt=0)
+    socket_connect_timeout_seconds: float = Field(default=5.0, gt=0)
+    init_timeout_seconds: float = Field(default=10.0, gt=0)
+    # "fixed": checkout fails at once when max_connections are busy. "adaptive"
+    # (standalone/replicas): callers queue FIFO for up to
+    # pool_checkout_timeout_seconds, then get RedisPoolExhausted; connections
+    # idle for pool_idle_seconds are closed down to min_connections.
+    pool_mode: Literal["fixed", "adaptive"] = "fixed"
+    min_connections: int = Field(default=2, ge=0, le=200)
+    pool_checkout_timeout_seconds: float = Field(default=1.0, gt=0)
+    pool_idle_seconds: float = Field(default=60.0, gt=0)
+    # Connections opened concurrently when a loop's client is created (0 = grow lazily)
+    prewarm_connections: int = Field(default=0, ge=0, le=200)
+    # Offer the previous TLS session on new connections (abbreviated handshakes)
+    tls_session_resumption: bool = True
+    # PubSubHub: subscribe connections per process/loop, and per-subscriber
+    # queue size and overflow policy
+    pubsub_shards: int = Field(default=1, ge=1, le=16)
+    pubsub_queue_size: int = Field(default=1000, ge=1)
+    pubsub_slow_consumer_policy: Literal["drop_oldest", "drop_newest", "close"] = "drop_oldest"
     disabled: bool = False
 
+    # Topology. host/port is the primary (standalone/replicas) or a cluster
+    # startup node; addresses below are "host:port" (port defaults to `port`).
+    topology: Literal["standalone", "replicas", "sentinel", "cluster"] = "standalone"
+    replica_hosts: list[str] = Field(default_factory=list)
+    replica_max_lag_seconds: float | None = Field(default=None, ge=0)
+    sentinel_hosts: list[str] = Field(default_factory=list)
+    sentinel_service_name: str = "mymaster"
+    sentinel_password: SecretStr | None = None
+    cluster_nodes: list[str] = Field(default_factory=list)
+
+    # Background health monitor; sessions with health_check=True read its state
+    health_check_interval_seconds: float = Field(default=5.0, gt=0)
+    health_check_timeout_seconds: float = Field(default=2.0, gt=0)
+    health_failure_threshold: int = Field(default=1, ge=1)
+
+    # Circuit breaker shared by all sessions (see circuit_breaker.py)
+    circuit_failure_rate: float = Field(default=0.5, gt=0, le=1)
+    circuit_slow_call_seconds: float = Field(default=1.0, gt=0)
+    circuit_slow_call_rate: float = Field(default=1.0, gt=0, le=1)
+    circuit_min_calls: int = Field(default=20, ge=1)
+    circuit_window_seconds: float = Field(default=10.0, gt=0)
+    circuit_open_seconds: float = Field(default=30.0, gt=0)
+    circuit_half_open_max_calls: int = Field(default=3, ge=1)
+
 
 
 _redis_settings_instance: RedisSettings | None = None
-_redis_settings_lock = asyncio.Lock()
+# A thread lock, not asyncio.Lock: safe from any loop or thread, and
+# nothing awaits while it is held.
+_redis_settings_lock = threading.Lock()
 
 
-async def redis_settings() -> RedisSettings:
+def redis_settings_sync() -> RedisSettings:
+    """The RedisSettings singleton; after the first call this is a global read."""
     global _redis_settings_instance
     if _redis_settings_instance is not None:
         return _redis_settings_instance
 
-    async with _redis_settings_lock:
+    with _redis_settings_lock:
         if _redis_settings_instance is None:
             _redis_settings_instance = RedisSettings()
     return _redis_settings_instance
 
 
-def redis_settings_sync() -> RedisSettings:
-    import anyio
-    return anyio.run(redis_settings)
\ No newline at end of file
+async def redis_settings() -> RedisSettings:
+    return redis_settings_sync()
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterator, Optional
+
+import redis
+from redis.connection import ConnectionPool, SSLConnection, UnixDomainSocketConnection
+from redis.exceptions import (
+    AuthenticationError,
+    ConnectionError as RedisPyConnectionError,
+    TimeoutError as RedisPyTimeoutError,
+)
+
+from ..config.base import core_settings_sync
+from ..utils.time import current_deadline, time_budget
+from .circuit_breaker import CircuitBreaker
+from .exceptions import RedisCircuitBreakerOpen, RedisConnectionError, RedisDeadlineExceeded, RedisDisabledError
+from .handler import RedisHandler, RedisSessionConfig
+from .settings import RedisSettings, redis_settings_sync
+from .topology import build_cluster, build_sentinel
+
+
+logger = logging.getLogger(__name__)
+
+
+class _DeadlineConnectionMixin:
+    """Waits for a reply no longer than the current_deadline() of the calling context."""
+
+    socket_timeout: Optional[float]
+
+    def read_response(self, *args: Any, **kwargs: Any) -> Any:
+        deadline = current_deadline()
+        if deadline is not None and "timeout" not in kwargs:
+            left = deadline.remaining()
+            if not left:
+                # The reply is still owed: drop the connection rather than desync it
+                self.disconnect()  # type: ignore[attr-defined]
+                raise RedisPyTimeoutError("Session deadline reached before the reply")
+            kwargs["timeout"] = left if self.socket_timeout is None else min(left, self.socket_timeout)
+        return super().read_response(*args, **kwargs)  # type: ignore[misc]
+
+
+_deadline_classes: dict[type, type] = {}
+
+
+def deadline_connection_class(connection_class: type) -> type:
+    if not isinstance(connection_class, type) or issubclass(connection_class, _DeadlineConnectionMixin):
+        return connection_class
+    cls = _deadline_classes.get(connection_class)
+    if cls is None:
+        cls = _deadline_classes[connection_class] = type(
+            f"Deadline{connection_class.__name__}", (_DeadlineConnectionMixin, connection_class), {}
+        )
+    return cls
+
+
+class SyncRedisHandler:
+    """
+    Blocking counterpart of RedisHandler for code without an event loop
+    (Celery tasks, management commands, scripts).
+
+    Uses redis-py's native sync ConnectionPool: one client per process,
+    shared by all threads, no event loop per call. The pool re-creates its
+    connections after a fork. Settings, TLS/mTLS options and exceptions are
+    the same as RedisHandler's. Reads always go to the primary; there is no
+    background health monitor, redis-py's health_check_interval applies.
+
+    Sessions take the same RedisSessionConfig as RedisHandler.session(); see
+    session() for how deadlines and health checks work without an event loop.
+    """
+
+    _clients: dict[bool, redis.Redis] = {}
+    # Cleared by a connection failure; health-checked sessions PING until it is back
+    _healthy: dict[bool, bool] = {}
+    _breaker: Optional[CircuitBreaker] = None
+    _lock = threading.Lock()
+    # CircuitBreaker is not thread-safe; all sync sessions share one
+    _breaker_lock = threading.Lock()
+
+    @classmethod
+    def _after_fork(cls) -> None:
+        # A lock held by another thread at fork time would stay locked forever
+        cls._lock = threading.Lock()
+        cls._breaker_lock = threading.Lock()
+
+    @classmethod
+    def client(cls, *, binary: bool = False) -> redis.Redis:
+        client = cls._clients.get(binary)
+        if client is None:
+            client = cls._init(binary)
+        return client
+
+    @classmethod
+    def _init(cls, binary: bool) -> redis.Redis:
+        with cls._lock:
+            if binary in cls._clients:
+                return cls._clients[binary]
+
+            settings = redis_settings_sync()
+            if settings.disabled or core_settings_sync().redis_disabled:
+                raise RedisDisabledError("Redis is disabled via config")
+
+            try:
+                client: redis.Redis = cls._build_client(settings, decode_responses=not binary)
+                pool = getattr(client, "connection_pool", None)  # a cluster client has one per node
+                if pool is not None:
+                    pool.connection_class = deadline_connection_class(pool.connection_class)
+                client.ping()
+            except RedisPyConnectionError as exc:
+                raise RedisConnectionError("Cannot reach Redis server") from exc
+            except RedisPyTimeoutError as exc:
+                raise RedisConnectionError("Redis timeout during initialization") from exc
+            except AuthenticationError as exc:
+                raise RedisConnectionError("Redis authentication failed") from exc
+            except RedisConnectionError:
+                raise
+            except Exception as exc:
+                raise RedisConnectionError("Unexpected Redis initialization error") from exc
+
+            logger.info("iok_core SyncRedisHandler initialized (%s%s)", settings.topology, ", binary" if binary else "")
+            cls._clients[binary] = client
+            return client
+
+    @staticmethod
+    def _build_client(settings: RedisSettings, decode_responses: bool = True) -> Any:
+        base_kwargs = RedisHandler._base_kwargs(settings, decode_responses)
+
+        if settings.topology == "sentinel":
+            return build_sentinel(settings, base_kwargs, RedisHandler._tls_kwargs(settings), sync=True)[0]
+        if settings.topology == "cluster":
+            return build_cluster(settings, base_kwargs, RedisHandler._tls_kwargs(settings), sync=True)[0]
+
+        url = RedisHandler._build_url(settings)
+        if url.startswith("unix://"):
+            pool = ConnectionPool(
+                connection_class=UnixDomainSocketConnection,
+                path=url[7:],
+                password=settings.password.get_secret_value() if settings.password else None,
+                **base_kwargs,
+            )
+        elif not settings.tls_enabled:
+            pool = ConnectionPool.from_url(url, **base_kwargs)
+        else:
+            pool = ConnectionPool(
+                connection_class=SSLConnection,
+                host=settings.host,
+                port=settings.port,
+                **RedisHandler._tls_kwargs(settings),
+                **base_kwargs,
+            )
+        return redis.Redis(connection_pool=pool)
+
+    @classmethod
+    def circuit_breaker(cls) -> CircuitBreaker:
+        if cls._breaker is None:
+            with cls._breaker_lock:
+                if cls._breaker is None:
+                    cls._breaker = CircuitBreaker.from_settings(redis_settings_sync())
+        return cls._breaker
+
+    @classmethod
+    @contextmanager
+    def session(cls, config: RedisSessionConfig = RedisSessionConfig()) -> Iterator[redis.Redis]:
+        """
+        Shared client, with circuit breaker, health check and error mapping
+        around the block.
+
+        With a deadline (config.timeout, config.deadline or the caller's
+        time_budget()) every reply the block waits for is bounded by the time
+        left, and running out raises RedisDeadlineExceeded. Blocking work of
+        the caller's own cannot be interrupted; the next Redis call fails
+        instead. Cluster clients are only checked when the session starts.
+
+        With health_check, a session after a connection failure first PINGs
+        (instead of running the block against a dead server) until one
+        succeeds.
+        """
+        deadline = RedisHandler._session_deadline(config)
+        budget = None
+        if deadline is not None:
+            budget = deadline.remaining()
+            if not budget:
+                # Spent before reaching Redis: nothing to tell the breaker
+                raise RedisDeadlineExceeded(0.0, budget)
+
+        breaker = cls.circuit_breaker() if config.circuit_breaker else None
+        if breaker is not None:
+            with cls._breaker_lock:
+                breaker.before_call()
+        started = time.perf_counter()
+
+        try:
+            client = cls.client(binary=config.binary)
+        except RedisConnectionError:
+            cls._fail(breaker)
+            raise
+        except BaseException:
+            cls._ignore(breaker)
+            raise
+
+        try:
+            with time_budget(deadline=deadline) if deadline is not None else nullcontext():
+                if config.health_check and not cls._healthy.get(config.binary, True):
+                    client.ping()
+                    cls._healthy[config.binary] = True
+                    logger.info("Redis reachable again")
+                yield client
+        except RedisPyConnectionError as exc:
+            logger.warning("Redis connection failure: %r", exc)
+            cls._healthy[config.binary] = False
+            if cls._fail(breaker):
+                raise RedisCircuitBreakerOpen(retry_after_seconds=breaker.retry_after_seconds) from exc  # type: ignore[union-attr]
+            raise RedisConnectionError("Redis connection lost") from exc
+        except RedisPyTimeoutError as exc:
+            # Redis did not answer in time, whether the budget or socket_timeout ran out first
+            if cls._fail(breaker):
+                raise RedisCircuitBreakerOpen(retry_after_seconds=breaker.retry_after_seconds) from exc  # type: ignore[union-attr]
+            if deadline is not None and deadline.expired:
+                raise RedisDeadlineExceeded(time.perf_counter() - started, budget) from exc
+            raise RedisConnectionError("Redis operation timed out") from exc
+        except RedisDeadlineExceeded:
+            # From a nested session; it already did the accounting
+            cls._ignore(breaker)
+            raise
+        except Exception as exc:
+            cls._ignore(breaker)
+            logger.error("Unexpected Redis error in session", exc_info=True)
+            raise RedisConnectionError("Redis operation failed") from exc
+        except BaseException:
+            cls._ignore(breaker)
+            raise
+        else:
+            if breaker is not None:
+                with cls._breaker_lock:
+                    breaker.on_success(time.perf_counter() - started)
+
+    @classmethod
+    def _fail(cls, breaker: Optional[CircuitBreaker]) -> bool:
+        """Record a failure; True if the breaker is now open."""
+        if breaker is None:
+            return False
+        with cls._breaker_lock:
+            breaker.on_failure()
+            return breaker.state == "open"
+
+    @classmethod
+    def _ignore(cls, breaker: Optional[CircuitBreaker]) -> None:
+        if breaker is not None:
+            with cls._breaker_lock:
+                breaker.on_ignored()
+
+    @classmethod
+    def close(cls) -> None:
+        with cls._lock:
+            clients, cls._clients = cls._clients, {}
+            cls._healthy = {}
+        for client in clients.values():
+            client.close()
+        if clients:
+            logger.info("iok_core SyncRedisHandler closed")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=SyncRedisHandler._after_fork)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+import ssl
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional
+
+from redis.asyncio.connection import SSLConnection
+
+from .metrics import LatencyHistogram
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TLSStats:
+    handshakes: int = 0
+    resumed: int = 0  # abbreviated handshakes (session reused)
+    failures: int = 0
+    # TCP connect + TLS handshake, per new connection
+    handshake_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def resumption_rate(self) -> float:
+        return self.resumed / self.handshakes if self.handshakes else 0.0
+
+
+@dataclass
+class PrewarmResult:
+    requested: int
+    opened: int
+    failed: int
+    seconds: float
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """SSLContext that offers the last session for the same server on every new client connection."""
+
+    _iok_tls: SharedTLSContext
+
+    def wrap_bio(self, incoming: Any, outgoing: Any, server_side: bool = False, server_hostname: Any = None, session: Any = None) -> ssl.SSLObject:
+        if session is None and not server_side:
+            session = self._iok_tls.session_for(server_hostname)
+        return super().wrap_bio(incoming, outgoing, server_side, server_hostname, session)
+
+
+class SharedTLSContext:
+    """
+    One client SSLContext for every TLS connection a handler opens.
+
+    CA bundle and client certificate are loaded once instead of once per
+    connection. With `resumption` on, the most recent TLS session per server
+    hostname is offered on each new connection, so pool growth after the
+    first connection does an abbreviated handshake (tickets in TLS 1.3,
+    session IDs in 1.2) when the server allows it.
+    """
+
+    def __init__(self, tls_kwargs: Mapping[str, Any], *, resumption: bool = True) -> None:
+        context = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context._iok_tls = self
+        context.check_hostname = bool(tls_kwargs.get("ssl_check_hostname"))
+        context.verify_mode = tls_kwargs.get("ssl_cert_reqs", ssl.CERT_REQUIRED)
+        if tls_kwargs.get("ssl_ca_certs"):
+            context.load_verify_locations(cafile=tls_kwargs["ssl_ca_certs"])
+        elif context.verify_mode != ssl.CERT_NONE:
+            context.load_default_certs()
+        if tls_kwargs.get("ssl_certfile"):
+            context.load_cert_chain(tls_kwargs["ssl_certfile"], tls_kwargs.get("ssl_keyfile"))
+
+        self.context = context
+        self.resumption = resumption
+        self.stats = TLSStats()
+        self._sessions: dict[Any, ssl.SSLSession] = {}
+        # Latest connection per server: its session (and TLS 1.3 ticket) is
+        # only complete after the first reads, so it is fetched lazily.
+        self._latest: dict[Any, weakref.ref[ssl.SSLObject]] = {}
+
+    def session_for(self, server_hostname: Any) -> Optional[ssl.SSLSession]:
+        if not self.resumption:
+            return None
+        ref = self._latest.get(server_hostname)
+        sslobj = ref() if ref is not None else None
+        if sslobj is not None and sslobj.session is not None:
+            self._sessions[server_hostname] = sslobj.session
+        return self._sessions.get(server_hostname)
+
+    def record(self, sslobj: Optional[ssl.SSLObject], server_hostname: Any, elapsed: float) -> None:
+        self.stats.handshakes += 1
+        self.stats.handshake_time.observe(elapsed)
+        if sslobj is None:
+            return
+        if sslobj.session_reused:
+            self.stats.resumed += 1
+        self._latest[server_hostname] = weakref.ref(sslobj)
+
+
+class SharedContextSSLConnection(SSLConnection):
+    """SSLConnection that uses a SharedTLSContext instead of building its own SSLContext."""
+
+    def __init__(self, *, tls_context: SharedTLSContext, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.tls_context = tls_context
+
+    def _connection_arguments(self) -> Mapping[str, Any]:
+        return {"host": self.host, "port": self.port, "ssl": self.tls_context.context}
+
+    async def _connect(self) -> None:
+        started = time.perf_counter()
+        try:
+            await super()._connect()  # type: ignore[no-untyped-call]
+        except BaseException:
+            self.tls_context.stats.failures += 1
+            raise
+        sslobj = self._writer.get_extra_info("ssl_object") if self._writer is not None else None
+        self.tls_context.record(sslobj, self.host, time.perf_counter() - started)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import math
+import random
+from typing import Any, Optional, Sequence
+
+from redis.asyncio import Redis
+
+from .health import HealthMonitor
+from .settings import RedisSettings
+
+
+logger = logging.getLogger(__name__)
+
+
+def parse_address(address: str, default_port: int) -> tuple[str, int]:
+    """"host", "host:port" or "[v6]:port" -> (host, port)."""
+    if address.startswith("["):
+        host, _, rest = address[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else default_port
+    host, sep, port = address.rpartition(":")
+    if not sep:
+        return address, default_port
+    return host, int(port)
+
+
+def replica_lag_bound(settings: RedisSettings) -> Optional[float]:
+    """
+    replica_max_lag_seconds where replica lag can be probed, else None.
+
+    Only a static replica (topology=replicas) is one server per client. A
+    Sentinel replica client rotates its connections over every replica and a
+    cluster reader spreads reads over the replicas of every shard, so one
+    probe says nothing about the server a read lands on; the bound is not
+    applied there (rejecting an unknown lag would pin all reads to the
+    primary).
+    """
+    if settings.topology != "replicas":
+        return None
+    return settings.replica_max_lag_seconds
+
+
+def choose_replica(
+    replicas: Sequence[tuple[Redis, HealthMonitor]],
+    max_lag_seconds: Optional[float],
+) -> Optional[tuple[Redis, HealthMonitor]]:
+    """
+    Pick a read replica: healthy, within the staleness bound, and the lower
+    EWMA latency of two random candidates (power of two choices), which
+    favours fast replicas without stampeding the single fastest one.
+    """
+    eligible = [
+        r for r in replicas
+        if r[1].healthy
+        and (max_lag_seconds is None or (r[1].replication_lag is not None and r[1].replication_lag <= max_lag_seconds))
+    ]
+    if not eligible:
+        return None
+    if len(eligible) == 1:
+        return eligible[0]
+    a, b = random.sample(eligible, 2)
+    latency_a = a[1].latency_ewma if a[1].latency_ewma is not None else math.inf
+    latency_b = b[1].latency_ewma if b[1].latency_ewma is not None else math.inf
+    return a if latency_a <= latency_b else b
+
+
+def build_sentinel(
+    settings: RedisSettings,
+    base_kwargs: dict[str, Any],
+    tls_kwargs: dict[str, Any],
+    redis_class: Optional[type[Any]] = None,
+    sync: bool = False,
+) -> tuple[Any, list[Any]]:
+    """Primary and replica clients that follow Sentinel failovers (redis.Redis when `sync`)."""
+    if sync:
+        from redis import Redis as SyncRedis
+        from redis.sentinel import Sentinel
+
+        redis_class = redis_class or SyncRedis
+    else:
+        from redis.asyncio.sentinel import Sentinel  # type: ignore[assignment]
+
+        redis_class = redis_class or Redis
+
+    if not settings.sentinel_hosts:
+        raise ValueError("IOK_REDIS_SENTINEL_HOSTS is required for topology=sentinel")
+
+    connection_kwargs = dict(base_kwargs)
+    sentinel_kwargs: dict[str, Any] = {k: v for k, v in base_kwargs.items() if k.startswith("socket_")}
+    if settings.sentinel_password:
+        sentinel_kwargs["password"] = settings.sentinel_password.get_secret_value()
+
+    if settings.tls_enabled:
+        # SentinelConnectionPool swaps in its SSL connection class on ssl=True
+        connection_kwargs.update(tls_kwargs, ssl=True)
+        sentinel_kwargs.update({k: v for k, v in tls_kwargs.items() if k.startswith("ssl_")}, ssl=True)
+    elif settings.password:
+        connection_kwargs["password"] = settings.password.get_secret_value()
+
+    # redis-py leaves the Sentinel API unannotated
+    sentinel = Sentinel(  # type: ignore[no-untyped-call]
+        [parse_address(a, 26379) for a in settings.sentinel_hosts],
+        sentinel_kwargs=sentinel_kwargs,
+        **connection_kwargs,
+    )
+    primary = sentinel.master_for(settings.sentinel_service_name, redis_class=redis_class)  # type: ignore[no-untyped-call]
+    replica = sentinel.slave_for(settings.sentinel_service_name, redis_class=redis_class)  # type: ignore[no-untyped-call]
+    logger.debug("Built Sentinel clients for service %s", settings.sentinel_service_name)
+    return primary, [replica]
+
+
+def build_cluster(
+    settings: RedisSettings,
+    base_kwargs: dict[str, Any],
+    tls_kwargs: dict[str, Any],
+    sync: bool = False,
+) -> tuple[Any, list[Any]]:
+    """A cluster client for writes and one that spreads reads over replicas."""
+    from redis.cluster import LoadBalancingStrategy
+
+    if sync:
+        from redis.cluster import ClusterNode, RedisCluster
+    else:
+        from redis.asyncio.cluster import ClusterNode, RedisCluster  # type: ignore[assignment]
+
+    addresses = [(settings.host, settings.port)] + [parse_address(a, settings.port) for a in settings.cluster_nodes]
+    nodes = [ClusterNode(host, port) for host, port in addresses]  # type: ignore[no-untyped-call]
+    kwargs: dict[str, Any] = {
+        # RedisCluster takes no pool/retry_on_timeout kwargs; only pass what it knows
+        k: v for k, v in base_kwargs.items()
+        if k in {"max_connections", "socket_connect_timeout", "socket_timeout",
+                 "socket_keepalive", "health_check_interval", "decode_responses"}
+    }
+    if settings.tls_enabled:
+        kwargs.update(tls_kwargs, ssl=True)
+    elif settings.password:
+        kwargs["password"] = settings.password.get_secret_value()
+
+    primary = RedisCluster(startup_nodes=nodes, **kwargs)
+    reader = RedisCluster(
+        startup_nodes=nodes,
+        load_balancing_strategy=LoadBalancingStrategy.ROUND_ROBIN_REPLICAS,
+        **kwargs,
+    )
+    return primary, [reader]
@@ -0,0 +1,30 @@
+# src/iok_core/streams/__init__.py
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .consumer import ConsumerStats, StreamConsumer, StreamMessage
+    from .producer import StreamProducer
+    from .settings import StreamSettings, stream_settings
+
+__all__ = [
+    "StreamProducer",
+    "StreamConsumer",
+    "StreamMessage",
+    "ConsumerStats",
+    "StreamSettings",
+    "stream_settings",
+]
+
+# Loaded on first access so importing the package does not pull in Redis
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "ConsumerStats": ".consumer",
+    "StreamConsumer": ".consumer",
+    "StreamMessage": ".consumer",
+    "StreamProducer": ".producer",
+    "StreamSettings": ".settings",
+    "stream_settings": ".settings",
+})
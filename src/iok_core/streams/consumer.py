@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, cast
+
+from redis.exceptions import ResponseError
+
+from ..redis.exceptions import RedisError
+from ..redis.handler import RedisHandler, RedisSessionConfig
+from .settings import stream_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StreamMessage:
+    id: Any
+    fields: dict[Any, Any]
+    claimed: bool = False  # taken over from a stalled consumer via XAUTOCLAIM
+
+
+@dataclass
+class ConsumerStats:
+    read: int = 0
+    claimed: int = 0
+    handled: int = 0
+    failed: int = 0  # handler raised; the entry stays pending and is reclaimed later
+    acked: int = 0
+    ack_batches: int = 0
+    saturated_waits: int = 0  # reads deferred because all in-flight slots were busy
+    redis_errors: int = 0  # failed reads/claims, retried after a backoff
+
+    @property
+    def mean_ack_batch(self) -> float:
+        return self.acked / self.ack_batches if self.ack_batches else 0.0
+
+
+Handler = Callable[[StreamMessage], Awaitable[None]]
+
+
+class StreamConsumer:
+    """
+    Consumer-group worker for a Redis stream (`config.prefix` + `stream`).
+
+    Reads up to `batch_size` new entries per XREADGROUP and hands each to
+    `handler` in its own task, with at most `max_in_flight` running: while
+    all slots are busy nothing more is read, so a slow handler applies
+    backpressure instead of growing memory. Entries are XACKed in batches
+    after the handler returns; an entry whose handler raised stays pending.
+    Every `claim_interval_seconds` entries pending on any consumer of the
+    group for longer than `claim_idle_seconds` (crashed or stuck workers,
+    failed handlers) are taken over with XAUTOCLAIM and handled again, so
+    delivery is at-least-once and handlers should be idempotent.
+
+    Throughput scales by running more consumers (distinct `consumer` names)
+    in the same group, in this process or others.
+    """
+
+    def __init__(
+        self,
+        stream: str,
+        group: str,
+        handler: Handler,
+        *,
+        consumer: Optional[str] = None,
+        config: Optional[RedisSessionConfig] = None,
+        batch_size: Optional[int] = None,
+        block_ms: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        ack_batch_size: Optional[int] = None,
+        ack_interval_seconds: Optional[float] = None,
+        claim_idle_seconds: Optional[float] = None,
+        claim_interval_seconds: Optional[float] = None,
+    ) -> None:
+        settings = stream_settings()
+        self.config = config or RedisSessionConfig(prefix=settings.key_prefix)
+        # XREADGROUP BLOCK idles for block_ms by design; timed by the shared breaker it
+        # would count as a slow call and idle consumers could open it for everyone
+        self._read_config = dataclasses.replace(self.config, circuit_breaker=False)
+        self.key = f"{self.config.prefix}{stream}"
+        self.group = group
+        self.handler = handler
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.batch_size = batch_size if batch_size is not None else settings.batch_size
+        self.block_ms = block_ms if block_ms is not None else settings.block_ms
+        self.max_in_flight = max_in_flight if max_in_flight is not None else settings.max_in_flight
+        self.ack_batch_size = ack_batch_size if ack_batch_size is not None else settings.ack_batch_size
+        self.ack_interval_seconds = (
+            ack_interval_seconds if ack_interval_seconds is not None else settings.ack_interval_seconds
+        )
+        self.claim_idle_seconds = claim_idle_seconds if claim_idle_seconds is not None else settings.claim_idle_seconds
+        self.claim_interval_seconds = (
+            claim_interval_seconds if claim_interval_seconds is not None else settings.claim_interval_seconds
+        )
+
+        self.stats = ConsumerStats()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._acks: list[Any] = []
+        # IDs being handled or waiting for XACK here; XAUTOCLAIM must not hand them out again
+        self._active: set[Any] = set()
+        self._ack_wake = asyncio.Event()
+        self._runner: Optional[asyncio.Task[None]] = None
+        self._stopping = False
+        self._stop_requested = asyncio.Event()
+        self._claim_cursor: Any = "0-0"
+        self._next_claim = 0.0
+
+    # ─────────────────────── lifecycle ───────────────────────
+
+    async def ensure_group(self) -> None:
+        """Create the stream and group if missing (new groups start at the beginning of the stream)."""
+        async with RedisHandler.session(self.config) as client:
+            try:
+                await client.xgroup_create(self.key, self.group, id="0", mkstream=True)
+            except ResponseError as exc:
+                if "BUSYGROUP" not in str(exc):
+                    raise
+
+    def start(self) -> asyncio.Task[None]:
+        if self._runner is None:
+            self._stopping = False
+            self._stop_requested.clear()
+            self._runner = asyncio.create_task(self.run())
+        return self._runner
+
+    async def stop(self) -> None:
+        """Stop reading, let in-flight handlers finish and flush pending acks."""
+        self._stopping = True
+        self._stop_requested.set()
+        if self._runner is not None:
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+
+    async def run(self) -> None:
+        acker = asyncio.create_task(self._ack_loop())
+        group_ready = False
+        backoff = 0.1
+        try:
+            while not self._stopping:
+                free = self.max_in_flight - len(self._tasks)
+                if free <= 0:
+                    self.stats.saturated_waits += 1
+                    await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                try:
+                    if not group_ready:
+                        await self.ensure_group()
+                        group_ready = True
+                    if time.monotonic() >= self._next_claim:
+                        self._next_claim = time.monotonic() + self.claim_interval_seconds
+                        if await self._claim(free):
+                            continue
+                    messages = await self._read(free)
+                except RedisError:
+                    # Outage, open breaker, saturated pool: keep the worker alive and retry
+                    self.stats.redis_errors += 1
+                    logger.warning(
+                        "Stream read failed for %s/%s — retrying in ~%.1fs", self.key, self.group, backoff, exc_info=True
+                    )
+                    try:
+                        await asyncio.wait_for(self._stop_requested.wait(), backoff * random.uniform(0.5, 1.5))
+                    except asyncio.TimeoutError:
+                        pass
+                    backoff = min(backoff * 2, 10.0)
+                    continue
+                backoff = 0.1
+                for message in messages:
+                    self._dispatch(message)
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            acker.cancel()
+            await asyncio.gather(acker, return_exceptions=True)
+            await self._flush_acks()
+
+    # ─────────────────────── reading ───────────────────────
+
+    async def _read(self, count: int) -> list[StreamMessage]:
+        async with RedisHandler.session(self._read_config) as client:
+            reply = await client.xreadgroup(
+                self.group,
+                self.consumer,
+                {self.key: ">"},
+                count=min(count, self.batch_size),
+                block=self.block_ms,
+            )
+        # RESP2: [[stream, entries]]; RESP3: {stream: entries}
+        streams = cast(
+            "list[list[tuple[Any, dict[Any, Any]]]]",
+            list(reply.values()) if isinstance(reply, dict) else [entries for _, entries in reply or ()],
+        )
+        messages = [StreamMessage(id_, fields) for entries in streams for id_, fields in entries]
+        self.stats.read += len(messages)
+        return messages
+
+    async def _claim(self, count: int) -> int:
+        """XAUTOCLAIM one page of stalled entries; returns how many were taken."""
+        async with RedisHandler.session(self.config) as client:
+            reply = await client.xautoclaim(
+                self.key,
+                self.group,
+                self.consumer,
+                min_idle_time=round(self.claim_idle_seconds * 1000),
+                start_id=self._claim_cursor,
+                count=min(count, self.batch_size),
+            )
+        # [next cursor, [[id, fields], ...], deleted ids]; fields is nil for a deleted entry
+        if not isinstance(reply, (list, tuple)) or len(reply) < 2 or not isinstance(reply[1], (list, tuple)):
+            raise RedisError(f"Unexpected XAUTOCLAIM reply: {reply!r}")
+        self._claim_cursor = reply[0]
+        entries = cast("list[tuple[Any, Optional[dict[Any, Any]]]]", reply[1])
+        if self._claim_cursor not in ("0-0", b"0-0"):
+            self._next_claim = 0.0  # more pages waiting
+        claimed = [
+            StreamMessage(id_, fields, claimed=True)
+            for id_, fields in entries
+            if fields is not None and id_ not in self._active
+        ]
+        if claimed:
+            logger.info("Reclaimed %d stalled entries from %s/%s", len(claimed), self.key, self.group)
+        self.stats.claimed += len(claimed)
+        for message in claimed:
+            self._dispatch(message)
+        return len(claimed)
+
+    def _dispatch(self, message: StreamMessage) -> None:
+        self._active.add(message.id)
+        task = asyncio.create_task(self._handle(message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _handle(self, message: StreamMessage) -> None:
+        try:
+            await self.handler(message)
+        except Exception:
+            self.stats.failed += 1
+            self._active.discard(message.id)
+            logger.warning("Stream handler failed for %s %s — left pending", self.key, message.id, exc_info=True)
+            return
+        self.stats.handled += 1
+        self._acks.append(message.id)
+        if len(self._acks) >= self.ack_batch_size:
+            self._ack_wake.set()
+
+    # ─────────────────────── acknowledging ───────────────────────
+
+    async def _ack_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._ack_wake.wait(), timeout=self.ack_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._ack_wake.clear()
+            try:
+                await self._flush_acks()
+            except Exception:
+                # Unacked entries are redelivered through XAUTOCLAIM
+                logger.warning("XACK failed for %s/%s", self.key, self.group, exc_info=True)
+
+    async def _flush_acks(self) -> None:
+        while self._acks:
+            ids, self._acks = self._acks[: self.ack_batch_size], self._acks[self.ack_batch_size:]
+            try:
+                async with RedisHandler.session(self.config) as client:
+                    await client.xack(self.key, self.group, *ids)
+            finally:
+                self._active.difference_update(ids)
+            self.stats.acked += len(ids)
+            self.stats.ack_batches += 1
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping, Optional
+
+from redis.typing import EncodableT, FieldT
+
+from ..redis.handler import RedisHandler, RedisSessionConfig
+from .settings import stream_settings
+
+
+Fields = Mapping[str, Any]
+
+
+def _entry(fields: Fields) -> dict[FieldT, EncodableT]:
+    return dict(fields.items())
+
+
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+class StreamProducer:
+    """
+    Appends messages to a Redis stream (`config.prefix` + `stream`).
+
+    add_many() sends XADDs in pipelines of `batch_size`, one round trip per
+    batch. Every XADD trims the stream to about `maxlen` entries (MAXLEN ~),
+    which lets Redis trim whole macro nodes cheaply instead of exactly.
+    """
+
+    def __init__(
+        self,
+        stream: str,
+        *,
+        config: Optional[RedisSessionConfig] = None,
+        maxlen: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> None:
+        settings = stream_settings()
+        self.config = config or RedisSessionConfig(prefix=settings.key_prefix)
+        self.key = f"{self.config.prefix}{stream}"
+        self.maxlen = maxlen if maxlen is not None else settings.maxlen
+        self.batch_size = batch_size if batch_size is not None else settings.producer_batch_size
+
+    async def add(self, fields: Fields) -> str:
+        """Append one message; returns its stream ID."""
+        async with RedisHandler.session(self.config) as client:
+            return _text(await client.xadd(self.key, _entry(fields), maxlen=self.maxlen, approximate=True))
+
+    async def add_many(self, messages: Iterable[Fields]) -> list[str]:
+        """Append messages in order with pipelined XADDs; returns their stream IDs."""
+        ids: list[str] = []
+        batch: list[Fields] = []
+        for fields in messages:
+            batch.append(fields)
+            if len(batch) >= self.batch_size:
+                ids += await self._send(batch)
+                batch = []
+        if batch:
+            ids += await self._send(batch)
+        return ids
+
+    async def _send(self, batch: list[Fields]) -> list[str]:
+        async with RedisHandler.session(self.config) as client:
+            pipe = client.pipeline(transaction=False)
+            for fields in batch:
+                pipe.xadd(self.key, _entry(fields), maxlen=self.maxlen, approximate=True)
+            return [_text(id_) for id_ in await pipe.execute()]
+
+    async def length(self) -> int:
+        async with RedisHandler.session(self.config) as client:
+            return int(await client.xlen(self.key))
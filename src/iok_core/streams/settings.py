@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from ..config.base import IOKSettings
+
+
+class StreamSettings(IOKSettings):
+    model_config = SettingsConfigDict(env_prefix="IOK_STREAMS_")
+
+    key_prefix: str = "stream:"
+
+    # Producer: XADDs per pipeline, and approximate (~) MAXLEN trimming
+    producer_batch_size: int = Field(default=500, ge=1)
+    maxlen: int = Field(default=1_000_000, ge=1)
+
+    # Consumer: XREADGROUP COUNT and BLOCK, and how many messages may be
+    # handled concurrently (reading pauses while all slots are busy)
+    batch_size: int = Field(default=100, ge=1)
+    block_ms: int = Field(default=1000, ge=1)
+    max_in_flight: int = Field(default=64, ge=1)
+
+    # XACK batching: flush once this many are pending or after the interval
+    ack_batch_size: int = Field(default=100, ge=1)
+    ack_interval_seconds: float = Field(default=0.05, gt=0)
+
+    # XAUTOCLAIM entries pending on any consumer for longer than claim_idle
+    claim_idle_seconds: float = Field(default=60.0, gt=0)
+    claim_interval_seconds: float = Field(default=30.0, gt=0)
+
+
+@lru_cache
+def stream_settings() -> StreamSettings:
+    return StreamSettings()
@@ -0,0 +1,23 @@
+# src/iok_core/tracing/__init__.py
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..utils.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .settings import TracingSettings, tracing_settings
+    from .redis import should_trace
+
+__all__ = [
+    "TracingSettings",
+    "tracing_settings",
+    "should_trace",
+]
+
+# opentelemetry is only imported once a tracing helper is used
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "TracingSettings": ".settings",
+    "tracing_settings": ".settings",
+    "should_trace": ".redis",
+})
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Mapping, Optional, Sequence
+
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.trace import NoOpTracerProvider, ProxyTracerProvider, Span, SpanKind, Status, StatusCode
+
+from .settings import tracing_settings
+
+
+logger = logging.getLogger(__name__)
+
+# A ProxyTracer: resolves to the real tracer once an SDK provider is installed
+_tracer = trace.get_tracer("iok_core.redis")
+
+
+def should_trace() -> bool:
+    """
+    Cheap gate evaluated before any span or attribute work.
+
+    False when no SDK tracer provider is installed, or when the parent span
+    exists but was not sampled (with ParentBased sampling the child would be
+    dropped anyway, so we skip creating it).
+    """
+    if isinstance(trace.get_tracer_provider(), (ProxyTracerProvider, NoOpTracerProvider)):
+        return False
+    if tracing_settings().respect_parent_sampling:
+        ctx = trace.get_current_span().get_span_context()
+        if ctx.is_valid and not ctx.trace_flags.sampled:
+            return False
+    return True
+
+
+def client_attributes(client: Any) -> dict[str, Any]:
+    """Connection-level db.*/server.* attributes, computed once per client."""
+    attributes = getattr(client, "_iok_span_attributes", None)
+    if attributes is None:
+        attributes = {"db.system.name": "redis", "db.system": "redis"}
+        pool = getattr(client, "connection_pool", None)
+        kwargs = getattr(pool, "connection_kwargs", {}) if pool is not None else {}
+        if kwargs.get("path"):
+            attributes["server.address"] = kwargs["path"]
+        else:
+            attributes["server.address"] = kwargs.get("host", "localhost")
+            attributes["server.port"] = kwargs.get("port", 6379)
+        attributes["db.namespace"] = str(kwargs.get("db", 0))
+        try:
+            client._iok_span_attributes = attributes
+        except AttributeError:
+            pass
+    return attributes
+
+
+def format_query(args: Sequence[Any], max_length: int) -> str:
+    parts = []
+    length = 0
+    for arg in args:
+        text = bytes(arg).decode("utf-8", "replace") if isinstance(arg, (bytes, bytearray, memoryview)) else str(arg)
+        parts.append(text)
+        length += len(text) + 1
+        if length > max_length:
+            break
+    query = " ".join(parts)
+    return query if len(query) <= max_length else query[: max_length - 3] + "..."
+
+
+def start_command_span(client: Any, args: Sequence[Any]) -> Optional[Span]:
+    """CLIENT span for one command, or None when nothing would be recorded."""
+    if not should_trace():
+        return None
+    name = args[0] if isinstance(args[0], str) else str(args[0])
+    span = _tracer.start_span(name, kind=SpanKind.CLIENT)
+    if span.is_recording():
+        # Sampling is decided in start_span; attribute work only for kept spans
+        span.set_attributes(client_attributes(client))
+        span.set_attribute("db.operation.name", name)
+        settings = tracing_settings()
+        if settings.redis_record_arguments:
+            span.set_attribute("db.query.text", format_query(args, settings.redis_max_query_length))
+    return span
+
+
+def start_pipeline_span(client: Any, commands: Sequence[tuple[tuple[Any, ...], Mapping[str, Any]]], transaction: bool) -> Optional[Span]:
+    """One CLIENT span for a whole pipeline (MULTI/EXEC when transactional)."""
+    if not should_trace():
+        return None
+    name = "MULTI" if transaction else "PIPELINE"
+    span = _tracer.start_span(name, kind=SpanKind.CLIENT)
+    if span.is_recording():
+        span.set_attributes(client_attributes(client))
+        span.set_attribute("db.operation.name", name)
+        span.set_attribute("db.operation.batch.size", len(commands))
+        settings = tracing_settings()
+        if settings.redis_record_arguments:
+            query = "\n".join(format_query(args, settings.redis_max_query_length) for args, _ in commands)
+            span.set_attribute("db.query.text", query[: settings.redis_max_query_length])
+    return span
+
+
+def start_session_span(client: Any, prefix: str, read_only: bool) -> tuple[Optional[Span], Optional[object]]:
+    """Span around a RedisHandler.session(), made current so command spans nest under it."""
+    if not should_trace():
+        return None, None
+    span = _tracer.start_span("redis.session", kind=SpanKind.CLIENT)
+    if span.is_recording():
+        span.set_attributes(client_attributes(client))
+        span.set_attribute("iok.redis.read_only", read_only)
+        if prefix:
+            span.set_attribute("iok.redis.prefix", prefix)
+    token = otel_context.attach(trace.set_span_in_context(span))
+    return span, token
+
+
+def end_span(span: Span, exc: Optional[BaseException] = None, token: Optional[object] = None) -> None:
+    if token is not None:
+        otel_context.detach(token)  # type: ignore[arg-type]
+    if isinstance(exc, Exception) and span.is_recording():
+        span.set_attribute("error.type", type(exc).__qualname__)
+        span.record_exception(exc)
+        span.set_status(Status(StatusCode.ERROR, str(exc)))
+    span.end()
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from pydantic import Field
+from pydantic_settings import SettingsConfigDict
+
+from ..config.base import IOKSettings
+
+
+class TracingSettings(IOKSettings):
+    model_config = SettingsConfigDict(env_prefix="IOK_TRACING_")
+
+    # Redis spans are emitted only when this and IOKSettings.tracing_enabled are both on
+    redis_enabled: bool = True
+    redis_session_spans: bool = True
+    # db.query.text with arguments: off by default (cost, and values may be sensitive)
+    redis_record_arguments: bool = False
+    redis_max_query_length: int = Field(default=256, ge=16)
+    # Skip span creation when the parent span was not sampled (ParentBased sampling)
+    respect_parent_sampling: bool = True
+
+
+@lru_cache
+def tracing_settings() -> TracingSettings:
+    return TracingSettings()
@@ -1,17 +1,27 @@
 from __future__ import annotations
+import asyncio
 import datetime
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import timezone, timedelta
-from typing import Final
+from typing import Any, Final, Iterator, Literal, Optional
 
 UTC: Final = timezone.utc
 
+logger = logging.getLogger(__name__)
+
 def utcnow() -> datetime.datetime:
     """Return timezone-aware UTC datetime."""
     return datetime.datetime.now(UTC)
 
 def utcnow_timestamp() -> float:
     """Current Unix timestamp as float."""
-    return utcnow().timestamp()
+    return time.time()
 
 def iso_utcnow() -> str:
     """ISO-8601 string with +00:00."""
@@ -22,4 +32,271 @@ def iso_utcnow_minus_days(days: int) -> str:
     return (utcnow() - timedelta(days=days)).isoformat()
 
 def iso_utcnow_minus_hours(hours: int) -> str:
-    return (utcnow() - timedelta(hours=hours)).isoformat()
\ No newline at end of file
+    return (utcnow() - timedelta(hours=hours)).isoformat()
+
+
+# ─────────────────────── cached clock ───────────────────────
+
+
+class CachedClock:
+    """
+    Wall clock read from a snapshot refreshed every `tick` seconds.
+
+    Reading `timestamp` or `timestamp_ms` is an attribute load, with no
+    syscall per call. `iso` and `datetime` are built on the first read after
+    a tick and reused until the next, so an idle process pays one time()
+    call per tick and no formatting. Values are up to one tick old (longer if
+    the refreshing event loop is blocked), so use it for log lines, metrics
+    and coarse TTL math, not for ordering events.
+
+    Until start() is called (and after stop() or a fork) every read falls
+    back to the live clock, so the cached clock is always safe to use.
+    """
+
+    def __init__(self, tick: float = 0.01) -> None:
+        if tick <= 0:
+            raise ValueError("tick must be > 0")
+        self.tick = tick
+        self._running = False
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._ts = 0.0
+        self._ms = 0
+        self._formatted: tuple[float, datetime.datetime, str] = (-1.0, utcnow(), "")
+
+    def _refresh(self) -> None:
+        now = time.time()
+        # Assigned together; readers may see a mix of two adjacent ticks at worst
+        self._ts, self._ms = now, int(now * 1000)
+
+    def _format(self) -> tuple[float, datetime.datetime, str]:
+        formatted = self._formatted
+        ts = self._ts
+        if formatted[0] != ts:
+            dt = datetime.datetime.fromtimestamp(ts, UTC)
+            formatted = self._formatted = (ts, dt, dt.isoformat())
+        return formatted
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def timestamp(self) -> float:
+        return self._ts if self._running else time.time()
+
+    @property
+    def timestamp_ms(self) -> int:
+        return self._ms if self._running else int(time.time() * 1000)
+
+    @property
+    def iso(self) -> str:
+        return self._format()[2] if self._running else iso_utcnow()
+
+    @property
+    def datetime(self) -> datetime.datetime:
+        return self._format()[1] if self._running else utcnow()
+
+    def start(self, mode: Literal["loop", "thread"] = "loop") -> None:
+        """Refresh from the running event loop (call_later chain) or from a daemon thread."""
+        if self._running:
+            return
+        self._refresh()
+        if mode == "loop":
+            loop = asyncio.get_running_loop()
+            self._handle = loop.call_later(self.tick, self._on_tick, loop)
+        else:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._thread_main, name="iok-clock", daemon=True)
+            self._thread.start()
+        self._running = True
+
+    def _on_tick(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._refresh()
+        if self._running and not loop.is_closed():
+            self._handle = loop.call_later(self.tick, self._on_tick, loop)
+
+    def _thread_main(self) -> None:
+        while not self._stop.wait(self.tick):
+            self._refresh()
+
+    def stop(self) -> None:
+        self._running = False
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def _after_fork(self) -> None:
+        # Neither the refresh thread nor the parent's loop exists in the child
+        self._running = False
+        self._handle = None
+        self._thread = None
+        self._stop = threading.Event()
+
+
+clock = CachedClock()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=clock._after_fork)
+
+
+def cached_timestamp() -> float:
+    """Unix timestamp from the cached clock (live if it is not running)."""
+    return clock.timestamp
+
+def cached_iso_utcnow() -> str:
+    """Pre-formatted ISO-8601 string from the cached clock (live if it is not running)."""
+    return clock.iso
+
+
+# ─────────────────────── monotonic deadlines ───────────────────────
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """A point on the monotonic clock; immune to wall-clock jumps."""
+
+    at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Remaining seconds, capped at `cap` (e.g. a per-operation default)."""
+        left = self.remaining()
+        return left if cap is None else min(left, cap)
+
+    def earliest(self, other: Optional[Deadline]) -> Deadline:
+        return self if other is None or self.at <= other.at else other
+
+
+_deadline: ContextVar[Optional[Deadline]] = ContextVar("iok_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Deadline set by the innermost time_budget() of this context, if any."""
+    return _deadline.get()
+
+
+@contextmanager
+def time_budget(seconds: Optional[float] = None, *, deadline: Optional[Deadline] = None) -> Iterator[Deadline]:
+    """
+    Bound deadline-aware work in this context (e.g. one web request) by
+    `seconds` from now, or by `deadline`.
+
+    Nested budgets can only tighten the enclosing one. Tasks created inside
+    inherit it, as with any contextvar.
+    """
+    if deadline is None:
+        if seconds is None:
+            raise ValueError("time_budget needs seconds or a deadline")
+        deadline = Deadline.after(seconds)
+    effective = deadline.earliest(_deadline.get())
+    token = _deadline.set(effective)
+    try:
+        yield effective
+    finally:
+        _deadline.reset(token)
+
+
+# ─────────────────────── Redis clock offset ───────────────────────
+
+
+@dataclass(frozen=True)
+class ClockOffset:
+    offset: float  # seconds to add to the local clock to get the server's
+    rtt: float  # round trip of the sample the offset came from
+    sampled_at: float  # monotonic
+
+    @property
+    def uncertainty(self) -> float:
+        return self.rtt / 2
+
+
+class RedisClockOffset:
+    """
+    Estimates the offset between this host's clock and Redis `TIME`.
+
+    Each sync() takes `samples` TIME round trips and keeps the one with the
+    smallest RTT (NTP-style; the server's reading is assumed to fall at the
+    midpoint). After that, server_time() costs nothing: nodes that each
+    keep an estimate agree on "now" within their RTTs without a TIME call per
+    decision. start() re-syncs every `interval` seconds in the background.
+    """
+
+    def __init__(self, *, samples: int = 5, interval: float = 60.0, local: Optional[CachedClock] = None) -> None:
+        if samples < 1:
+            raise ValueError("samples must be >= 1")
+        self.samples = samples
+        self.interval = interval
+        self.local = local or clock
+        self.estimate: Optional[ClockOffset] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def sync(self, client: Any = None) -> ClockOffset:
+        """Measure against `client` (any redis-py asyncio client), or a RedisHandler session."""
+        if client is None:
+            from ..redis.handler import RedisHandler
+
+            async with RedisHandler.session() as client:
+                return await self.sync(client)
+
+        best: Optional[ClockOffset] = None
+        for _ in range(self.samples):
+            sent = time.time()
+            seconds, micros = await client.time()
+            received = time.time()
+            rtt = received - sent
+            if best is None or rtt < best.rtt:
+                server = int(seconds) + int(micros) / 1e6
+                best = ClockOffset(offset=server - (sent + received) / 2, rtt=rtt, sampled_at=time.monotonic())
+        assert best is not None
+        self.estimate = best
+        return best
+
+    @property
+    def offset(self) -> float:
+        return self.estimate.offset if self.estimate is not None else 0.0
+
+    def server_time(self) -> float:
+        """Estimated Redis server time (Unix seconds), from the cached local clock."""
+        return self.local.timestamp + self.offset
+
+    def server_time_ms(self) -> int:
+        return int(self.server_time() * 1000)
+
+    def start(self) -> asyncio.Task[None]:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Keep the previous estimate; clocks drift slowly
+                logger.warning("Redis clock offset sync failed", exc_info=True)
+            await asyncio.sleep(self.interval)
@@ -1,6 +1,7 @@
 from pathlib import Path
 
 import pytest
+import pytest_asyncio
 
 from iok_core.redis.settings import redis_settings
 
@@ -16,4 +17,38 @@ def reset_redis_singletons():
     yield
 
     globals()["_redis_settings_instance"] = None
-    globals()["_core_instance"] = None
\ No newline at end of file
+    globals()["_core_instance"] = None
+
+
+@pytest_asyncio.fixture
+async def fake_redis():
+    """In-memory Redis (with Lua) installed as the RedisHandler client."""
+    import fakeredis
+
+    from iok_core.redis.handler import RedisHandler
+
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    binary_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=False)
+    state = RedisHandler._registry.current()
+    state.clients.update({False: client, True: binary_client})
+    yield client
+    RedisHandler._registry.discard(state)
+    for monitor in state.monitors.values():
+        await monitor.stop()
+    await client.aclose()
+    await binary_client.aclose()
+
+
+@pytest.fixture
+def tracer_provider(monkeypatch):
+    """A local SDK TracerProvider wired into iok_core's Redis spans; the global provider is left untouched."""
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    from opentelemetry import trace
+
+    from iok_core.tracing import redis as redis_tracing
+
+    provider = sdk_trace.TracerProvider()
+    monkeypatch.setattr(trace, "get_tracer_provider", lambda: provider)
+    monkeypatch.setattr(redis_tracing, "_tracer", provider.get_tracer("iok_core.redis"))
+    return provider
@@ -0,0 +1,37 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative `-X importtime` budgets in ms (generous: CI machines are noisy).
+# python -m benchmarks reports the same numbers as import_ms.
+BUDGETS_MS = {
+    "iok_core": 100,
+    "iok_core.redis": 100,
+    "iok_core.cache": 100,
+    "iok_core.rate_limit": 100,
+    "iok_core.tracing": 100,
+    "iok_core.logging": 100,
+    "iok_core.utils": 100,
+    "iok_core.config": 1000,  # pydantic-settings
+}
+
+
+def _import_time_ms(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    pattern = re.compile(rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$", re.M)
+    match = pattern.search(result.stderr)
+    assert match is not None, f"no importtime line for {module}"
+    return int(match.group(1)) / 1000
+
+
+@pytest.mark.parametrize("module", list(BUDGETS_MS))
+def test_import_time_budget(module):
+    elapsed = min(_import_time_ms(module) for _ in range(3))
+    assert elapsed < BUDGETS_MS[module], f"import {module} took {elapsed:.1f}ms"
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from iok_core.rate_limit import RateLimiter
+from iok_core.redis import RedisHandler
+from iok_core.redis.exceptions import RedisError
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_decision_throughput():
+    """Prints decisions/s and p99 per-decision overhead against the configured Redis."""
+    limiter = RateLimiter(limit=10**9, window_seconds=1)
+    try:
+        await limiter.check("bench:warmup")
+    except RedisError as exc:
+        await RedisHandler.close()
+        pytest.skip(f"Redis not reachable: {exc}")
+
+    try:
+        n = 2000
+        latencies = []
+        start = time.perf_counter()
+        for i in range(n):
+            t0 = time.perf_counter()
+            decision = await limiter.check(f"bench:{i % 64}")
+            latencies.append(time.perf_counter() - t0)
+            assert decision.allowed
+        single_elapsed = time.perf_counter() - start
+
+        batch = [f"bench:{i}" for i in range(100)]
+        rounds = 50
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await limiter.check_many(batch)
+        batch_elapsed = time.perf_counter() - start
+
+        latencies.sort()
+        p50 = latencies[n // 2] * 1000
+        p99 = latencies[int(n * 0.99)] * 1000
+
+        print("\n=== RATE LIMIT BENCHMARK ===")
+        print(f"check():      {n / single_elapsed:,.0f} decisions/s  p50={p50:.3f}ms  p99={p99:.3f}ms")
+        print(f"check_many(): {rounds * len(batch) / batch_elapsed:,.0f} decisions/s (batches of {len(batch)})")
+        print("============================\n")
+    finally:
+        await RedisHandler.close()
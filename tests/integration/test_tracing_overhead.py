@@ -0,0 +1,54 @@
+import time
+
+import fakeredis
+import pytest
+from fakeredis.aioredis import FakeAsyncRedisConnection
+from redis.asyncio import ConnectionPool, Redis
+
+from iok_core.redis.metrics import InstrumentedRedis
+
+sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ParentBased  # noqa: E402
+
+
+async def _per_command(client: Redis, n: int) -> float:
+    await client.set("bench", "1")
+    start = time.perf_counter()
+    for _ in range(n):
+        await client.get("bench")
+    return (time.perf_counter() - start) / n
+
+
+@pytest.mark.asyncio
+async def test_tracing_overhead_per_command(tracer_provider):
+    """Prints per-command client overhead with tracing off/unsampled/recording (in-process server)."""
+    server = fakeredis.FakeServer()
+
+    def pool() -> ConnectionPool:
+        return ConnectionPool(connection_class=FakeAsyncRedisConnection, server=server, decode_responses=True)
+
+    plain = Redis.from_pool(pool())
+    traced = InstrumentedRedis.from_pool(pool())
+    traced.iok_metrics = False
+    traced.iok_tracing = True
+    off = InstrumentedRedis.from_pool(pool())
+    off.iok_metrics = False
+
+    n = 3000
+    try:
+        await _per_command(plain, 200)  # warm up
+        baseline = await _per_command(plain, n)
+        disabled = await _per_command(off, n)
+        with sdk_trace.TracerProvider(sampler=ParentBased(ALWAYS_OFF)).get_tracer("bench").start_as_current_span("parent"):
+            unsampled = await _per_command(traced, n)
+        recording = await _per_command(traced, n)
+    finally:
+        for client in (plain, traced, off):
+            await client.aclose()
+
+    print("\n=== TRACING OVERHEAD (per GET, in-process fakeredis) ===")
+    print(f"plain redis-py:        {baseline * 1e6:8.2f}µs")
+    print(f"tracing disabled:      {disabled * 1e6:8.2f}µs  (+{(disabled - baseline) * 1e6:.2f}µs)")
+    print(f"tracing, unsampled:    {unsampled * 1e6:8.2f}µs  (+{(unsampled - baseline) * 1e6:.2f}µs)")
+    print(f"tracing, recording:    {recording * 1e6:8.2f}µs  (+{(recording - baseline) * 1e6:.2f}µs)")
+    print("=========================================================\n")
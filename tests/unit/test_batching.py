@@ -0,0 +1,111 @@
+# tests/unit/test_batching.py
+import asyncio
+
+import pytest
+from redis.exceptions import ResponseError
+
+from iok_core.redis import AutoBatchingClient, RedisSessionConfig
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_share_one_pipeline(fake_redis):
+    batcher = AutoBatchingClient()
+    await fake_redis.mset({f"k{i}": str(i) for i in range(50)})
+
+    values = await asyncio.gather(*(batcher.get(f"k{i}") for i in range(50)))
+
+    assert values == [str(i) for i in range(50)]
+    assert batcher.stats.batches == 1
+    assert batcher.stats.coalesced_gets == 50
+
+
+@pytest.mark.asyncio
+async def test_order_preserved_within_batch(fake_redis):
+    batcher = AutoBatchingClient()
+
+    set_ok, value, expired, ttl = await asyncio.gather(
+        batcher.set("a", "1"),
+        batcher.get("a"),
+        batcher.expire("a", 30),
+        batcher.ttl("a"),
+    )
+
+    assert (set_ok, value, expired) == (True, "1", True)
+    assert 0 < ttl <= 30
+    assert batcher.stats.batches == 1
+
+
+@pytest.mark.asyncio
+async def test_max_batch_splits(fake_redis):
+    batcher = AutoBatchingClient(max_batch=10)
+
+    await asyncio.gather(*(batcher.incr("counter") for _ in range(25)))
+
+    assert await fake_redis.get("counter") == "25"
+    assert batcher.stats.batches == 3
+
+
+@pytest.mark.asyncio
+async def test_error_only_reaches_its_caller(fake_redis):
+    batcher = AutoBatchingClient()
+    await fake_redis.set("str", "x")
+
+    ok, bad = await asyncio.gather(
+        batcher.set("b", "2"),
+        batcher.hget("str", "field"),
+        return_exceptions=True,
+    )
+
+    assert ok is True
+    assert isinstance(bad, ResponseError)
+
+
+@pytest.mark.asyncio
+async def test_time_window_flush(fake_redis):
+    batcher = AutoBatchingClient(max_delay=0.01)
+
+    first = batcher.set("x", "1")
+    await asyncio.sleep(0)
+    second = batcher.get("x")
+
+    assert await asyncio.gather(first, second) == [True, "1"]
+    assert batcher.stats.batches == 1
+    await batcher.close()
+
+
+@pytest.mark.asyncio
+async def test_keys_scoped_by_config_prefix(fake_redis):
+    batcher = AutoBatchingClient(RedisSessionConfig(prefix="svc:"))
+
+    await asyncio.gather(batcher.set("a", "1"), batcher.mset({"b": "2"}), batcher.incr("n"))
+
+    assert await fake_redis.mget("svc:a", "svc:b", "svc:n") == ["1", "2", "1"]
+    assert await fake_redis.exists("a", "b", "n") == 0
+    assert await batcher.mget("a", "b") == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_resolves_callers(fake_redis):
+    batcher = AutoBatchingClient()
+
+    pending = asyncio.gather(batcher.get("a"), batcher.get("b"), return_exceptions=True)
+    await asyncio.sleep(0)  # flush scheduled the send task
+    for task in list(batcher._in_flight):
+        task.cancel()
+
+    results = await asyncio.wait_for(pending, timeout=1)
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cluster_folds_only_same_slot_gets(fake_redis, monkeypatch):
+    from iok_core.redis import batching
+
+    monkeypatch.setattr(batching, "RedisCluster", type(fake_redis))  # treat the client as a cluster
+    await fake_redis.mset({"{u}1": "a", "{u}2": "b", "other": "c"})
+    batcher = AutoBatchingClient()
+
+    values = await asyncio.gather(batcher.get("{u}1"), batcher.get("{u}2"), batcher.get("other"))
+
+    assert values == ["a", "b", "c"]
+    assert batcher.stats.coalesced_gets == 2  # "other" hashes to another slot
@@ -0,0 +1,22 @@
+# tests/unit/test_benchmarks.py
+import json
+
+from benchmarks.__main__ import main
+
+
+def test_benchmark_suite_smoke_run_emits_json(tmp_path):
+    out = tmp_path / "bench.json"
+    assert main(["--backend", "fakeredis", "--scale", "0.01", "--output", str(out)]) == 0
+
+    report = json.loads(out.read_text())
+    assert set(report) == {"meta", "backends", "logging", "import_ms"}
+    assert report["meta"]["python"]
+    fake = report["backends"]["fakeredis"]
+    assert set(fake) == {"session", "commands", "pipeline", "pool_exhaustion", "streams"}
+    assert fake["session"]["empty_session"]["ops"] > 0
+    assert set(fake["commands"]) == {"c1", "c8", "c64"}
+    assert fake["pool_exhaustion"]["concurrency"] == 2 * fake["pool_exhaustion"]["max_connections"]
+    assert fake["streams"]["consume_c4"]["messages_per_sec"] > 0
+    assert set(report["logging"]) == {"inline", "queue"}
+    assert set(report["import_ms"]) == {"iok_core", "iok_core.redis", "iok_core.cache", "iok_core.rate_limit",
+                                        "iok_core.tracing", "iok_core.logging", "iok_core.utils", "iok_core.config"}
@@ -0,0 +1,106 @@
+# tests/unit/test_cache.py
+import asyncio
+
+import pytest
+
+from iok_core.cache import LocalCache, TwoTierCache
+from iok_core.redis.handler import RedisSessionConfig
+
+
+async def _wait_coherent(cache: TwoTierCache) -> None:
+    cache.start()
+    for _ in range(100):
+        if cache._coherent:
+            return
+        await asyncio.sleep(0.01)
+    pytest.fail("invalidation listener never subscribed")
+
+
+def test_local_cache_lru_eviction():
+    local = LocalCache(max_entries=2, ttl_seconds=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+
+    assert "b" not in local
+    assert local.get("a") == (True, 1)
+    assert local.stats.evictions == 1
+
+
+def test_local_cache_ttl_expiry():
+    local = LocalCache(max_entries=10, ttl_seconds=0)
+    local.set("a", 1)
+
+    assert local.get("a") == (False, None)
+    assert local.stats.expirations == 1
+    assert local.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_local_tier_serves_repeat_reads(fake_redis):
+    cache = TwoTierCache(RedisSessionConfig(prefix="cfg:", health_check=False), invalidation="none")
+    await fake_redis.set("cfg:tenant", "v1")
+
+    assert await cache.get("tenant") == "v1"
+    await fake_redis.set("cfg:tenant", "v2")  # bypasses the cache, so no invalidation
+    assert await cache.get("tenant") == "v1"
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_pubsub_invalidation_across_instances(fake_redis):
+    config = RedisSessionConfig(prefix="cfg:", default_ttl=60, health_check=False)
+    reader = TwoTierCache(config, invalidation="pubsub")
+    writer = TwoTierCache(config, invalidation="pubsub")
+    await _wait_coherent(reader)
+
+    await writer.set("tenant", "v1")
+    assert await reader.get("tenant") == "v1"
+    assert 0 < await fake_redis.ttl("cfg:tenant") <= 60
+
+    await writer.set("tenant", "v2")
+    for _ in range(100):
+        if "cfg:tenant" not in reader._local:
+            break
+        await asyncio.sleep(0.01)
+
+    assert await reader.get("tenant") == "v2"
+    assert reader.stats.invalidations >= 1
+
+    await writer.delete("tenant")
+    await asyncio.sleep(0.05)
+    assert await reader.get("tenant") is None
+
+    await reader.close()
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_local_tier_bypassed_until_listener_ready(fake_redis):
+    cache = TwoTierCache(RedisSessionConfig(prefix="cfg:", health_check=False), invalidation="pubsub")
+    await fake_redis.set("cfg:k", "v")
+
+    assert await cache.get("k") == "v"  # listener not subscribed yet
+
+    assert cache.stats.size == 0
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_local_entry_capped_at_redis_ttl(fake_redis):
+    config = RedisSessionConfig(prefix="cfg:", health_check=False)
+    cache = TwoTierCache(config, invalidation="pubsub", local_ttl_seconds=30)
+    await _wait_coherent(cache)
+
+    await fake_redis.set("cfg:short", "v", px=50)
+    assert await cache.get("short") == "v"
+    assert await cache.get("short") == "v"  # local hit while the key lives
+    assert cache.stats.hits == 1
+
+    await asyncio.sleep(0.1)  # expired in Redis; nothing is published
+    assert await cache.get("short") is None
+    await cache.close()
@@ -0,0 +1,115 @@
+# tests/unit/test_circuit_breaker.py
+import pytest
+
+from iok_core.redis.circuit_breaker import CircuitBreaker
+from iok_core.redis.exceptions import RedisCircuitBreakerOpen, RedisConnectionError
+from iok_core.redis.handler import RedisHandler, RedisSessionConfig
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock: FakeClock, **kwargs) -> CircuitBreaker:
+    defaults = dict(min_calls=4, failure_rate_threshold=0.5, open_seconds=10, half_open_max_calls=2)
+    defaults.update(kwargs)
+    return CircuitBreaker(clock=clock, **defaults)
+
+
+def test_opens_on_failure_rate_and_rejects_without_io():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.on_success(0.001)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.on_failure()
+
+    assert breaker.state == "open"
+    clock.now += 3
+    with pytest.raises(RedisCircuitBreakerOpen) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after_seconds == 7
+    assert breaker.stats().rejections == 1
+
+
+def test_min_calls_required_before_opening():
+    breaker = make_breaker(FakeClock())
+    for _ in range(3):
+        breaker.before_call()
+        breaker.on_failure()
+    assert breaker.state == "closed"
+
+
+def test_old_failures_roll_out_of_window():
+    clock = FakeClock()
+    breaker = make_breaker(clock, window_seconds=10)
+    for _ in range(3):
+        breaker.on_failure()
+    clock.now += 11
+    breaker.on_failure()
+    assert breaker.state == "closed"
+
+
+def test_slow_calls_open_breaker():
+    breaker = make_breaker(FakeClock(), slow_call_seconds=0.5, slow_call_rate_threshold=0.75)
+    for _ in range(4):
+        breaker.before_call()
+        breaker.on_success(1.0)
+    assert breaker.state == "open"
+
+
+def test_half_open_bounds_probes_and_closes_on_success():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    transitions = []
+    breaker.add_listener(lambda old, new: transitions.append(f"{old}->{new}"))
+    for _ in range(4):
+        breaker.on_failure()
+
+    clock.now += 10
+    breaker.before_call()
+    breaker.before_call()
+    with pytest.raises(RedisCircuitBreakerOpen):
+        breaker.before_call()
+
+    breaker.on_success(0.001)
+    breaker.on_success(0.001)
+
+    assert breaker.state == "closed"
+    assert transitions == ["closed->open", "open->half_open", "half_open->closed"]
+    assert breaker.stats().transitions["closed->open"] == 1
+
+
+def test_half_open_failure_reopens():
+    clock = FakeClock()
+    breaker = make_breaker(clock)
+    for _ in range(4):
+        breaker.on_failure()
+    clock.now += 10
+    breaker.before_call()
+    breaker.on_failure()
+    assert breaker.state == "open"
+
+
+@pytest.mark.asyncio
+async def test_session_fails_fast_once_open(fake_redis):
+    breaker = RedisHandler._registry.current().breaker = CircuitBreaker(min_calls=2, open_seconds=30)
+    fake_redis.connection_pool.connection_kwargs["server"].connected = False
+    config = RedisSessionConfig(health_check=False)
+
+    for _ in range(2):
+        with pytest.raises((RedisConnectionError, RedisCircuitBreakerOpen)):
+            async with RedisHandler.session(config) as client:
+                await client.get("k")
+
+    assert breaker.state == "open"
+    with pytest.raises(RedisCircuitBreakerOpen):
+        async with RedisHandler.session(config) as client:
+            pytest.fail("session body must not run while the breaker is open")
@@ -0,0 +1,83 @@
+# tests/unit/test_codec.py
+from dataclasses import dataclass
+
+import pytest
+from pydantic import BaseModel
+
+from iok_core.redis import CompressedCodec, JsonCodec, RawCodec, RedisSerializationError, TypedStore
+from iok_core.redis.handler import RedisSessionConfig
+
+
+@dataclass
+class Tenant:
+    id: int
+    name: str
+
+
+class TenantModel(BaseModel):
+    id: int
+    name: str
+
+
+def test_json_codec_dataclass_round_trip():
+    codec = JsonCodec(Tenant)
+    assert codec.decode(codec.encode(Tenant(1, "a"))) == Tenant(1, "a")
+
+
+def test_json_codec_pydantic_round_trip():
+    codec = JsonCodec(TenantModel)
+    data = codec.encode(TenantModel(id=1, name="a"))
+    assert isinstance(data, bytes)
+    assert codec.decode(memoryview(data)) == TenantModel(id=1, name="a")
+
+
+def test_json_codec_errors_raise_serialization_error():
+    with pytest.raises(RedisSerializationError):
+        JsonCodec().encode(object())
+    with pytest.raises(RedisSerializationError):
+        JsonCodec(TenantModel).decode(b'{"id": "not-an-int"}')
+    with pytest.raises(RedisSerializationError):
+        JsonCodec().decode(b"\xff not json")
+
+
+def test_compressed_codec_threshold():
+    codec = CompressedCodec(RawCodec(), threshold=100)
+    small, large = b"x" * 10, b"y" * 10_000
+
+    assert codec.encode(small)[:1] == b"\x00"
+    assert codec.encode(large)[:1] == b"\x01"
+    assert len(codec.encode(large)) < len(large)
+    assert codec.decode(codec.encode(small)) == small
+    assert codec.decode(codec.encode(large)) == large
+
+    with pytest.raises(RedisSerializationError):
+        codec.decode(b"\x01garbage")
+
+
+@pytest.mark.asyncio
+async def test_typed_store_uses_binary_session(fake_redis):
+    store = TypedStore(
+        CompressedCodec(JsonCodec(Tenant), threshold=16),
+        RedisSessionConfig(prefix="tenant:", default_ttl=60, health_check=False),
+    )
+
+    await store.set("1", Tenant(1, "a" * 100))
+    await store.set("2", Tenant(2, "b"))
+
+    assert await store.get("1") == Tenant(1, "a" * 100)
+    assert await store.mget(["1", "2", "3"]) == [Tenant(1, "a" * 100), Tenant(2, "b"), None]
+    assert 0 < await fake_redis.ttl("tenant:1") <= 60
+    assert await store.delete("1", "2") == 2
+
+
+@pytest.mark.asyncio
+async def test_typed_store_rejects_a_text_client(fake_redis):
+    from iok_core.redis.handler import RedisHandler
+
+    store = TypedStore(JsonCodec(Tenant))
+    await store.set("1", Tenant(1, "a"))
+    state = RedisHandler._registry.current()
+    state.clients[True] = state.clients[False]  # a decode_responses=True client in the binary slot
+
+    with pytest.raises(RedisSerializationError):
+        await store.get("1")
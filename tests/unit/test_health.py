@@ -0,0 +1,54 @@
+# tests/unit/test_health.py
+import asyncio
+
+import pytest
+
+from iok_core.redis.exceptions import RedisConnectionError
+from iok_core.redis.handler import RedisHandler, RedisSessionConfig
+from iok_core.redis.health import HealthMonitor
+
+
+@pytest.mark.asyncio
+async def test_probe_tracks_latency_and_failures(fake_redis):
+    monitor = HealthMonitor(fake_redis, alpha=0.5)
+
+    assert await monitor.probe()
+    assert monitor.latency_ewma is not None and monitor.latency_ewma > 0
+
+    fake_redis.connection_pool.connection_kwargs["server"].connected = False
+    assert not await monitor.probe()
+    assert monitor.consecutive_failures == 1
+    assert monitor.last_error is not None
+
+    fake_redis.connection_pool.connection_kwargs["server"].connected = True
+    assert await monitor.probe()
+    assert monitor.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_trigger_probes_immediately(fake_redis):
+    monitor = HealthMonitor(fake_redis, interval=60)
+    monitor.start()
+    await asyncio.sleep(0)
+
+    monitor.trigger()
+    await asyncio.sleep(0.05)
+
+    assert monitor.last_check is not None
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_session_uses_cached_health_without_ping(fake_redis, mocker):
+    monitor = HealthMonitor(fake_redis)
+    RedisHandler._registry.current().monitors[False] = monitor
+    ping = mocker.spy(fake_redis, "ping")
+
+    async with RedisHandler.session(RedisSessionConfig(circuit_breaker=False)) as client:
+        await client.set("k", "v")
+    assert ping.call_count == 0
+
+    monitor.healthy = False
+    with pytest.raises(RedisConnectionError):
+        async with RedisHandler.session(RedisSessionConfig(circuit_breaker=False)):
+            pytest.fail("unhealthy session must not run")
@@ -0,0 +1,83 @@
+# tests/unit/test_import_time.py
+import subprocess
+import sys
+
+import pytest
+
+# Import-time budgets live in tests/integration/test_import_time_budget.py; here we only check
+# that importing a package does not load its submodules or heavy dependencies.
+HEAVY = ("redis", "opentelemetry", "structlog", "pydantic_settings", "orjson")
+PACKAGES = {
+    "iok_core": (),
+    "iok_core.redis": (),
+    "iok_core.cache": (),
+    "iok_core.rate_limit": (),
+    "iok_core.tracing": (),
+    "iok_core.logging": (),
+    "iok_core.utils": (),
+    "iok_core.config": ("iok_core.config.base", "pydantic_settings"),  # settings base is the package API
+}
+
+
+def _loaded_after_import(module: str) -> set[str]:
+    code = (
+        "import sys\n"
+        f"import {module}\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return set(out.split())
+
+
+@pytest.mark.parametrize("module", list(PACKAGES))
+def test_package_import_defers_submodules(module):
+    loaded = _loaded_after_import(module)
+    eager = {
+        m for m in loaded
+        if (m.startswith("iok_core.") and m not in {"iok_core.utils", "iok_core.utils.lazy", module})
+        or m.split(".")[0] in HEAVY
+    }
+    allowed = {m for m in eager if any(m == a or m.startswith(a + ".") for a in PACKAGES[module])}
+    assert eager == allowed, f"import {module} eagerly loaded {sorted(eager - allowed)}"
+
+
+def test_package_imports_are_lazy_and_side_effect_free():
+    code = (
+        "import logging, sys\n"
+        "import iok_core, iok_core.redis, iok_core.cache, iok_core.rate_limit, iok_core.tracing, iok_core.logging\n"
+        "heavy = [m for m in ('redis', 'opentelemetry', 'structlog', 'pydantic_settings') if m in sys.modules]\n"
+        "print(heavy, logging.getLogger().handlers, logging.getLogger().level)\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+    assert out == "[] [] 30"
+
+
+def test_lazy_attribute_access():
+    import iok_core
+    import iok_core.redis
+
+    from iok_core.redis.handler import RedisHandler
+
+    assert iok_core.RedisHandler is RedisHandler
+    assert iok_core.redis.RedisHandler is RedisHandler
+    assert "RedisHandler" in dir(iok_core.redis)
+    with pytest.raises(AttributeError):
+        iok_core.redis.DoesNotExist  # noqa: B018
+
+
+def test_configure_logging_is_idempotent():
+    import logging
+
+    from iok_core.logging import LoggingSettings, configure_logging
+
+    settings = LoggingSettings(queue_enabled=True)
+    root = logging.getLogger()
+    before = list(root.handlers)
+    try:
+        configure_logging(settings)
+        configure_logging(settings)
+        added = [h for h in root.handlers if h not in before]
+        assert len(added) == 1
+    finally:
+        configure_logging(LoggingSettings(), force=True)
+    assert root.handlers == before
@@ -0,0 +1,110 @@
+# tests/unit/test_logging.py
+import io
+import logging
+import threading
+
+import orjson
+import structlog
+
+from iok_core.logging.queue import OrjsonRenderer, QueueLogHandler
+
+
+class _GatedStream(io.BytesIO):
+    """Stream whose writes wait until the test opens the gate."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+
+    def write(self, data):
+        self.gate.wait(5)
+        return super().write(data)
+
+
+def _logger(handler):
+    logger = logging.getLogger(f"iok_core.tests.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_records_written_as_json_lines():
+    stream = io.BytesIO()
+    handler = QueueLogHandler(stream, close_stream=False)
+    logger = _logger(handler)
+
+    logger.info(orjson.dumps({"event": "pre-rendered"}))
+    logger.warning("plain %s record", "stdlib")
+    handler.close()
+
+    first, second = [orjson.loads(line) for line in stream.getvalue().splitlines()]
+    assert first == {"event": "pre-rendered"}
+    assert second["event"] == "plain stdlib record"
+    assert second["level"] == "warning"
+    assert handler.stats.written == 2
+    assert handler.stats.dropped == 0
+
+
+
+def test_malformed_record_does_not_kill_writer():
+    stream = io.BytesIO()
+    handler = QueueLogHandler(stream, close_stream=False)
+    logger = _logger(handler)
+
+    logger.info("%d", "not a number")
+    logger.info("still logging")
+    handler.close()
+
+    bad, good = [orjson.loads(line) for line in stream.getvalue().splitlines()]
+    assert bad["event"] == "'%d'"
+    assert "TypeError" in bad["render_error"]
+    assert good["event"] == "still logging"
+    assert handler.stats.written == 2
+    assert handler.stats.render_errors == 1
+
+def test_drop_policy_counts_dropped_records():
+    stream = _GatedStream()
+    handler = QueueLogHandler(stream, maxsize=2, policy="drop")
+    logger = _logger(handler)
+
+    for i in range(20):
+        logger.info("record %d", i)
+    stats = handler.stats
+    assert stats.dropped > 0
+    assert stats.enqueued + stats.dropped == 20
+    assert stats.queue_depth <= 2
+
+    stream.gate.set()
+    handler.close()
+    assert handler.stats.written == stats.enqueued
+
+
+def test_block_policy_times_out_then_drops():
+    stream = _GatedStream()
+    handler = QueueLogHandler(stream, maxsize=1, policy="block", block_timeout=0.01)
+    logger = _logger(handler)
+
+    for i in range(5):
+        logger.info("record %d", i)
+    assert handler.stats.dropped >= 1
+
+    stream.gate.set()
+    handler.close()
+
+
+def test_orjson_renderer_through_structlog():
+    stream = io.BytesIO()
+    handler = QueueLogHandler(stream)
+    stdlib_logger = _logger(handler)
+    log = structlog.wrap_logger(
+        stdlib_logger,
+        processors=[structlog.processors.add_log_level, OrjsonRenderer()],
+        wrapper_class=structlog.stdlib.BoundLogger,
+    )
+
+    log.info("hello", user="x", count=3)
+    handler.close()
+
+    assert orjson.loads(stream.getvalue()) == {"count": 3, "event": "hello", "level": "info", "user": "x"}
+    assert stream.getvalue().index(b"count") < stream.getvalue().index(b"user")  # sort_keys
@@ -0,0 +1,94 @@
+# tests/unit/test_metrics.py
+import fakeredis
+import pytest
+import pytest_asyncio
+from fakeredis.aioredis import FakeAsyncRedisConnection
+from redis.exceptions import MaxConnectionsError, ResponseError
+
+from iok_core.redis.metrics import (
+    InstrumentedConnectionPool,
+    InstrumentedRedis,
+    LatencyHistogram,
+    redis_metrics,
+)
+from iok_core.redis.handler import RedisHandler
+from iok_core.redis.settings import RedisSettings
+
+
+@pytest_asyncio.fixture
+async def instrumented(request):
+    redis_metrics.reset()
+    pool = InstrumentedConnectionPool(
+        connection_class=FakeAsyncRedisConnection,
+        server=fakeredis.FakeServer(),
+        host=request.node.name,
+        decode_responses=True,
+        max_connections=2,
+    )
+    client = InstrumentedRedis.from_pool(pool)
+    yield client
+    await client.aclose()
+    redis_metrics.reset()
+
+
+def test_histogram_buckets():
+    hist = LatencyHistogram(bounds=(0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.002, 0.003, 0.05, 3.0):
+        hist.observe(seconds)
+    assert hist.counts == [1, 2, 1, 1]
+    assert hist.count == 5
+    assert hist.quantile(0.5) == 0.01
+    assert hist.quantile(1.0) == float("inf")
+
+
+@pytest.mark.asyncio
+async def test_commands_and_errors_recorded(instrumented):
+    await instrumented.set("a", "1")
+    await instrumented.get("a")
+    await instrumented.get("a")
+    with pytest.raises(ResponseError):
+        await instrumented.lpush("a", "x")
+    pipe = instrumented.pipeline(transaction=False)
+    pipe.get("a").get("b")
+    await pipe.execute()
+
+    assert redis_metrics.commands["GET"].count == 2
+    assert redis_metrics.commands["SET"].count == 1
+    assert redis_metrics.commands["PIPELINE"].count == 1
+    assert redis_metrics.errors == {"ResponseError": 1}
+
+
+@pytest.mark.asyncio
+async def test_pool_connects_and_usage(instrumented):
+    await instrumented.ping()
+    await instrumented.ping()
+    assert redis_metrics.connects == 1
+    assert redis_metrics.checkouts == 2
+    assert redis_metrics.checkout_wait.count == 2
+
+    pool = instrumented.connection_pool
+    held = [await pool.get_connection(), await pool.get_connection()]
+    usage = next(u for u in redis_metrics.pool_usage() if u["pool"] == pool.name)
+    assert usage == {"pool": pool.name, "in_use": 2, "idle": 0, "max": 2}
+
+    with pytest.raises(MaxConnectionsError):
+        await pool.get_connection()
+    assert redis_metrics.pool_exhausted == 1
+
+    for conn in held:
+        await conn.disconnect()  # dropped sockets
+        await pool.release(conn)
+    await instrumented.ping()
+    await instrumented.ping()
+    assert (redis_metrics.connects, redis_metrics.reconnects) == (2, 1)
+
+
+@pytest.mark.asyncio
+async def test_handler_uses_instrumented_classes():
+    client, _ = await RedisHandler._build_topology(RedisSettings(), metrics=True)
+    plain, _ = await RedisHandler._build_topology(RedisSettings())
+    assert isinstance(client, InstrumentedRedis)
+    assert isinstance(client.connection_pool, InstrumentedConnectionPool)
+    assert type(plain) is not InstrumentedRedis
+    await client.aclose()
+    await plain.aclose()
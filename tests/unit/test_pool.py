@@ -0,0 +1,194 @@
+# tests/unit/test_pool.py
+import asyncio
+
+import fakeredis
+import pytest
+import pytest_asyncio
+from fakeredis.aioredis import FakeAsyncRedisConnection
+
+from iok_core.redis.circuit_breaker import CircuitBreaker
+from iok_core.redis.exceptions import RedisDeadlineExceeded, RedisPoolExhausted
+from iok_core.redis.handler import RedisHandler, RedisSessionConfig
+from iok_core.redis.metrics import InstrumentedConnectionPool, InstrumentedRedis, redis_metrics
+from iok_core.redis.pool import AdaptiveConnectionPool, InstrumentedAdaptivePool
+from iok_core.redis.settings import RedisSettings
+
+
+def make_pool(request, **kwargs):
+    kwargs.setdefault("max_connections", 2)
+    return AdaptiveConnectionPool(
+        connection_class=FakeAsyncRedisConnection,
+        server=fakeredis.FakeServer(),
+        host=request.node.name,
+        decode_responses=True,
+        **kwargs,
+    )
+
+
+@pytest_asyncio.fixture
+async def pool(request):
+    pool = make_pool(request, checkout_timeout=0.2)
+    yield pool
+    await pool.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_grows_on_demand_and_reuses(pool):
+    first = await pool.get_connection()
+    assert pool.size == 1
+    await pool.release(first)
+    assert await pool.get_connection() is first  # idle connection reused, none opened
+    second = await pool.get_connection()
+    assert pool.stats.opened == 2
+    assert pool.size == 2
+    for conn in (first, second):
+        await pool.release(conn)
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_in_order(pool):
+    held = [await pool.get_connection(), await pool.get_connection()]
+    served = []
+
+    async def waiter(n):
+        conn = await pool.get_connection()
+        served.append(n)
+        await asyncio.sleep(0.01)
+        await pool.release(conn)
+
+    tasks = [asyncio.create_task(waiter(n)) for n in range(4)]
+    await asyncio.sleep(0.01)
+    assert pool.waiting == 4
+    assert not pool.can_get_connection()
+
+    for conn in held:
+        await pool.release(conn)
+    await asyncio.gather(*tasks)
+
+    assert served == [0, 1, 2, 3]
+    assert pool.size == 2  # waiters got handed existing connections
+    assert pool.stats.waited == 4
+    assert pool.stats.peak_waiters == 4
+
+
+@pytest.mark.asyncio
+async def test_checkout_timeout_raises_backpressure(pool):
+    held = [await pool.get_connection(), await pool.get_connection()]
+    with pytest.raises(RedisPoolExhausted) as info:
+        await pool.get_connection()
+    assert 0.15 < info.value.waited_seconds < 1.0
+    assert info.value.max_connections == 2
+    assert pool.stats.timeouts == 1
+    assert pool.waiting == 0
+
+    with pytest.raises(RedisPoolExhausted):
+        await pool.get_connection(timeout=0.01)
+
+    for conn in held:
+        await pool.release(conn)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue(pool):
+    held = [await pool.get_connection(), await pool.get_connection()]
+    task = asyncio.create_task(pool.get_connection())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert pool.waiting == 0
+
+    await pool.release(held[0])
+    assert pool._available_connections == [held[0]]  # not handed to the cancelled waiter
+    await pool.release(held[1])
+
+
+@pytest.mark.asyncio
+async def test_release_without_event_dispatcher(pool):
+    pool._event_dispatcher = None
+    conn = await pool.get_connection()
+    await pool.release(conn)
+    assert pool._available_connections == [conn]
+
+
+@pytest.mark.asyncio
+async def test_idle_connections_reaped_down_to_min(request):
+    pool = make_pool(request, max_connections=5, min_connections=2, idle_seconds=0.05, reap_interval=0.02)
+    try:
+        burst = [await pool.get_connection() for _ in range(5)]
+        for conn in burst:
+            await pool.release(conn)
+        assert pool.size == 5
+
+        await asyncio.sleep(0.2)
+        assert pool.size == 2
+        assert pool.stats.reaped == 3
+        # The survivors are the most recently released
+        assert pool._available_connections == burst[-2:]
+    finally:
+        await pool.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_session_maps_saturation_without_tripping_breaker(request):
+    redis_metrics.reset()
+    pool = InstrumentedAdaptivePool(
+        connection_class=FakeAsyncRedisConnection,
+        server=fakeredis.FakeServer(),
+        host=request.node.name,
+        decode_responses=True,
+        max_connections=1,
+        checkout_timeout=0.05,
+    )
+    client = InstrumentedRedis.from_pool(pool)
+    state = RedisHandler._registry.current()
+    state.clients[False] = client
+    state.breaker = CircuitBreaker(min_calls=1)
+    held = await pool.get_connection()
+    try:
+        with pytest.raises(RedisPoolExhausted):
+            async with RedisHandler.session(RedisSessionConfig(health_check=False)) as redis:
+                await redis.ping()
+        assert state.breaker.state == "closed"
+        assert redis_metrics.pool_exhausted == 1
+    finally:
+        await pool.release(held)
+        RedisHandler._registry.discard(state)
+        await client.aclose()
+        redis_metrics.reset()
+
+
+
+@pytest.mark.asyncio
+async def test_checkout_wait_bounded_by_session_deadline(request):
+    pool = make_pool(request, max_connections=1, checkout_timeout=5)
+    client = InstrumentedRedis.from_pool(pool)
+    state = RedisHandler._registry.current()
+    state.clients[False] = client
+    held = await pool.get_connection()
+    try:
+        with pytest.raises(RedisDeadlineExceeded):
+            async with RedisHandler.session(RedisSessionConfig(health_check=False, timeout=0.05)) as redis:
+                await redis.ping()
+        assert pool.waiting == 0
+        await pool.release(held)
+        assert pool._available_connections == [held]
+    finally:
+        RedisHandler._registry.discard(state)
+        await client.aclose()
+
+@pytest.mark.asyncio
+async def test_build_pool_adaptive_mode():
+    settings = RedisSettings(
+        tls_enabled=False,
+        pool_mode="adaptive",
+        min_connections=3,
+        pool_checkout_timeout_seconds=0.5,
+        pool_idle_seconds=30,
+    )
+    pool = await RedisHandler._build_pool(settings, pool_class=RedisHandler._pool_class(settings, metrics=False))
+    assert isinstance(pool, AdaptiveConnectionPool)
+    assert (pool.min_connections, pool.checkout_timeout, pool.idle_seconds) == (3, 0.5, 30)
+    assert "min_connections" not in pool.connection_kwargs
+    assert RedisHandler._pool_class(settings, metrics=True) is InstrumentedAdaptivePool
+    assert RedisHandler._pool_class(RedisSettings(), metrics=True) is InstrumentedConnectionPool
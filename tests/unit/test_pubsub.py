@@ -0,0 +1,149 @@
+# tests/unit/test_pubsub.py
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from iok_core.redis.pubsub import PubSubHub, SlowConsumerError, Subscription
+
+
+@pytest_asyncio.fixture
+async def hub(fake_redis):
+    hub = PubSubHub(shards=2, queue_size=10)
+    yield hub
+    await hub.close()
+
+
+async def _publish_until(fake_redis, channel, data, sub, timeout=2.0):
+    """Publish until `sub` receives something (the shard may still be subscribing)."""
+    async def receive():
+        while True:
+            await fake_redis.publish(channel, data)
+            try:
+                return await asyncio.wait_for(sub.get(), 0.05)
+            except asyncio.TimeoutError:
+                continue
+    return await asyncio.wait_for(receive(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_subscribers_share_one_connection_per_shard(fake_redis, hub):
+    subs = [await hub.subscribe("news") for _ in range(50)]
+    await hub.wait_subscribed()
+
+    assert await fake_redis.publish("news", "hello") == 1  # one server-side subscriber
+    for sub in subs:
+        message = await asyncio.wait_for(sub.get(), 1)
+        assert (message.channel, message.data) == ("news", "hello")
+    assert hub.subscriber_count("news") == 50
+    assert hub.stats.messages == 1 and hub.stats.delivered == 50
+
+
+@pytest.mark.asyncio
+async def test_refcounted_unsubscribe(fake_redis, hub):
+    first = await hub.subscribe("alerts")
+    second = await hub.subscribe("alerts")
+    await hub.wait_subscribed()
+
+    await first.close()
+    assert (await fake_redis.pubsub_numsub("alerts"))[0][1] == 1
+    await second.close()
+    assert (await fake_redis.pubsub_numsub("alerts"))[0][1] == 0
+    assert hub.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_pattern_subscription(fake_redis, hub):
+    async with await hub.psubscribe("user:*") as sub:
+        message = await _publish_until(fake_redis, "user:42", "updated", sub)
+    assert (message.channel, message.pattern, message.data) == ("user:42", "user:*", "updated")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("policy,expected", [("drop_oldest", ["2", "3", "4"]), ("drop_newest", ["0", "1", "2"])])
+async def test_slow_consumer_drop_policies(fake_redis, hub, policy, expected):
+    sub = await hub.subscribe("ticks", maxsize=3, policy=policy)
+    await hub.wait_subscribed()
+    for i in range(5):
+        await fake_redis.publish("ticks", str(i))
+    await asyncio.sleep(0.05)
+
+    assert [(await sub.get()).data for _ in range(3)] == expected
+    assert sub.dropped == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_close_policy_spares_others(fake_redis, hub):
+    slow = await hub.subscribe("ticks", maxsize=2, policy="close")
+    fast = await hub.subscribe("ticks", maxsize=100)
+    await hub.wait_subscribed()
+    for i in range(5):
+        await fake_redis.publish("ticks", str(i))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(SlowConsumerError):
+        await slow.get()
+    assert [(await fast.get()).data for _ in range(5)] == ["0", "1", "2", "3", "4"]
+    assert hub.stats.slow_closed == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_close_unsubscribes_last_subscriber(fake_redis, hub):
+    slow = await hub.subscribe("ticks", maxsize=2, policy="close")
+    await hub.wait_subscribed()
+    for i in range(5):
+        await fake_redis.publish("ticks", str(i))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(SlowConsumerError):
+        await slow.get()
+    assert "ticks" not in hub._shard("ticks").channels
+    assert (await fake_redis.pubsub_numsub("ticks"))[0][1] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_subscribe_is_not_left_registered(fake_redis, hub):
+    await hub.subscribe("alerts")
+    await hub.wait_subscribed()
+    shard = hub._shard("alerts")
+
+    async def broken(*args, **kwargs):
+        raise ConnectionError("connection reset")
+
+    shard._send = broken
+    with pytest.raises(ConnectionError):
+        await shard.add(Subscription(hub, "other", False, 10, "drop_oldest"))
+    assert "other" not in shard.channels
+    assert hub.subscriber_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_resubscribes_after_connection_loss(fake_redis, hub):
+    sub = await hub.subscribe("events")
+    await hub.wait_subscribed()
+    shard = hub._shard("events")
+
+    async def broken(*args, **kwargs):
+        raise ConnectionError("connection reset")
+
+    shard.pubsub.get_message = broken
+    await asyncio.sleep(0.2)
+    await hub.wait_subscribed()
+
+    message = await _publish_until(fake_redis, "events", "after", sub)
+    assert message.data == "after"
+    assert hub.stats.reconnects >= 1
+
+
+@pytest.mark.asyncio
+async def test_shared_hub_closed_with_handler(fake_redis):
+    from iok_core.redis.handler import RedisHandler
+
+    hub = PubSubHub.shared()
+    assert PubSubHub.shared() is hub
+    sub = await hub.subscribe("x")
+    await RedisHandler.close()
+
+    assert hub.closed
+    with pytest.raises(StopAsyncIteration):
+        await sub.get()
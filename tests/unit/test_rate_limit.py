@@ -0,0 +1,148 @@
+# tests/unit/test_rate_limit.py
+import asyncio
+
+import pytest
+
+from iok_core.rate_limit import LeasedRateLimiter, RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_up_to_capacity(fake_redis):
+    limiter = RateLimiter(limit=3, window_seconds=60, algorithm="token_bucket")
+
+    decisions = [await limiter.check("tenant-a") for _ in range(4)]
+
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert decisions[2].remaining == 0
+    assert decisions[3].retry_after > 0
+    assert await fake_redis.exists("ratelimit:tenant-a")
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_denies_over_limit(fake_redis):
+    limiter = RateLimiter(limit=2, window_seconds=60, algorithm="sliding_window")
+
+    decisions = [await limiter.check("tenant-b") for _ in range(3)]
+
+    assert [d.allowed for d in decisions] == [True, True, False]
+    assert 0 < decisions[2].retry_after <= 60
+
+
+@pytest.mark.asyncio
+async def test_keys_are_independent(fake_redis):
+    limiter = RateLimiter(limit=1, window_seconds=60)
+
+    assert (await limiter.check("a")).allowed
+    assert not (await limiter.check("a")).allowed
+    assert (await limiter.check("b")).allowed
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", ["token_bucket", "sliding_window"])
+async def test_check_many_single_pipeline(fake_redis, algorithm):
+    limiter = RateLimiter(limit=1, window_seconds=60, algorithm=algorithm)
+
+    first = await limiter.check_many(["x", "y", "x"])
+    assert [d.key for d in first] == ["x", "y", "x"]
+    assert [d.allowed for d in first] == [True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_check_many_recovers_from_script_flush(fake_redis):
+    limiter = RateLimiter(limit=5, window_seconds=60)
+    await limiter.check("k")
+    await fake_redis.script_flush()
+
+    decisions = await limiter.check_many(["k", "k"])
+
+    assert [d.remaining for d in decisions] == [3, 2]
+
+
+def test_invalid_limit_rejected():
+    with pytest.raises(ValueError):
+        RateLimiter(limit=0)
+
+
+@pytest.mark.asyncio
+async def test_leased_limiter_reserves_in_batches(fake_redis):
+    limiter = LeasedRateLimiter(limit=100, window_seconds=60, lease_size=10, refill_threshold=0)
+
+    decision = await limiter.check("hot")
+
+    assert decision.allowed and decision.remaining == 9
+    assert 90 <= float(await fake_redis.hget("ratelimit:hot", "tokens")) < 91
+    for _ in range(9):
+        assert (await limiter.check("hot")).allowed
+    assert 90 <= float(await fake_redis.hget("ratelimit:hot", "tokens")) < 91
+    await limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_leased_limiter_never_exceeds_bucket(fake_redis):
+    limiter = LeasedRateLimiter(limit=5, window_seconds=60, lease_size=10, max_over_admission=10)
+
+    decisions = [await limiter.check("k") for _ in range(7)]
+
+    assert [d.allowed for d in decisions] == [True] * 5 + [False] * 2
+    assert decisions[-1].retry_after > 0
+    await limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_leased_limiter_refills_in_background(fake_redis):
+    limiter = LeasedRateLimiter(limit=100, window_seconds=60, lease_size=4, refill_threshold=0.5)
+
+    for _ in range(3):
+        await limiter.check("k")
+    await asyncio.sleep(0.01)
+
+    # 4 leased - 3 spent, then a background lease of 4 more
+    assert (await limiter.check("k")).remaining == 4
+    assert 92 <= float(await fake_redis.hget("ratelimit:k", "tokens")) < 93
+    await limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_leased_tokens_expire(fake_redis):
+    limiter = LeasedRateLimiter(limit=100, window_seconds=60, lease_size=10, lease_ttl_seconds=0.01)
+
+    await limiter.check("k")
+    await asyncio.sleep(0.02)
+    await limiter.check("k")
+
+    assert 80 <= float(await fake_redis.hget("ratelimit:k", "tokens")) < 81
+    await limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_leases_bounded_by_max_keys(fake_redis):
+    limiter = LeasedRateLimiter(limit=100, window_seconds=60, lease_size=10, refill_threshold=0, max_keys=2)
+
+    for key in ("a", "b", "c"):
+        await limiter.check(key)
+    assert limiter.leased_keys == 2
+
+    # "a" was least recently used: its lease was dropped, so it reserves again
+    await limiter.check("a")
+    assert 80 <= float(await fake_redis.hget("ratelimit:a", "tokens")) < 81
+    # "c" still spends from its lease
+    await limiter.check("c")
+    assert 90 <= float(await fake_redis.hget("ratelimit:c", "tokens")) < 91
+    await limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_refill_failure_reported_once(fake_redis, monkeypatch, caplog):
+    from iok_core.redis.exceptions import RedisConnectionError
+
+    limiter = LeasedRateLimiter(limit=100, window_seconds=60, lease_size=10)
+
+    async def failing_reserve(key, lease):
+        raise RedisConnectionError("down")
+
+    monkeypatch.setattr(limiter, "_reserve", failing_reserve)
+    with pytest.raises(RedisConnectionError):
+        await limiter.check("k")
+    await asyncio.sleep(0)
+    assert "lease refill failed" not in caplog.text
+    await limiter.close()
@@ -52,4 +52,76 @@ async def test_disabled_via_global(monkeypatch):
     with patch("iok_core.redis.handler.redis_settings", return_value=normal_redis_settings):
         with patch("iok_core.redis.handler.core_settings", return_value=disabled_global):
             with pytest.raises(RedisDisabledError, match="Redis is disabled via config"):
-                await RedisHandler.client()
\ No newline at end of file
+                await RedisHandler.client()
+
+@pytest.mark.asyncio
+async def test_session_deadline_cancels_slow_redis_call(fake_redis, monkeypatch):
+    import asyncio
+    import time
+
+    from iok_core.redis.circuit_breaker import CircuitBreaker
+    from iok_core.redis.exceptions import RedisDeadlineExceeded
+    from iok_core.redis.handler import RedisSessionConfig
+
+    breaker = RedisHandler._registry.current().breaker = CircuitBreaker(min_calls=100)
+    await fake_redis.set("k", "v")
+
+    async def never_replies(*args, **kwargs):
+        await asyncio.sleep(5)
+
+    with monkeypatch.context() as patched:
+        patched.setattr(fake_redis.connection_pool.connection_class, "read_response", never_replies)
+        started = time.perf_counter()
+        with pytest.raises(RedisDeadlineExceeded) as info:
+            async with RedisHandler.session(RedisSessionConfig(health_check=False, timeout=0.05)) as client:
+                await client.get("k")
+    assert time.perf_counter() - started < 1
+    assert info.value.budget_seconds <= 0.05
+    assert isinstance(info.value, TimeoutError)
+    assert breaker.stats().failures == 1
+
+    # Within budget nothing changes
+    async with RedisHandler.session(RedisSessionConfig(health_check=False, timeout=5)) as client:
+        assert await client.get("k") == "v"
+
+
+@pytest.mark.asyncio
+async def test_session_honours_caller_time_budget(fake_redis):
+    import asyncio
+
+    from iok_core.redis.circuit_breaker import CircuitBreaker
+    from iok_core.redis.exceptions import RedisDeadlineExceeded
+    from iok_core.redis.handler import RedisSessionConfig
+    from iok_core.utils.time import time_budget
+
+    breaker = RedisHandler._registry.current().breaker = CircuitBreaker(min_calls=100)
+    config = RedisSessionConfig(health_check=False, timeout=10)
+    with time_budget(0.05):
+        # The budget runs out in the caller's own work: cancelled, but not Redis' fault
+        with pytest.raises(RedisDeadlineExceeded):
+            async with RedisHandler.session(config) as client:
+                await client.set("k", "v")
+                await asyncio.sleep(5)
+
+        # Already spent: fails before touching Redis or the breaker
+        await asyncio.sleep(0.06)
+        with pytest.raises(RedisDeadlineExceeded) as info:
+            async with RedisHandler.session(config):
+                pytest.fail("session body ran past the deadline")
+        assert info.value.elapsed_seconds == 0.0
+    assert breaker.stats().failures == 0
+
+
+@pytest.mark.asyncio
+async def test_caller_timeouts_pass_through_session(fake_redis):
+    import asyncio
+
+    from iok_core.redis.circuit_breaker import CircuitBreaker
+    from iok_core.redis.handler import RedisSessionConfig
+
+    breaker = RedisHandler._registry.current().breaker = CircuitBreaker(min_calls=100)
+    with pytest.raises(asyncio.TimeoutError):
+        async with RedisHandler.session(RedisSessionConfig(health_check=False)) as client:
+            await client.get("k")
+            await asyncio.wait_for(asyncio.sleep(5), timeout=0.01)
+    assert breaker.stats().failures == 0
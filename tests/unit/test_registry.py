@@ -0,0 +1,65 @@
+# tests/unit/test_registry.py
+import asyncio
+import threading
+
+from iok_core.redis.registry import ClientRegistry
+
+
+def test_each_loop_gets_its_own_state():
+    registry = ClientRegistry()
+
+    async def grab():
+        return registry.current()
+
+    first = asyncio.run(grab())
+    second = asyncio.run(grab())
+
+    assert first is not second
+    assert first.loop.is_closed()
+    # The closed loop's state is pruned when the next loop registers
+    assert len(registry) == 1
+
+
+def test_same_loop_reuses_state():
+    registry = ClientRegistry()
+
+    async def grab_twice():
+        return registry.current(), registry.current()
+
+    a, b = asyncio.run(grab_twice())
+    assert a is b
+
+
+def test_loops_in_threads_are_isolated():
+    registry = ClientRegistry()
+    states = []
+    barrier = threading.Barrier(2)
+
+    async def grab():
+        state = registry.current()
+        await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+        states.append(state)
+
+    threads = [threading.Thread(target=asyncio.run, args=(grab(),)) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(states) == 2
+    assert states[0] is not states[1]
+
+
+def test_fork_resets_registry():
+    registry = ClientRegistry()
+
+    async def scenario():
+        before = registry.current()
+        before.clients[False] = object()
+        registry._pid = -1  # as seen from a forked child
+        return before, registry.current()
+
+    before, after = asyncio.run(scenario())
+
+    assert after is not before
+    assert after.clients == {}
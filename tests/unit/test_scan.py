@@ -0,0 +1,109 @@
+# tests/unit/test_scan.py
+import asyncio
+
+import pytest
+
+from iok_core.redis.handler import RedisSessionConfig
+from iok_core.redis.scan import AdaptiveCount, KeyspaceScanner, escape_glob
+
+
+@pytest.fixture
+def populated(fake_redis):
+    async def fill(n=250):
+        await fake_redis.mset({f"t1:item:{i}": i for i in range(n)})
+        await fake_redis.mset({f"t2:item:{i}": i for i in range(10)})
+    return fill
+
+
+@pytest.mark.asyncio
+async def test_keys_scoped_to_prefix(fake_redis, populated):
+    await populated()
+    scanner = KeyspaceScanner(RedisSessionConfig(prefix="t1:"), count=20)
+
+    keys = {k async for k in scanner.keys()}
+
+    assert keys == {f"item:{i}" for i in range(250)}
+
+
+def test_glob_escaping_and_adaptive_count():
+    assert escape_glob("a*b?[c]\\") == "a\\*b\\?\\[c\\]\\\\"
+    sizer = AdaptiveCount(count=100, minimum=10, maximum=400, target_seconds=0.01)
+    assert [sizer.update(0.001) for _ in range(3)] == [200, 400, 400]
+    assert sizer.update(0.05) == 200
+    assert sizer.update(0.007) == 200
+
+
+@pytest.mark.asyncio
+async def test_keys_filtered_by_type(fake_redis):
+    await fake_redis.set("t1:s", "1")
+    await fake_redis.hset("t1:h", "f", "1")
+    scanner = KeyspaceScanner(RedisSessionConfig(prefix="t1:"))
+
+    assert [k async for k in scanner.keys(key_type="hash")] == ["h"]
+
+
+@pytest.mark.asyncio
+async def test_collection_scans(fake_redis):
+    await fake_redis.hset("t1:h", mapping={f"f{i}": i for i in range(50)})
+    await fake_redis.sadd("t1:s", *range(50))
+    await fake_redis.zadd("t1:z", {f"m{i}": i for i in range(50)})
+    scanner = KeyspaceScanner(RedisSessionConfig(prefix="t1:"), count=10)
+
+    assert len({f async for f, _ in scanner.hscan("h")}) == 50
+    assert len({m async for m in scanner.sscan("s")}) == 50
+    assert {m: s async for m, s in scanner.zscan("z", match="m1*")}["m12"] == 12.0
+
+
+@pytest.mark.asyncio
+async def test_bulk_unlink_and_expire(fake_redis, populated):
+    await populated()
+    scanner = KeyspaceScanner(RedisSessionConfig(prefix="t1:"))
+
+    expired = await scanner.expire(300, "item:1*", batch_size=7, concurrency=2)
+    assert expired.matched == expired.affected == 1 + 10 + 100
+    assert await fake_redis.ttl("t1:item:150") > 0
+    assert await fake_redis.ttl("t1:item:2") == -1
+
+    result = await scanner.unlink(batch_size=16, concurrency=3)
+    assert result.affected == 250
+    assert result.batches >= 250 // 16
+    assert await fake_redis.dbsize() == 10
+
+
+@pytest.mark.asyncio
+async def test_dump_needs_binary_and_round_trips(fake_redis, populated):
+    await populated(5)
+    with pytest.raises(ValueError):
+        [x async for x in KeyspaceScanner(RedisSessionConfig(prefix="t1:")).dump()]
+
+    scanner = KeyspaceScanner(RedisSessionConfig(prefix="t1:", binary=True))
+    dumped = {k: p async for k, p in scanner.dump()}
+    assert set(dumped) == {f"item:{i}".encode() for i in range(5)}
+
+    await fake_redis.restore("copy", 0, dumped[b"item:3"])
+    assert await fake_redis.get("copy") == "3"
+
+
+@pytest.mark.asyncio
+async def test_bulk_failure_waits_for_cancelled_batches(fake_redis, populated, monkeypatch):
+    await populated()
+    scanner = KeyspaceScanner(RedisSessionConfig(prefix="t1:"))
+    created = []
+    create_task = asyncio.create_task
+
+    def tracked(coro):
+        created.append(create_task(coro))
+        return created[-1]
+
+    monkeypatch.setattr(asyncio, "create_task", tracked)
+
+    async def failing_rebatch(match, batch_size):
+        yield ["item:1"]
+        yield ["item:2"]
+        raise RuntimeError("scan failed")
+
+    monkeypatch.setattr(scanner, "_rebatch", failing_rebatch)
+    with pytest.raises(RuntimeError):
+        await scanner.unlink(concurrency=4)
+    assert len(created) == 2
+    assert all(task.done() for task in created)
@@ -0,0 +1,118 @@
+# tests/unit/test_scripts.py
+import pytest
+from redis.exceptions import ResponseError
+
+from iok_core.redis.handler import RedisSessionConfig
+from iok_core.redis.primitives import RedisPrimitives
+from iok_core.redis.scripts import ScriptRegistry
+
+
+ECHO_LUA = "return {KEYS[1], ARGV[1]}"
+
+
+@pytest.mark.asyncio
+async def test_script_loaded_once_per_pool(fake_redis, monkeypatch):
+    registry = ScriptRegistry()
+    registry.register("echo", ECHO_LUA)
+    loads = []
+    original = fake_redis.script_load
+
+    async def counting_load(source):
+        loads.append(source)
+        return await original(source)
+
+    monkeypatch.setattr(fake_redis, "script_load", counting_load)
+
+    assert await registry.call(fake_redis, "echo", ["k"], ["v"]) == ["k", "v"]
+    assert await registry.call(fake_redis, "echo", ["k2"], ["v2"]) == ["k2", "v2"]
+    assert loads == [ECHO_LUA]
+
+
+@pytest.mark.asyncio
+async def test_call_recovers_from_script_flush(fake_redis):
+    registry = ScriptRegistry()
+    registry.register("echo", ECHO_LUA)
+    await registry.call(fake_redis, "echo", ["k"], ["v"])
+
+    await fake_redis.script_flush()
+
+    assert await registry.call(fake_redis, "echo", ["k"], ["again"]) == ["k", "again"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_retries_only_noscript_entries(fake_redis):
+    registry = ScriptRegistry()
+    registry.register("echo", ECHO_LUA)
+    await registry.load(fake_redis, "echo")
+    await fake_redis.script_flush()  # registry still believes it is loaded
+
+    pipe = fake_redis.pipeline(transaction=False)
+    pipe.incr("counter")
+    registry.queue(pipe, "echo", ["a"], [1])
+    registry.queue(pipe, "echo", ["b"], [2])
+
+    assert await registry.execute(fake_redis, pipe) == [1, ["a", "1"], ["b", "2"]]
+    assert await fake_redis.get("counter") == "1"  # not re-run
+
+
+def test_register_conflict():
+    registry = ScriptRegistry()
+    first = registry.register("s", "return 1")
+    assert registry.register("s", "return 1") is first
+    with pytest.raises(ValueError):
+        registry.register("s", "return 2")
+
+
+@pytest.mark.asyncio
+async def test_primitives_respect_prefix(fake_redis):
+    ops = RedisPrimitives(RedisSessionConfig(prefix="app:"))
+
+    assert await ops.compare_and_set("lock", None, "me", ttl=10)
+    assert not await ops.compare_and_set("lock", "other", "x")
+    assert await ops.compare_and_set("lock", "me", "me2")
+    assert await fake_redis.get("app:lock") == "me2"
+    assert not await ops.compare_and_delete("lock", "me")
+    assert await ops.compare_and_delete("lock", "me2")
+    assert not await fake_redis.exists("app:lock")
+
+
+@pytest.mark.asyncio
+async def test_push_capped_and_touch(fake_redis):
+    ops = RedisPrimitives(RedisSessionConfig(prefix="app:", default_ttl=60))
+
+    assert await ops.push_capped("recent", "a", "b", max_length=3) == 2
+    assert await ops.push_capped("recent", "c", "d", max_length=3) == 3
+    assert await fake_redis.lrange("app:recent", 0, -1) == ["d", "c", "b"]
+
+    await fake_redis.set("app:session", "data", ex=5)
+    assert await ops.get_and_touch("session") == "data"
+    assert await fake_redis.ttl("app:session") > 5
+    assert await ops.get_and_touch("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_increment_sets_ttl_once(fake_redis):
+    ops = RedisPrimitives(RedisSessionConfig(prefix="app:"))
+
+    assert await ops.increment("hits", ttl=30) == 1
+    await fake_redis.expire("app:hits", 5)
+    assert await ops.increment("hits", 2, ttl=30) == 3
+    assert await fake_redis.ttl("app:hits") <= 5
+
+    await fake_redis.set("app:text", "x")
+    with pytest.raises(Exception) as excinfo:
+        await ops.increment("text")
+    assert isinstance(excinfo.value.__cause__, ResponseError)
+
+
+def test_registry_export_not_shadowed_by_submodule():
+    import importlib
+
+    import iok_core.redis
+    import iok_core.redis.scripts as scripts_module
+    from iok_core.redis import ScriptRegistry as exported_class, script_registry
+
+    assert importlib.import_module("iok_core.redis.scripts") is scripts_module
+    assert isinstance(script_registry, exported_class)
+    assert script_registry is scripts_module.script_registry
+    assert iok_core.redis.script_registry is script_registry
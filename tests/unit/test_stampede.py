@@ -0,0 +1,97 @@
+# tests/unit/test_stampede.py
+import asyncio
+
+import pytest
+
+from iok_core.cache import StampedeCache
+from iok_core.redis.handler import RedisSessionConfig
+
+
+def _counter(value="v", delay=0.0):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return f"{value}{len(calls)}"
+
+    return compute, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_compute(fake_redis):
+    cache = StampedeCache(RedisSessionConfig(prefix="sf:", default_ttl=60), beta=0)
+    compute, calls = _counter(delay=0.05)
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(20)))
+
+    assert results == ["v1"] * 20
+    assert len(calls) == 1
+    assert cache.stats.recomputes == 1
+    assert await cache.get_or_compute("k", compute) == "v1"
+    assert cache.stats.hits == 1
+    assert not await fake_redis.exists("sf:k:lock")
+
+
+@pytest.mark.asyncio
+async def test_other_process_waits_for_lock_holder(fake_redis):
+    config = RedisSessionConfig(prefix="sf:", default_ttl=60)
+    holder = StampedeCache(config, beta=0)
+    waiter = StampedeCache(config, beta=0, wait_seconds=2)
+    slow, slow_calls = _counter("holder", delay=0.1)
+    fast, fast_calls = _counter("waiter")
+
+    first = asyncio.create_task(holder.get_or_compute("k", slow))
+    await asyncio.sleep(0.02)
+    assert await waiter.get_or_compute("k", fast) == "holder1"
+    assert await first == "holder1"
+    assert (len(slow_calls), len(fast_calls)) == (1, 0)
+    assert waiter.stats.lock_waits == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_served_while_locked(fake_redis):
+    cache = StampedeCache(RedisSessionConfig(prefix="sf:"), beta=0, stale_ttl_seconds=60)
+    compute, calls = _counter()
+    await cache.get_or_compute("k", compute, ttl=1)
+    await fake_redis.pexpire("sf:k", 30_000)  # logically expired, still within the stale window
+    await fake_redis.set("sf:k:lock", "999", px=5000)  # another process is recomputing
+
+    assert await cache.get_or_compute("k", compute, ttl=1) == "v1"
+    assert cache.stats.stale_served == 1
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_fenced_write_rejects_older_token(fake_redis):
+    cache = StampedeCache(RedisSessionConfig(prefix="sf:", default_ttl=60), beta=0)
+    compute, _ = _counter()
+    async def racing_compute():
+        # Our lease ran out and a newer holder wrote while we were computing
+        await fake_redis.hset("sf:k", mapping={"v": '"newer"', "d": 1, "f": "9999999999999999"})
+        await fake_redis.pexpire("sf:k", 120_000)
+        return await compute()
+
+    assert await cache.get_or_compute("k", racing_compute) == "v1"
+    assert cache.stats.fenced_writes == 1
+    assert await cache.get_or_compute("k", compute) == "newer"
+
+
+@pytest.mark.asyncio
+async def test_early_refresh_runs_in_background(fake_redis):
+    cache = StampedeCache(RedisSessionConfig(prefix="sf:", default_ttl=60), beta=1e9)
+    compute, calls = _counter(delay=0.01)
+    assert await cache.get_or_compute("k", compute) == "v1"
+
+    assert await cache.get_or_compute("k", compute) == "v1"  # served, refresh scheduled
+    assert cache.stats.early_refreshes == 1
+    await asyncio.sleep(0.05)
+    assert len(calls) == 2
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_ttl_required(fake_redis):
+    cache = StampedeCache()
+    with pytest.raises(ValueError):
+        await cache.get_or_compute("k", _counter()[0])
@@ -0,0 +1,165 @@
+# tests/unit/test_streams.py
+import asyncio
+
+import pytest
+
+from iok_core.redis import RedisSessionConfig
+from iok_core.redis.exceptions import RedisError
+from iok_core.streams import StreamConsumer, StreamProducer
+
+
+async def _until(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_add_many_pipelines_and_trims(fake_redis):
+    producer = StreamProducer("jobs", maxlen=1000, batch_size=50)
+
+    ids = await producer.add_many({"n": i} for i in range(120))
+
+    assert len(ids) == 120
+    assert ids == sorted(ids, key=lambda i: tuple(map(int, i.split("-"))))
+    assert await producer.length() == 120
+    assert await fake_redis.xlen("stream:jobs") == 120
+
+
+@pytest.mark.asyncio
+async def test_binary_sessions_still_return_str_ids(fake_redis):
+    producer = StreamProducer("jobs", config=RedisSessionConfig(prefix="stream:", binary=True))
+
+    first = await producer.add({"n": b"1"})
+    rest = await producer.add_many([{"n": b"2"}])
+
+    assert all(isinstance(i, str) for i in [first, *rest])
+
+
+@pytest.mark.asyncio
+async def test_unexpected_autoclaim_reply_is_a_redis_error(fake_redis, monkeypatch):
+    consumer = StreamConsumer("jobs", "workers", lambda m: asyncio.sleep(0))
+    await consumer.ensure_group()
+
+    async def justid_reply(*args, **kwargs):
+        return ["0-0", "1-0"]
+
+    monkeypatch.setattr(type(fake_redis), "xautoclaim", justid_reply)
+    with pytest.raises(RedisError):
+        await consumer._claim(10)
+
+
+@pytest.mark.asyncio
+async def test_consumers_share_work_and_ack_in_batches(fake_redis):
+    producer = StreamProducer("jobs")
+    await producer.add_many({"n": i} for i in range(200))
+    seen = []
+
+    async def handle(message):
+        seen.append(int(message.fields["n"]))
+        await asyncio.sleep(0)
+
+    consumers = [
+        StreamConsumer("jobs", "workers", handle, consumer=f"c{i}", batch_size=20, block_ms=10, ack_batch_size=25)
+        for i in range(2)
+    ]
+    for consumer in consumers:
+        consumer.start()
+    await _until(lambda: sum(c.stats.acked for c in consumers) == 200)
+    for consumer in consumers:
+        await consumer.stop()
+
+    assert sorted(seen) == list(range(200))
+    assert all(c.stats.handled > 0 for c in consumers)
+    assert all(c.stats.mean_ack_batch > 1 for c in consumers)
+    assert (await fake_redis.xpending("stream:jobs", "workers"))["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_in_flight_is_bounded(fake_redis):
+    await StreamProducer("jobs").add_many({"n": i} for i in range(30))
+    running = 0
+    peak = 0
+    release = asyncio.Event()
+
+    async def handle(message):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await release.wait()
+        running -= 1
+
+    consumer = StreamConsumer("jobs", "workers", handle, max_in_flight=4, block_ms=10)
+    consumer.start()
+    await _until(lambda: consumer.stats.saturated_waits > 0)
+    assert consumer.stats.read == 4
+    release.set()
+    await _until(lambda: consumer.stats.acked == 30)
+    await consumer.stop()
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_entries_are_reclaimed(fake_redis):
+    await StreamProducer("jobs").add_many({"n": i} for i in range(3))
+    attempts = {}
+
+    async def flaky(message):
+        attempts[message.id] = attempts.get(message.id, 0) + 1
+        if attempts[message.id] == 1:
+            raise RuntimeError("boom")
+
+    consumer = StreamConsumer(
+        "jobs", "workers", flaky, block_ms=10, claim_idle_seconds=0.001, claim_interval_seconds=0.05
+    )
+    consumer.start()
+    await _until(lambda: consumer.stats.acked == 3)
+    await consumer.stop()
+
+    assert consumer.stats.failed == 3
+    assert consumer.stats.claimed >= 3
+    assert set(attempts.values()) == {2}
+
+
+@pytest.mark.asyncio
+async def test_consumer_survives_redis_errors(fake_redis, monkeypatch):
+    from iok_core.redis.exceptions import RedisCircuitBreakerOpen, RedisConnectionError
+
+    await StreamProducer("jobs").add_many({"n": i} for i in range(5))
+    handled = []
+
+    async def handle(message):
+        handled.append(message.id)
+
+    consumer = StreamConsumer("jobs", "workers", handle, block_ms=10)
+    real_read = consumer._read
+    failures = [RedisConnectionError(), RedisCircuitBreakerOpen(retry_after_seconds=1)]
+
+    async def failing_read(count):
+        if failures:
+            raise failures.pop(0)
+        return await real_read(count)
+
+    monkeypatch.setattr(consumer, "_read", failing_read)
+    consumer.start()
+    await _until(lambda: consumer.stats.acked == 5)
+    await consumer.stop()
+
+    assert consumer.stats.redis_errors == 2
+    assert len(handled) == 5
+
+
+@pytest.mark.asyncio
+async def test_idle_blocking_reads_are_not_slow_calls(fake_redis):
+    from iok_core.redis.circuit_breaker import CircuitBreaker
+    from iok_core.redis.handler import RedisHandler
+
+    consumer = StreamConsumer("jobs", "workers", lambda m: asyncio.sleep(0), block_ms=10)
+    await consumer.ensure_group()
+    breaker = RedisHandler._registry.current().breaker = CircuitBreaker(min_calls=1, slow_call_seconds=0.001)
+
+    for _ in range(3):
+        assert await consumer._read(10) == []
+    assert breaker.stats().successes == 0
+    assert breaker.state == "closed"
@@ -0,0 +1,123 @@
+# tests/unit/test_sync_handler.py
+import time
+
+import fakeredis
+import pytest
+from redis.connection import SSLConnection, UnixDomainSocketConnection
+
+from iok_core.redis import settings as settings_module
+from iok_core.redis.circuit_breaker import CircuitBreaker
+from iok_core.redis.exceptions import (
+    RedisCircuitBreakerOpen,
+    RedisConnectionError,
+    RedisDeadlineExceeded,
+    RedisDisabledError,
+)
+from iok_core.redis.handler import RedisSessionConfig
+from iok_core.redis.settings import RedisSettings, redis_settings, redis_settings_sync
+from iok_core.redis.sync_handler import SyncRedisHandler, deadline_connection_class
+from iok_core.utils.time import Deadline
+
+
+@pytest.fixture
+def fake_sync_redis():
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    client.connection_pool.connection_class = deadline_connection_class(client.connection_pool.connection_class)
+    SyncRedisHandler._clients = {False: client}
+    SyncRedisHandler._breaker = None
+    SyncRedisHandler._healthy = {}
+    yield server
+    SyncRedisHandler._clients = {}
+    SyncRedisHandler._breaker = None
+    SyncRedisHandler._healthy = {}
+
+
+def test_session_round_trip(fake_sync_redis):
+    with SyncRedisHandler.session() as client:
+        client.set("k", "v")
+        assert client.get("k") == "v"
+    assert SyncRedisHandler.client() is client
+
+
+def test_connection_errors_are_mapped_and_trip_breaker(fake_sync_redis):
+    SyncRedisHandler._breaker = CircuitBreaker(min_calls=2, failure_rate_threshold=0.5)
+    fake_sync_redis.connected = False
+
+    with pytest.raises(RedisConnectionError):
+        with SyncRedisHandler.session() as client:
+            client.get("k")
+    with pytest.raises(RedisCircuitBreakerOpen):
+        with SyncRedisHandler.session() as client:
+            client.get("k")
+    with pytest.raises(RedisCircuitBreakerOpen):
+        with SyncRedisHandler.session():
+            pass
+
+
+def test_session_deadline_bounds_redis_calls(fake_sync_redis):
+    SyncRedisHandler._breaker = CircuitBreaker(min_calls=10)
+
+    with pytest.raises(RedisDeadlineExceeded):
+        with SyncRedisHandler.session(RedisSessionConfig(deadline=Deadline.after(0))):
+            pass
+    stats = SyncRedisHandler._breaker.stats()
+    assert (stats.successes, stats.failures) == (0, 0)  # never reached Redis
+
+    with pytest.raises(RedisDeadlineExceeded) as info:
+        with SyncRedisHandler.session(RedisSessionConfig(timeout=0.05)) as client:
+            client.set("k", "v")
+            time.sleep(0.06)
+            client.get("k")
+    assert info.value.budget_seconds is not None and info.value.budget_seconds <= 0.05
+    assert SyncRedisHandler._breaker.stats().failures == 1
+
+    with SyncRedisHandler.session(RedisSessionConfig(timeout=5)) as client:
+        assert client.get("k") == "v"  # the dropped connection was replaced
+
+
+def test_health_checked_sessions_ping_after_a_failure(fake_sync_redis):
+    fake_sync_redis.connected = False
+    with pytest.raises(RedisConnectionError):
+        with SyncRedisHandler.session() as client:
+            client.get("k")
+
+    ran = []
+    with pytest.raises(RedisConnectionError):
+        with SyncRedisHandler.session():
+            ran.append(True)
+    assert not ran  # the PING failed before the block
+
+    fake_sync_redis.connected = True
+    with SyncRedisHandler.session() as client:
+        assert client.get("k") is None
+    assert SyncRedisHandler._healthy[False]
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(settings_module, "_redis_settings_instance", RedisSettings(disabled=True))
+    SyncRedisHandler._clients = {}
+    with pytest.raises(RedisDisabledError):
+        SyncRedisHandler.client()
+
+
+def test_pool_construction_follows_settings(tmp_path):
+    plain = SyncRedisHandler._build_client(RedisSettings(tls_enabled=False, host="cache", port=6380))
+    assert plain.connection_pool.connection_kwargs["host"] == "cache"
+    assert plain.connection_pool.connection_kwargs["port"] == 6380
+
+    tls = SyncRedisHandler._build_client(RedisSettings(tls_enabled=True))
+    assert tls.connection_pool.connection_class is SSLConnection
+
+    unix = SyncRedisHandler._build_client(RedisSettings(host=str(tmp_path / "redis.sock")))
+    assert unix.connection_pool.connection_class is UnixDomainSocketConnection
+    assert unix.connection_pool.connection_kwargs["path"] == str(tmp_path / "redis.sock")
+
+
+@pytest.mark.asyncio
+async def test_settings_accessors_share_one_instance(monkeypatch):
+    monkeypatch.setattr(settings_module, "_redis_settings_instance", None)
+    # Safe inside a running loop: no event loop is created per call
+    first = redis_settings_sync()
+    assert redis_settings_sync() is first
+    assert await redis_settings() is first
@@ -0,0 +1,101 @@
+# tests/unit/test_time.py
+import asyncio
+import time
+
+import pytest
+
+from iok_core.utils.time import CachedClock, Deadline, RedisClockOffset, current_deadline, iso_utcnow, time_budget
+
+
+def test_cached_clock_falls_back_to_live_time_when_stopped():
+    clock = CachedClock()
+    assert not clock.running
+    assert abs(clock.timestamp - time.time()) < 0.01
+    assert clock.iso[:16] == iso_utcnow()[:16]
+
+
+@pytest.mark.asyncio
+async def test_loop_refresh_keeps_values_consistent():
+    clock = CachedClock(tick=0.005)
+    clock.start()
+    try:
+        first = clock.timestamp
+        assert clock.timestamp == first  # no refresh between two reads
+        await asyncio.sleep(0.03)
+        assert clock.timestamp > first
+        assert clock.timestamp_ms == int(clock.timestamp * 1000)
+        assert clock.iso == clock.datetime.isoformat()
+        assert clock.iso.endswith("+00:00")
+    finally:
+        clock.stop()
+    assert not clock.running
+
+
+def test_formatting_deferred_to_reads():
+    clock = CachedClock()
+    assert clock.tick >= 0.01
+    clock._running = True  # as if started, without a refresher
+    clock._refresh()
+    iso = clock.iso
+    assert clock.iso is iso  # formatted once per tick
+    assert abs(clock.datetime.timestamp() - clock.timestamp) < 1e-5
+    clock._ts += 1  # next tick: nothing is built until read
+    assert clock._formatted[0] != clock.timestamp
+    assert clock.iso > iso
+
+
+def test_thread_refresh():
+    clock = CachedClock(tick=0.005)
+    clock.start(mode="thread")
+    try:
+        first = clock.timestamp
+        time.sleep(0.05)
+        assert clock.timestamp > first
+    finally:
+        clock.stop()
+
+
+def test_deadline():
+    deadline = Deadline.after(10)
+    assert not deadline.expired
+    assert 9 < deadline.remaining() <= 10
+    assert deadline.timeout(cap=0.5) == 0.5
+    assert Deadline.after(-1).remaining() == 0.0
+    sooner = Deadline.after(1)
+    assert deadline.earliest(sooner) is sooner
+    assert deadline.earliest(None) is deadline
+
+
+@pytest.mark.asyncio
+async def test_time_budget_nests_and_propagates():
+    assert current_deadline() is None
+    with time_budget(10) as outer:
+        assert current_deadline() is outer
+        with time_budget(60) as looser:
+            assert looser is outer  # an inner budget cannot extend the outer one
+        with time_budget(1) as inner:
+            assert current_deadline() is inner
+            # Tasks inherit the budget of the context that created them
+            assert await asyncio.create_task(asyncio.sleep(0, current_deadline())) is inner
+        assert current_deadline() is outer
+    assert current_deadline() is None
+    with pytest.raises(ValueError):
+        with time_budget():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_redis_clock_offset(fake_redis, monkeypatch):
+    real_time = fake_redis.time
+
+    async def skewed_time():
+        seconds, micros = await real_time()
+        return seconds + 5, micros  # server runs 5s ahead
+
+    monkeypatch.setattr(fake_redis, "time", skewed_time)
+    estimator = RedisClockOffset(samples=3)
+
+    estimate = await estimator.sync()
+
+    assert estimate.offset == pytest.approx(5, abs=0.1)
+    assert estimator.server_time() - time.time() == pytest.approx(5, abs=0.1)
@@ -0,0 +1,132 @@
+# tests/unit/test_tls.py
+import asyncio
+import shutil
+import ssl
+import subprocess
+
+import fakeredis
+import pytest
+import pytest_asyncio
+from fakeredis.aioredis import FakeAsyncRedisConnection
+
+from iok_core.redis.handler import RedisHandler
+from iok_core.redis.metrics import InstrumentedConnectionPool, InstrumentedRedis
+from iok_core.redis.settings import RedisSettings
+from iok_core.redis.tls import SharedContextSSLConnection, SharedTLSContext
+
+
+async def _serve_resp(reader, writer):
+    """Answer every RESP command with +OK."""
+    try:
+        while line := await reader.readline():
+            if line.startswith(b"*"):
+                for _ in range(int(line[1:])):
+                    await reader.readline()  # $len
+                    await reader.readline()  # value
+                writer.write(b"+OK\r\n")
+                await writer.drain()
+    except (ConnectionError, ssl.SSLError):
+        pass
+    finally:
+        writer.close()
+
+
+@pytest.fixture(scope="module")
+def tls_material(tmp_path_factory):
+    """(ca, server cert, server key) from a throwaway CA."""
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl not available")
+    workdir = tmp_path_factory.mktemp("tls")
+    ca_key, ca_crt = workdir / "ca.key", workdir / "ca.crt"
+    key, csr, crt = workdir / "server.key", workdir / "server.csr", workdir / "server.crt"
+
+    def openssl(*args):
+        subprocess.run(["openssl", *map(str, args)], check=True, capture_output=True)
+
+    openssl("req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1", "-subj", "/CN=iok-test-ca",
+            "-keyout", ca_key, "-out", ca_crt)
+    openssl("req", "-newkey", "rsa:2048", "-nodes", "-subj", "/CN=localhost", "-keyout", key, "-out", csr)
+    openssl("x509", "-req", "-in", csr, "-CA", ca_crt, "-CAkey", ca_key, "-CAcreateserial",
+            "-days", "1", "-out", crt)
+    return ca_crt, crt, key
+
+
+@pytest_asyncio.fixture
+async def tls_server(tls_material):
+    _, cert, key = tls_material
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server = await asyncio.start_server(_serve_resp, "127.0.0.1", 0, ssl=context)
+    yield server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+
+def _settings(tls_material, port, **overrides):
+    ca, _, _ = tls_material
+    return RedisSettings(
+        tls_enabled=True,
+        host="127.0.0.1",
+        port=port,
+        tls_ca_cert_path=str(ca),
+        tls_check_hostname=False,
+        **overrides,
+    )
+
+
+@pytest.mark.asyncio
+async def test_second_connection_resumes_session(tls_material, tls_server):
+    shared = SharedTLSContext(RedisHandler._tls_kwargs(_settings(tls_material, tls_server)))
+    connections = []
+    for _ in range(3):
+        connection = SharedContextSSLConnection(host="127.0.0.1", port=tls_server, tls_context=shared)
+        await connection.connect()
+        connections.append(connection)
+
+    assert shared.stats.handshakes == 3
+    assert shared.stats.resumed == 2
+    assert shared.stats.handshake_time.count == 3
+    for connection in connections:
+        await connection.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_resumption_can_be_disabled(tls_material, tls_server):
+    shared = SharedTLSContext(RedisHandler._tls_kwargs(_settings(tls_material, tls_server)), resumption=False)
+    for _ in range(2):
+        connection = SharedContextSSLConnection(host="127.0.0.1", port=tls_server, tls_context=shared)
+        await connection.connect()
+        await connection.disconnect()
+
+    assert shared.stats.handshakes == 2
+    assert shared.stats.resumed == 0
+
+
+@pytest.mark.asyncio
+async def test_tls_pools_share_one_context(tls_material, monkeypatch):
+    monkeypatch.setattr(RedisHandler, "_tls", None)
+    settings = _settings(tls_material, 6380)
+    text = await RedisHandler._build_pool(settings, decode_responses=True, pool_class=InstrumentedConnectionPool)
+    binary = await RedisHandler._build_pool(settings, decode_responses=False)
+
+    assert issubclass(text.connection_class, SharedContextSSLConnection)
+    assert text.connection_kwargs["tls_context"] is binary.connection_kwargs["tls_context"]
+    assert RedisHandler.tls_stats() is text.connection_kwargs["tls_context"].stats
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_idle_connections():
+    pool = InstrumentedConnectionPool(
+        connection_class=FakeAsyncRedisConnection,
+        server=fakeredis.FakeServer(),
+        decode_responses=True,
+        max_connections=5,
+    )
+    client = InstrumentedRedis.from_pool(pool)
+
+    result = await RedisHandler._prewarm(client, 8)
+
+    assert (result.requested, result.opened, result.failed) == (5, 5, 0)
+    assert len(pool._available_connections) == 5
+    assert not pool._in_use_connections
+    await client.aclose()
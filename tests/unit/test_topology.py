@@ -0,0 +1,109 @@
+# tests/unit/test_topology.py
+import asyncio
+from collections import deque
+
+import fakeredis
+import pytest
+
+from iok_core.redis.handler import RedisHandler, RedisSessionConfig
+from iok_core.redis.health import HealthMonitor
+from iok_core.redis.settings import RedisSettings
+from iok_core.redis.topology import choose_replica, parse_address, replica_lag_bound
+
+
+def test_parse_address():
+    assert parse_address("replica-1", 6379) == ("replica-1", 6379)
+    assert parse_address("replica-1:6380", 6379) == ("replica-1", 6380)
+    assert parse_address("[::1]:6390", 6379) == ("::1", 6390)
+    assert parse_address("[::1]", 6379) == ("::1", 6379)
+
+
+def _replica(latency=None, healthy=True, lag=0.0):
+    monitor = HealthMonitor(client=None)  # type: ignore[arg-type]
+    monitor.latency_ewma = latency
+    monitor.healthy = healthy
+    monitor.replication_lag = lag
+    return object(), monitor
+
+
+def test_choose_replica_prefers_lower_latency():
+    fast, slow = _replica(latency=0.001), _replica(latency=0.050)
+    assert all(choose_replica([fast, slow], None) is fast for _ in range(20))
+
+
+def test_choose_replica_skips_unhealthy_and_stale():
+    down = _replica(healthy=False)
+    stale = _replica(lag=30.0)
+    unknown = _replica(lag=None)
+    fresh = _replica(lag=1.0)
+
+    assert choose_replica([down, stale, unknown, fresh], max_lag_seconds=5) is fresh
+    assert choose_replica([down, stale, unknown], max_lag_seconds=5) is None
+    assert choose_replica([stale], max_lag_seconds=None) is stale
+
+
+def test_lag_bound_only_where_lag_is_probed():
+    assert replica_lag_bound(RedisSettings(topology="replicas", replica_max_lag_seconds=5)) == 5
+    for topology in ("sentinel", "cluster"):
+        rotating = RedisSettings(topology=topology, replica_max_lag_seconds=5)
+        assert replica_lag_bound(rotating) is None
+        # An unprobed reader still gets picked
+        assert choose_replica([_replica(lag=None)], replica_lag_bound(rotating)) is not None
+
+
+def test_replication_lag_from_offsets():
+    samples = deque([(10.0, 100), (15.0, 200), (20.0, 300)])
+    replica = {"role": "slave", "master_link_status": "up", "master_last_io_seconds_ago": 9}
+
+    assert HealthMonitor._lag({**replica, "slave_repl_offset": 300}, samples, now=20.01) == pytest.approx(0.01)
+    assert HealthMonitor._lag({**replica, "slave_repl_offset": 250}, samples, now=21.0) == 6.0
+    assert HealthMonitor._lag({**replica, "slave_repl_offset": 50}, samples, now=21.0) is None
+    assert HealthMonitor._lag({"role": "slave", "master_link_status": "down"}, samples, now=21.0) is None
+    assert HealthMonitor._lag({"role": "master"}, samples, now=21.0) == 0.0
+
+
+class _InfoClient:
+    def __init__(self, **replication):
+        self.replication = replication
+
+    async def ping(self):
+        return True
+
+    async def info(self, section):
+        return dict(self.replication)
+
+
+@pytest.mark.asyncio
+async def test_idle_in_sync_replica_reports_no_lag():
+    primary = _InfoClient(role="master", master_repl_offset=500)
+    replica = _InfoClient(role="slave", master_link_status="up", master_last_io_seconds_ago=9, slave_repl_offset=500)
+    monitor = HealthMonitor(replica, check_replication=True, primary=primary)  # type: ignore[arg-type]
+
+    assert await monitor.probe()
+    assert monitor.replication_lag is not None and monitor.replication_lag < 0.5
+    in_sync = monitor.replication_lag
+
+    primary.replication["master_repl_offset"] = 800  # writes the replica has not applied yet
+    await asyncio.sleep(0.01)
+    await monitor.probe()
+    # Bounded by the age of the last sample it had caught up with
+    assert monitor.replication_lag is not None and monitor.replication_lag > in_sync
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_routes_to_replica(fake_redis):
+    replica = fakeredis.FakeAsyncRedis(decode_responses=True)
+    await replica.set("k", "from-replica")
+    monitor = HealthMonitor(replica)
+    RedisHandler._registry.current().replicas[False] = [(replica, monitor)]
+    await fake_redis.set("k", "from-primary")
+
+    async with RedisHandler.session(RedisSessionConfig(read_only=True)) as client:
+        assert await client.get("k") == "from-replica"
+    async with RedisHandler.session() as client:
+        assert await client.get("k") == "from-primary"
+
+    monitor.healthy = False
+    async with RedisHandler.session(RedisSessionConfig(read_only=True)) as client:
+        assert await client.get("k") == "from-primary"
+    await replica.aclose()
@@ -0,0 +1,96 @@
+# tests/unit/test_tracing.py
+import fakeredis
+import pytest
+import pytest_asyncio
+from fakeredis.aioredis import FakeAsyncRedisConnection
+from opentelemetry import trace
+from redis.exceptions import ResponseError
+
+from iok_core.redis.handler import RedisHandler
+from iok_core.redis.metrics import InstrumentedConnectionPool, InstrumentedRedis
+from iok_core.tracing.redis import format_query, should_trace
+
+sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter  # noqa: E402
+from opentelemetry.sdk.trace.sampling import ALWAYS_OFF, ParentBased  # noqa: E402
+
+_exporter = InMemorySpanExporter()
+
+
+@pytest.fixture(autouse=True)
+def recording_provider(tracer_provider):
+    tracer_provider.add_span_processor(SimpleSpanProcessor(_exporter))
+    yield tracer_provider
+
+
+@pytest_asyncio.fixture
+async def traced():
+    _exporter.clear()
+    pool = InstrumentedConnectionPool(
+        connection_class=FakeAsyncRedisConnection,
+        server=fakeredis.FakeServer(),
+        decode_responses=True,
+    )
+    client = InstrumentedRedis.from_pool(pool)
+    client.iok_metrics = False
+    client.iok_tracing = True
+    yield client
+    await client.aclose()
+
+
+def test_format_query_truncates():
+    assert format_query(["SET", b"k", 1], 64) == "SET k 1"
+    assert format_query(["SET", "k", "x" * 100], 20) == "SET k " + "x" * 11 + "..."
+
+
+@pytest.mark.asyncio
+async def test_command_spans(traced):
+    await traced.set("k", "v")
+    with pytest.raises(ResponseError):
+        await traced.lpush("k", "x")
+
+    set_span, lpush_span = _exporter.get_finished_spans()
+    assert set_span.name == "SET"
+    assert set_span.kind == trace.SpanKind.CLIENT
+    assert set_span.attributes["db.system.name"] == "redis"
+    assert set_span.attributes["db.operation.name"] == "SET"
+    assert set_span.attributes["server.address"] == "localhost"
+    assert "db.query.text" not in set_span.attributes
+    assert lpush_span.status.status_code == trace.StatusCode.ERROR
+    assert lpush_span.attributes["error.type"] == "ResponseError"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_is_one_span(traced):
+    pipe = traced.pipeline(transaction=False)
+    pipe.set("a", 1).get("a").incr("a")
+    await pipe.execute()
+
+    (span,) = _exporter.get_finished_spans()
+    assert span.name == "PIPELINE"
+    assert span.attributes["db.operation.batch.size"] == 3
+
+
+@pytest.mark.asyncio
+async def test_unsampled_parent_skips_span_creation(traced):
+    tracer = sdk_trace.TracerProvider(sampler=ParentBased(ALWAYS_OFF)).get_tracer("test")
+    with tracer.start_as_current_span("request"):
+        assert not should_trace()
+        await traced.get("k")
+    assert _exporter.get_finished_spans() == ()
+
+
+@pytest.mark.asyncio
+async def test_session_span_parents_commands(traced):
+    state = RedisHandler._registry.current()
+    state.clients[False] = traced
+    try:
+        async with RedisHandler.session() as client:
+            await client.get("k")
+    finally:
+        RedisHandler._registry.discard(state)
+
+    get_span, session_span = _exporter.get_finished_spans()
+    assert session_span.name == "redis.session"
+    assert get_span.parent.span_id == session_span.context.span_id